@@ -1 +1,11 @@
 """Python FastAPI sample extension mirroring C# SampleExtension.Web."""
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+
+# Built on the shared runtime in <repo>/shared/python; import it from the checkout unless it is installed
+if find_spec("dragon_extension_runtime") is None:
+    for _parent in Path(__file__).resolve().parents:
+        if (_parent / "shared" / "python" / "dragon_extension_runtime").is_dir():
+            sys.path.append(str(_parent / "shared" / "python"))
+            break
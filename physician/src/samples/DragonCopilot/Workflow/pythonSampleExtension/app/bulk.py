@@ -0,0 +1,31 @@
+"""Offline bulk processing: DragonStandardPayload NDJSON in, ProcessResponse NDJSON out.
+
+Runs ProcessingService over stored notes without the HTTP layer, on a pool of worker processes
+(see dragon_extension_runtime.bulk). From the pythonSampleExtension dir:
+
+    python3.12 -m app.bulk notes.ndjson -o results.ndjson --workers 8 --checkpoint run.ckpt
+"""
+from __future__ import annotations
+from typing import Sequence
+from dragon_extension_runtime.bulk import main as bulk_main
+from .models import DragonStandardPayload
+from .service import ProcessingService
+
+
+def create_service() -> ProcessingService:
+    # module-level so it can be sent to the worker processes
+    return ProcessingService()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    return bulk_main(
+        argv,
+        service_factory=create_service,
+        payload_model=DragonStandardPayload,
+        description="Extract clinical entities from NDJSON DragonStandardPayload records.",
+        exclude_none=False,  # same body as POST /v1/process
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+"""Adaptive card rendering within a byte and element budget (DGEXT_CARD_MAX_BYTES, DGEXT_CARD_MAX_ELEMENTS).
+
+One Container per entity makes the card grow with the note, so ``CardRenderer`` keeps a running size while
+it builds: in compact JSON, an item added to a non-empty list costs exactly ``len(dumps(item)) + 1`` bytes.
+Rows are added (High priority first) while they fit with room kept for the overflow summary; the entities
+left over are collapsed into a "+N more" line and an ``Action.ShowCard`` that counts them by type. Only the
+rows shown are encoded, so rendering time is bounded by the budget, not by the number of entities, and the
+card's JSON never exceeds ``max_bytes``.
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+from dragon_extension_runtime import dumps
+from . import models
+from .entities import Entity
+
+_PRIORITY_RANK = {models.Priority.High: 0, models.Priority.Medium: 1, models.Priority.Low: 2}
+
+ACTIONS: List[Dict[str, Any]] = [
+    {
+        "type": "Action.Execute",
+        "title": "Append to note",
+        "verb": "appendToNoteSection",
+        "id": "appendToNoteSectionAction",
+        "data": {
+            "dragonAppendContent": "appended text content"
+        }
+    },
+    {
+        "type": "Action.Execute",
+        "title": "Dismiss",
+        "verb": "reject",
+        "id": "rejectAction",
+        "data": {
+            "dragonExtensionToolName": "RejectCardTool"
+        }
+    }
+]
+
+NO_ENTITIES = {
+    "type": "Container",
+    "style": "attention",
+    "items": [
+        {"type": "TextBlock", "text": "ℹ️ No clinical entities were detected in this note.", "wrap": True}
+    ],
+}
+
+_ROW_ELEMENTS = 3  # Container + two TextBlocks
+
+
+def _size(value: Any) -> int:
+    return len(dumps(value))
+
+
+def _elements(value: Any) -> int:
+    # card elements (dicts with a "type") in value, nested ones included
+    if isinstance(value, dict):
+        return ("type" in value) + sum(_elements(v) for v in value.values() if isinstance(v, (dict, list)))
+    if isinstance(value, list):
+        return sum(_elements(v) for v in value)
+    return 0
+
+
+def _row(entity: Entity) -> Dict[str, Any]:
+    return {
+        "type": "Container",
+        "style": "emphasis",
+        "spacing": "Medium",
+        "items": [
+            {"type": "TextBlock", "text": f"**{entity.type}**", "weight": "Bolder", "size": "Default"},
+            {"type": "TextBlock", "text": entity.id, "size": "Small", "wrap": True},
+        ],
+    }
+
+
+def _more(overflow: Sequence[Entity]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    # the "+N more" line and the ShowCard counting the hidden entities by type
+    n = len(overflow)
+    line = {"type": "TextBlock", "text": f"+{n} more {'entity' if n == 1 else 'entities'} not shown", "wrap": True, "size": "Small"}
+    show = {
+        "type": "Action.ShowCard",
+        "title": f"Show {n} more",
+        "card": {
+            "type": "AdaptiveCard",
+            "body": [{
+                "type": "FactSet",
+                "facts": [{"title": t, "value": str(c)} for t, c in Counter(e.type for e in overflow).items()],
+            }],
+        },
+    }
+    return line, show
+
+
+class CardRenderer:
+    def __init__(self, max_bytes: int, max_elements: int):
+        self.max_bytes = max_bytes
+        self.max_elements = max_elements
+        # the frame (longest header and timestamp, "no entities" body) must fit on its own
+        frame = self._card(self._header(10 ** 9), [NO_ENTITIES], self._footer("0000-00-00T00:00:00.000000+00:00"), ACTIONS)
+        if _size(frame) > max_bytes or _elements(frame) > max_elements:
+            raise ValueError(
+                f"Adaptive card budget too small: the card frame needs {_size(frame)} bytes and {_elements(frame)} elements"
+            )
+
+    def render(self, entities: Sequence[Entity], processed_at: str) -> Dict[str, Any]:
+        header, footer = self._header(len(entities)), self._footer(processed_at)
+        if not entities:
+            return self._card(header, [NO_ENTITIES], footer, ACTIONS)
+        card = self._card(header, [], footer, ACTIONS)
+        used, elements = _size(card), _elements(card)
+
+        # Room kept for the summary: its size for *all* entities bounds it for any overflow (fewer types, smaller
+        # counts). The ShowCard is given up first, then the line, if the budget cannot hold them.
+        ordered = sorted(entities, key=lambda e: _PRIORITY_RANK.get(e.priority, 3))
+        line, show = _more(ordered)
+        reserve_bytes, reserve_elements, with_show = 0, 0, False
+        for parts, show_it in (((line, show), True), ((line,), False)):
+            cost, count = sum(_size(p) + 1 for p in parts), sum(_elements(p) for p in parts)
+            if used + cost <= self.max_bytes and elements + count <= self.max_elements:
+                reserve_bytes, reserve_elements, with_show = cost, count, show_it
+                break
+        else:
+            line = None
+
+        rows: List[Dict[str, Any]] = []
+        last = len(ordered) - 1
+        for i, entity in enumerate(ordered):
+            row = _row(entity)
+            cost = _size(row) + 1
+            keep_bytes, keep_elements = (0, 0) if i == last else (reserve_bytes, reserve_elements)
+            if used + cost + keep_bytes > self.max_bytes or elements + _ROW_ELEMENTS + keep_elements > self.max_elements:
+                break
+            rows.append(row)
+            used += cost
+            elements += _ROW_ELEMENTS
+
+        overflow = ordered[len(rows):]
+        if not overflow or line is None:
+            return self._card(header, rows, footer, ACTIONS)
+        line, show = _more(overflow)
+        return self._card(header, [*rows, line], footer, [show, *ACTIONS] if with_show else ACTIONS)
+
+    def _header(self, count: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "type": "TextBlock",
+                "text": "🔍 Clinical Entities Extracted",
+                "weight": "Bolder",
+                "size": "Default"
+            },
+            {
+                "type": "TextBlock",
+                "text": f"Found {count} clinical {'entity' if count == 1 else 'entities'} in the note",
+                "wrap": True,
+                "size": "Default",
+                "spacing": "Small"
+            },
+        ]
+
+    def _footer(self, processed_at: str) -> List[Dict[str, Any]]:
+        return [{
+            "type": "TextBlock",
+            "text": f"Processed at {processed_at}",
+            "size": "Small",
+            "spacing": "Medium",
+        }]
+
+    @staticmethod
+    def _card(header: List[Dict[str, Any]], body: List[Dict[str, Any]], footer: List[Dict[str, Any]], actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "type": "AdaptiveCard",
+            "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+            # `version` is intentionally omitted. The Dragon Copilot adaptive
+            # card spec does not require it and the validator's reference
+            # sample omits it. Set it explicitly only if you require a
+            # specific Adaptive Cards schema version.
+            "body": [*header, *body, *footer],
+            "actions": actions,
+        }
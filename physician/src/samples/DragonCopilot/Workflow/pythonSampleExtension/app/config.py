@@ -1,11 +1,31 @@
 from functools import lru_cache
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from dragon_extension_runtime import ExtensionSettings
+from pydantic_settings import SettingsConfigDict
 
-class Settings(BaseSettings):
+# startup_optimized, warmup_enabled, admission-control, job and audit settings come from the shared runtime
+class Settings(ExtensionSettings):
     model_config = SettingsConfigDict(env_prefix="DGEXT_")
 
     app_name: str = "Dragon Sample Extension (Python)"
     version: str = "0.1.0"
+    # Keyword lexicons per language: lexicons/<environment_id>/<language>.json, then lexicons/<language>.json,
+    # else the built-in English keywords. Loaded on first use; compiled engines live in an LRU bounded by
+    # engine_memory_budget_mb and are evicted after engine_max_idle_seconds unused (0 = only when over budget)
+    lexicons_dir: str = "lexicons"
+    engine_memory_budget_mb: int = 64
+    engine_max_idle_seconds: float = 0
+    # audited outputs (DGEXT_AUDIT_INCLUDE_OUTPUTS) keep entity structure but not note-derived text or values
+    audit_redact_fields: list[str] = ["text", "content", "value", "dragonAppendContent", "dragonCopilotCopyData"]
+    # outputs computed per request: those declared by the tool in manifest_path, narrowed by outputs when set
+    # (DGEXT_OUTPUTS='["sample-entities"]' for a headless integration) and per request by x-extension-outputs
+    manifest_path: str = "extension.yaml"
+    outputs: list[str] | None = None
+    # adaptive card budget: entity rows beyond it are collapsed into a "+N more" summary (app/cards.py)
+    card_max_bytes: int = 28000
+    card_max_elements: int = 200
+    # /v1/process decodes the raw body into a view of the fields the pipeline reads (app/decoding.py) instead of
+    # validating the full DragonStandardPayload; the OpenAPI docs then show no request body schema
+    fast_decoding: bool = False
     # enable_auth: bool = False  # Placeholder toggle — not referenced anywhere yet; uncomment when auth middleware is wired up
 
 @lru_cache
@@ -0,0 +1,123 @@
+"""Fast request decoding (DGEXT_FAST_DECODING): the raw body to a view of only the fields the pipeline reads.
+
+The default /v1/process path validates the whole DragonStandardPayload into pydantic models (Note, every
+NoteResource, a copy of the free-form document) although extraction only reads the language, the
+environment id and the resource texts. Here the body is parsed once (orjson if installed) and only those
+fields are type-checked; everything else is left as decoded. ``note.document`` is passed through unchecked
+for the echo in DspResponse.document, so the validation cost follows what the extension uses, not the
+payload size. Type errors become the same 422 (RequestValidationError, loc under "body") as the model path.
+
+Both paths are dependencies rather than a FastAPI body parameter so that decoding and validation run inside
+a "validation" span of the request trace.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from dragon_extension_runtime import loads, span
+from . import models
+
+
+class NoteView:
+    __slots__ = ("language", "document", "contents")
+
+    def __init__(self, language: Optional[str], document: Dict[str, Any] | None, contents: List[Optional[str]] | None):
+        self.language = language
+        self.document = document  # raw decoded JSON, echoed as is
+        self.contents = contents  # one entry per note resource, None where it has no content
+
+    def __repr__(self) -> str:
+        resources = len(self.contents) if self.contents is not None else None
+        return f"NoteView(language={self.language!r}, resources={resources})"
+
+
+class PayloadView:
+    __slots__ = ("note", "environment_id")
+
+    def __init__(self, note: NoteView | None, environment_id: Optional[str]):
+        self.note = note
+        self.environment_id = environment_id
+
+    @classmethod
+    def from_model(cls, payload: models.DragonStandardPayload) -> "PayloadView":
+        note = payload.note
+        view = None
+        if note is not None:
+            contents = [r.content for r in note.resources] if note.resources is not None else None
+            view = NoteView(note.language, note.document, contents)
+        return cls(view, payload.sessionData.environment_id if payload.sessionData else None)
+
+
+def _invalid(loc: tuple, kind: str, msg: str, value: Any) -> RequestValidationError:
+    return RequestValidationError([{"type": kind, "loc": ("body", *loc), "msg": msg, "input": value}])
+
+
+def _object(value: Any, loc: tuple) -> Dict[str, Any] | None:
+    if value is None or type(value) is dict:
+        return value
+    raise _invalid(loc, "dict_type", "Input should be a valid dictionary", value)
+
+
+def _str(value: Any, loc: tuple) -> Optional[str]:
+    if value is None or type(value) is str:
+        return value
+    raise _invalid(loc, "string_type", "Input should be a valid string", value)
+
+
+def decode_payload(body: bytes) -> PayloadView:
+    try:
+        data = loads(body) if body else {}
+    except ValueError as exc:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body", getattr(exc, "pos", 0)), "msg": "JSON decode error", "input": {}, "ctx": {"error": str(exc)}}]
+        ) from None
+    if type(data) is not dict:
+        raise _invalid((), "model_attributes_type", "Input should be a valid dictionary or object to extract fields from", data)
+
+    session = _object(data.get("sessionData"), ("sessionData",))
+    environment_id = _str(session.get("environment_id"), ("sessionData", "environment_id")) if session else None
+
+    note = _object(data.get("note"), ("note",))
+    if note is None:
+        return PayloadView(None, environment_id)
+    resources = note.get("resources")
+    contents = None
+    if resources is not None:
+        if type(resources) is not list:
+            raise _invalid(("note", "resources"), "list_type", "Input should be a valid list", resources)
+        contents = []
+        for i, r in enumerate(resources):
+            r = _object(r, ("note", "resources", i))
+            if r is None:
+                raise _invalid(("note", "resources", i), "model_type", "Input should be an object", r)
+            contents.append(_str(r.get("content"), ("note", "resources", i, "content")))
+    return PayloadView(
+        NoteView(
+            _str(note.get("language"), ("note", "language")),
+            _object(note.get("document"), ("note", "document")),
+            contents,
+        ),
+        environment_id,
+    )
+
+
+async def read_payload_view(request: Request) -> PayloadView:
+    # FastAPI dependency: the body is read and parsed exactly once
+    body = await request.body()
+    with span("validation"):
+        return decode_payload(body)
+
+
+async def read_payload_model(request: Request) -> models.DragonStandardPayload:
+    # the default path: the whole payload validated by pydantic, with FastAPI's 422 on errors
+    body = await request.body()
+    with span("validation"):
+        if not body:
+            raise _invalid((), "missing", "Field required", None)
+        try:
+            return models.DragonStandardPayload.model_validate_json(body)
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            ) from None
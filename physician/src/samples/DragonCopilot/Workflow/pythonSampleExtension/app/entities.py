@@ -0,0 +1,180 @@
+"""Compact entities for the extraction pipeline; converted to wire JSON only when the response is assembled.
+
+A note can yield hundreds of entities. Validating a pydantic model per match (and reading it back for the
+adaptive card) costs more than the matching itself, so the pipeline works on these ``__slots__`` classes
+and ``to_wire()`` turns each into the dict its model (``models.MedicalCode`` etc.) would serialize to,
+once, when the DspResponse is built. No field is ever None, so the dicts encode the same with or without
+``exclude_none``; ``test_entities.py`` checks them against the models.
+
+Every entity carries the offsets of the text it was extracted from, ``(section, start, end)``: the index of
+the note resource and the range in its content in UTF-16 code units (as .NET strings count, so an emoji
+is two), encoded as ``provenance``: one entry per note resource, its sections' ``id`` being the resource
+index. ``aggregate`` merges entities that state the same finding (same ``key()``) into the first one,
+which keeps every occurrence.
+"""
+from __future__ import annotations
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from . import models
+
+ICD10_SYSTEM = "ICD-10-CM"
+ICD10_SYSTEM_URL = "http://hl7.org/fhir/sid/icd-10-cm"
+LOINC_SYSTEM = "LOINC"
+LOINC_SYSTEM_URL = "http://loinc.org"
+
+Offsets = Tuple[int, int, int]  # (note resource index, start, end) in UTF-16 code units of its content
+
+# UUID version 4 / RFC 4122 variant bits
+_UUID4_CLEAR = ~((0xF000 << 64) | (0xC000 << 48))
+_UUID4_SET = (0x4000 << 64) | (0x8000 << 48)
+_random_bits = random.getrandbits
+
+
+def new_id() -> str:
+    # a random (version 4) UUID string at a third of uuid4()'s cost: ids only need to be unique, not
+    # unpredictable, so the Mersenne Twister (reseeded in forked workers) stands in for os.urandom
+    h = f"{_random_bits(128) & _UUID4_CLEAR | _UUID4_SET:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+class Entity(ABC):
+    __slots__ = ("id", "priority", "occurrences")
+    type = "Entity"  # wire "type", same as the model's
+
+    def __init__(self, priority: models.Priority, offsets: Offsets):
+        self.id = new_id()
+        self.priority = priority
+        self.occurrences: List[Offsets] = [offsets]
+
+    @abstractmethod
+    def key(self) -> Hashable:
+        # the normalized finding: entities with equal keys are duplicates
+        ...
+
+    def merge(self, other: "Entity") -> None:
+        self.occurrences.extend(other.occurrences)
+
+    def provenance(self) -> List[Dict[str, Any]]:
+        # one entry per note resource the finding appears in, identified by the resource index, with one
+        # document section per occurrence in it: the spec allows exactly one [start, end] pair per section
+        entries: List[Dict[str, Any]] = []
+        last = None
+        for section, start, end in self.occurrences:  # in note order, so a resource's occurrences are adjacent
+            if section != last:
+                last = section
+                sections: List[Dict[str, Any]] = []
+                entries.append({"source": "document", "document_sections": sections})
+            sections.append({"id": str(section), "positions": [start, end]})
+        return entries
+
+    @abstractmethod
+    def to_wire(self) -> Dict[str, Any]:
+        # the dict this entity's model would serialize to
+        ...
+
+
+class MedicalCodeEntity(Entity):
+    __slots__ = ("identifier", "description", "reason")
+    type = "MedicalCode"
+
+    def __init__(self, identifier: str, description: str, reason: str, offsets: Offsets, priority: models.Priority = models.Priority.Medium):
+        super().__init__(priority, offsets)
+        self.identifier = identifier
+        self.description = description
+        self.reason = reason
+
+    def key(self) -> Hashable:
+        return ("MedicalCode", self.identifier)
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": "MedicalCode",
+            "code": {
+                "identifier": self.identifier,
+                "description": self.description,
+                "system": ICD10_SYSTEM,
+                "systemUrl": ICD10_SYSTEM_URL,
+            },
+            "priority": self.priority.value,
+            "reason": self.reason,
+            "provenance": self.provenance(),
+            "occurrences": len(self.occurrences),
+        }
+
+
+class VitalSignEntity(Entity):
+    __slots__ = ("value", "unit", "description", "code")
+    type = "ObservationNumber"
+
+    def __init__(
+        self, value: float, unit: str, description: str, code: Optional[str], offsets: Offsets,
+        priority: models.Priority = models.Priority.High,
+    ):
+        super().__init__(priority, offsets)
+        self.value = float(value)
+        self.unit = unit
+        self.description = description
+        self.code = code  # LOINC code, if the measurement has one
+
+    def key(self) -> Hashable:
+        return ("ObservationNumber", self.code or self.description, self.value, self.unit)
+
+    def to_wire(self) -> Dict[str, Any]:
+        context: Dict[str, Any] = {"display_description": self.description}
+        if self.code:
+            context["codes"] = [
+                {"identifier": self.code, "description": self.description, "system": LOINC_SYSTEM, "system_url": LOINC_SYSTEM_URL}
+            ]
+        return {
+            "id": self.id,
+            "type": "ObservationNumber",
+            "value": self.value,
+            "valueUnit": self.unit,
+            "priority": self.priority.value,
+            "context": context,
+            "provenance": self.provenance(),
+            "occurrences": len(self.occurrences),
+        }
+
+
+class ConceptEntity(Entity):
+    __slots__ = ("text", "concept_id")
+    type = "ObservationConcept"
+
+    def __init__(self, text: str, concept_id: str, offsets: Offsets, priority: models.Priority = models.Priority.Medium):
+        super().__init__(priority, offsets)
+        self.text = text
+        self.concept_id = concept_id
+
+    def key(self) -> Hashable:
+        return ("ObservationConcept", self.concept_id)
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": "ObservationConcept",
+            "value": {"text": self.text, "conceptId": self.concept_id},
+            "priority": self.priority.value,
+            "provenance": self.provenance(),
+            "occurrences": len(self.occurrences),
+        }
+
+
+def aggregate(entities: Iterable[Entity]) -> List[Entity]:
+    # one entity per distinct finding, in order of first occurrence; later duplicates are merged into it
+    index: Dict[Hashable, Entity] = {}
+    for entity in entities:
+        key = entity.key()
+        first = index.get(key)
+        if first is None:
+            index[key] = entity
+        else:
+            first.merge(entity)
+    return list(index.values())
+
+
+def to_wire(entities: Iterable[Entity]) -> List[Dict[str, Any]]:
+    # the only place the pipeline's entities become wire data
+    return [e.to_wire() for e in entities]
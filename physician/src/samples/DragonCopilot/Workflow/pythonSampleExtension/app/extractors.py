@@ -0,0 +1,183 @@
+"""Single-pass extraction: each note section is tokenized once and every extractor reads the same tokens.
+
+``tokenize`` runs one precompiled scanner over a section and yields ``(kind, norm, start, end)`` tokens:
+blood-pressure style ratios ("145/98"), numbers, words and single symbols, upper-cased. The keyword
+engine marks lexicon mentions on those tokens (``Section.hits``), then each registered ``Extractor``
+turns tokens and mentions into typed entities with values, units and offsets. Adding an extractor adds
+no pass over the text; pass your own list as ``ProcessingService(extractors=...)``.
+
+Tokens hold Python (code point) offsets. ``Section.offsets`` reports them in UTF-16 code units, the string
+offsets of the .NET consumers, through one ``OffsetIndex`` per section that every extractor shares.
+"""
+from __future__ import annotations
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from dragon_extension_runtime import OffsetIndex
+from . import models
+from .entities import ConceptEntity, Entity, MedicalCodeEntity, Offsets, VitalSignEntity
+
+Token = Tuple[str, str, int, int]  # (kind, norm, start, end); norm is the upper-cased token text
+KIND, NORM, START, END = range(4)
+
+_SCANNER = re.compile(
+    r"(?P<ratio>\d+\s*/\s*\d+)"
+    r"|(?P<num>\d+(?:\.\d+)?)"
+    r"|(?P<word>[^\W\d_]+)"
+    r"|(?P<sym>[^\w\s])"
+)
+# a value is looked for up to this many tokens after its mention, but not past the end of the sentence
+WINDOW = 4
+_SENTENCE_END = frozenset(".;")
+
+
+def tokenize(text: str) -> List[Token]:
+    upper = text.upper()
+    if len(upper) == len(text):  # offsets still line up (no "ß" -> "SS" expansion): scan the upper-cased text
+        return [(m.lastgroup, m.group(), m.start(), m.end()) for m in _SCANNER.finditer(upper)]
+    return [(m.lastgroup, m.group().upper(), m.start(), m.end()) for m in _SCANNER.finditer(text)]
+
+
+class Section:
+    # one note resource: its text, tokens and lexicon mentions (category -> [(first token, end token)])
+    __slots__ = ("index", "text", "tokens", "hits", "_numbers", "_positions")
+
+    def __init__(self, index: int, text: str, tokens: List[Token], hits: Dict[str, List[Tuple[int, int]]]):
+        self.index = index
+        self.text = text
+        self.tokens = tokens
+        self.hits = hits
+        self._numbers: Optional[List[int]] = None
+        self._positions: Optional[OffsetIndex] = None
+
+    @property
+    def numbers(self) -> List[int]:
+        # indices of the "num" tokens, found once for all extractors that look at every number
+        if self._numbers is None:
+            self._numbers = [i for i, token in enumerate(self.tokens) if token[KIND] == "num"]
+        return self._numbers
+
+    @property
+    def positions(self) -> OffsetIndex:
+        # code point -> UTF-16 / UTF-8 offsets of the text, built once for all extractors
+        if self._positions is None:
+            self._positions = OffsetIndex(self.text)
+        return self._positions
+
+    def offsets(self, first: int, end: int) -> Offsets:
+        # UTF-16 range covered by tokens[first:end]
+        positions = self.positions
+        return (self.index, positions.utf16(self.tokens[first][START]), positions.utf16(self.tokens[end - 1][END]))
+
+
+class Extractor(ABC):
+    # Reads a tokenized Section and yields entities; must not rescan section.text
+    @abstractmethod
+    def extract(self, section: Section) -> Iterable[Entity]:
+        ...
+
+
+def _value_after(tokens: Sequence[Token], end: int, kind: str) -> Optional[int]:
+    # index of the first `kind` token within WINDOW tokens from `end`, in the same sentence
+    for i in range(end, min(end + WINDOW, len(tokens))):
+        token = tokens[i]
+        if token[KIND] == kind:
+            return i
+        if token[NORM] in _SENTENCE_END:
+            return None
+    return None
+
+
+def _unit_after(tokens: Sequence[Token], i: int, units: Dict[str, str]) -> Optional[str]:
+    return units.get(tokens[i + 1][NORM]) if i + 1 < len(tokens) else None
+
+
+class BloodPressureExtractor(Extractor):
+    # "BP: 145/98 mmHg" -> systolic and diastolic ObservationNumbers; the mention comes from the lexicon
+    category = "BLOOD PRESSURE"
+
+    def extract(self, section: Section) -> Iterable[Entity]:
+        tokens = section.tokens
+        seen = set()
+        for _, end in section.hits.get(self.category, ()):
+            i = _value_after(tokens, end, "ratio")
+            if i is None or i in seen:
+                continue
+            seen.add(i)
+            last = i + 1 if _unit_after(tokens, i, {"MMHG": "mmHg"}) else i
+            offsets = section.offsets(i, last + 1)
+            systolic, _, diastolic = tokens[i][NORM].partition("/")
+            yield VitalSignEntity(int(systolic), "mmHg", "Systolic blood pressure", "8480-6", offsets)
+            yield VitalSignEntity(int(diastolic), "mmHg", "Diastolic blood pressure", "8462-4", offsets)
+
+
+class QuantityExtractor(Extractor):
+    # A number after a lexicon mention ("HR: 78", "Weight 210 lbs"), or anywhere if followed by one of
+    # `units` ("78 bpm"). Numbers without a unit after the mention get `default_unit`, or are skipped without one.
+    def __init__(
+        self, category: Optional[str], units: Dict[str, str], description: str, code: Optional[str] = None,
+        default_unit: Optional[str] = None, priority: models.Priority = models.Priority.High,
+        mention_required: bool = True, unit_blockers: frozenset = frozenset(),
+    ):
+        self.category = category
+        self.units = units
+        self.description = description
+        self.code = code
+        self.default_unit = default_unit
+        self.priority = priority
+        self.mention_required = mention_required
+        self.unit_blockers = unit_blockers  # tokens after the unit that make it something else ("mg" "/" "dL")
+
+    def extract(self, section: Section) -> Iterable[Entity]:
+        tokens = section.tokens
+        found: Dict[int, Optional[str]] = {}
+        for _, end in section.hits.get(self.category, ()) if self.category else ():
+            i = _value_after(tokens, end, "num")
+            if i is not None:
+                found.setdefault(i, _unit_after(tokens, i, self.units) or self.default_unit)
+        if not self.mention_required:
+            for i in section.numbers:
+                if i not in found:
+                    unit = _unit_after(tokens, i, self.units)
+                    if unit and not (i + 2 < len(tokens) and tokens[i + 2][NORM] in self.unit_blockers):
+                        found[i] = unit
+        for i in sorted(found):
+            unit = found[i]
+            if unit is None:
+                continue
+            last = i + 1 if _unit_after(tokens, i, self.units) else i
+            yield VitalSignEntity(
+                float(tokens[i][NORM]), unit, self.description, self.code, section.offsets(i, last + 1), self.priority
+            )
+
+
+class CategoryExtractor(Extractor):
+    # An entity per mention of a lexicon category (e.g. "diabetic"); aggregation merges them into one
+    def __init__(self, category: str, entity: Callable[[Offsets], Entity]):
+        self.category = category
+        self.entity = entity
+
+    def extract(self, section: Section) -> Iterable[Entity]:
+        for first, end in section.hits.get(self.category, ()):
+            yield self.entity(section.offsets(first, end))
+
+
+def _diabetes(offsets: Offsets) -> Entity:
+    return MedicalCodeEntity("E11.9", "Type 2 diabetes mellitus without complications", "Detected from clinical documentation", offsets)
+
+
+def _medication(offsets: Offsets) -> Entity:
+    return ConceptEntity("Prescription medication detected", "medication-concept-001", offsets)
+
+
+DEFAULT_EXTRACTORS: Tuple[Extractor, ...] = (
+    BloodPressureExtractor(),
+    QuantityExtractor("HEART RATE", {"BPM": "bpm"}, "Heart rate", "8867-4", default_unit="bpm", mention_required=False),
+    QuantityExtractor("WEIGHT", {"KG": "kg", "LB": "lb", "LBS": "lb"}, "Body weight", "29463-7"),
+    QuantityExtractor(
+        None, {"MG": "mg", "MCG": "mcg", "G": "g", "ML": "mL"}, "Medication dose", priority=models.Priority.Medium,
+        mention_required=False, unit_blockers=frozenset("/"),
+    ),
+    CategoryExtractor("DIABETES", _diabetes),
+    CategoryExtractor("MEDICATION", _medication),
+)
@@ -1,40 +1,52 @@
-from fastapi import FastAPI, Header, HTTPException, Request
+from typing import Annotated
+from fastapi import Depends, Header, HTTPException
 # RequestValidationError import kept for reference; handler is commented out below
 # from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse, RedirectResponse
+from dragon_extension_runtime import (
+    HealthRoutes, ModelResponse, RequestContext, configure_logging, create_app, respond_async_requested,
+)
 from .models import DragonStandardPayload, ProcessResponse
+from .decoding import PayloadView, read_payload_model, read_payload_view
 from .service import ProcessingService
 from datetime import datetime, timezone
 from .config import get_settings
+from .warmup import warm_up
 import logging
 
 logger = logging.getLogger("dragon.pyextension")
-logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s %(name)s - %(message)s")
+configure_logging()
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name, version=settings.version)
 service = ProcessingService()
 
-@app.middleware("http")
-async def header_logging_middleware(request: Request, call_next):  # basic structured log of tracing headers
-    req_id = request.headers.get("x-ms-request-id")
-    corr_id = request.headers.get("x-ms-correlation-id")
-    logger.info("Incoming %s %s req_id=%s corr_id=%s", request.method, request.url.path, req_id, corr_id)
-    try:
-        response = await call_next(request)
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Unhandled exception processing request")
-        return JSONResponse(status_code=500, content={"success": False, "error": "Internal server error"})
-    return response
-
-@app.get("/", include_in_schema=False)
-async def root_redirect():
-    # Mirror C# swagger root exposure
-    return RedirectResponse(url="/docs")
+# Lifespan + warm-up, request logging middleware, / -> /docs redirect and health probes come from the shared runtime
+app = create_app(
+    settings,
+    service,
+    title=settings.app_name,
+    logger=logger,
+    warm_up=warm_up,
+    health=HealthRoutes(
+        liveness_path="/health",
+        readiness_path="/health/readiness",
+        healthy=lambda: {"status": "healthy", "version": settings.version},
+        unhealthy=lambda: {"status": "starting", "version": settings.version},
+    ),
+)
 
-@app.get("/health")
-async def root_health():
-    return {"status": "healthy", "version": settings.version}
+# DGEXT_FAST_DECODING: only the fields the pipeline reads are decoded and checked (see app/decoding.py)
+ProcessPayload = (
+    Annotated[PayloadView, Depends(read_payload_view)]
+    if settings.fast_decoding
+    else Annotated[DragonStandardPayload, Depends(read_payload_model)]
+)
+# the body is read by the dependency, so its schema is documented here
+PROCESS_BODY = None if settings.startup_optimized else {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": DragonStandardPayload.model_json_schema()}},
+    }
+}
 
 @app.get("/v1/health")
 async def versioned_health():
@@ -60,19 +72,51 @@ async def versioned_health():
 #         },
 #     )
 
-@app.post("/v1/process", response_model=ProcessResponse)
+@app.post("/v1/process", response_model=ProcessResponse, openapi_extra=PROCESS_BODY)
 async def process_endpoint(
-    payload: DragonStandardPayload,
+    payload: ProcessPayload,
     x_ms_request_id: str | None = Header(default=None, alias="x-ms-request-id"),
     x_ms_correlation_id: str | None = Header(default=None, alias="x-ms-correlation-id"),
+    prefer: str | None = Header(default=None),
+    x_callback_url: str | None = Header(default=None, alias="x-callback-url"),
+    content_length: int | None = Header(default=None),
+    x_extension_outputs: str | None = Header(default=None, alias="x-extension-outputs"),
 ):
+    context = RequestContext(x_ms_request_id, x_ms_correlation_id)
+    # only the outputs this request needs are computed (extension.yaml, DGEXT_OUTPUTS, x-extension-outputs)
+    try:
+        outputs = service.pipeline.select(x_extension_outputs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    # Prefer: respond-async -> 202 Accepted now, result from GET /v1/jobs/{id} (or the callback URL)
+    if app.state.jobs is not None and respond_async_requested(prefer):
+        return await app.state.jobs.accept(
+            lambda: service.process_async(payload, context, outputs), callback_url=x_callback_url, exclude_none=False
+        )
     try:
         start_time = datetime.now(timezone.utc)
         logger.info("Processing incoming request at %s", start_time)
-        resp = service.process(payload, x_ms_request_id, x_ms_correlation_id)
+        resp = await service.process_async(payload, context, outputs)
         elapsed = datetime.now(timezone.utc) - start_time
         logger.info("Request processed in %s", elapsed)
-        return resp
+        # serialized in one pass by pydantic rather than FastAPI's jsonable_encoder
+        response = ModelResponse(resp, exclude_none=False)
+        if app.state.audit is not None:
+            # buffered only; the audit log's background task compresses and writes it
+            entities = resp.payload.get("sample-entities")
+            app.state.audit.record_exchange(
+                context,
+                request_bytes=content_length,
+                response_bytes=len(response.body),
+                seconds=elapsed.total_seconds(),
+                counts={"entities": len(entities.resources) if entities else 0},
+                output=resp,
+                exclude_none=False,
+            )
+        if app.state.contracts is not None:
+            # a sampled body is queued; the check against the spec runs in the background
+            app.state.contracts.submit(response.body)
+        return response
     except HTTPException:
         raise
     except Exception:  # noqa: BLE001
@@ -1,20 +1,24 @@
 from __future__ import annotations
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 # Expanded model layer to better mirror the C# sample (not full parity but structurally closer)
 
+class _DeferredModel(BaseModel):
+    # Build validators on first use instead of at import time (cold start only pays for models a request touches)
+    model_config = ConfigDict(defer_build=True)
+
 class Priority(str, Enum):
     High = "High"
     Medium = "Medium"
     Low = "Low"
 
-class ObservationValue(BaseModel):
+class ObservationValue(_DeferredModel):
     text: Optional[str] = None
     conceptId: Optional[str] = None
 
-class BaseResource(BaseModel):
+class BaseResource(_DeferredModel):
     id: Optional[str] = None
 
 class MedicalCode(BaseResource):
@@ -22,17 +26,24 @@ class MedicalCode(BaseResource):
     code: Dict[str, Any] | None = None
     priority: Optional[Priority] = None
     reason: Optional[str] = None
+    provenance: List[Dict[str, Any]] | None = None  # where in the note it was found
+    occurrences: Optional[int] = None  # mentions merged into this entity
 
 class ObservationNumber(BaseResource):
     type: str = Field("ObservationNumber", frozen=True)
     value: Optional[float] = None
     valueUnit: Optional[str] = None
     priority: Optional[Priority] = None
+    context: Dict[str, Any] | None = None  # what was measured: display_description and codes (LOINC)
+    provenance: List[Dict[str, Any]] | None = None
+    occurrences: Optional[int] = None
 
 class ObservationConcept(BaseResource):
     type: str = Field("ObservationConcept", frozen=True)
     value: Optional[ObservationValue] = None
     priority: Optional[Priority] = None
+    provenance: List[Dict[str, Any]] | None = None
+    occurrences: Optional[int] = None
 
 class VisualizationResource(BaseResource):
     type: str = Field("AdaptiveCard", frozen=True)
@@ -44,7 +55,7 @@ class VisualizationResource(BaseResource):
     partnerLogo: str | None = None
     references: List[Dict[str, Any]] | None = None
 
-class NoteResource(BaseModel):
+class NoteResource(_DeferredModel):
     content: Optional[str] = None
 
 ## subtype of note shall be lower case 'note'
@@ -54,27 +65,30 @@ class NoteResource(BaseModel):
 #     """Generate lowercase aliases for JSON serialization."""
 #     return field_name.lower()
 
-class Note(BaseModel):
+class Note(_DeferredModel):
     # Ensure all fields serialize with lowercase keys (even if Python attribute had capitals)
     # model_config = ConfigDict(alias_generator=_lower_alias, populate_by_name=True)
     # # Explicit type indicator (commonly used in DSP resources) kept lowercase per comment
     # type: str = Field(default="note", frozen=True)
+    language: Optional[str] = None  # e.g. "en-US"; selects the keyword lexicon
     document: Dict[str, Any] | None = None
     resources: List[NoteResource] | None = None
 
-class SessionData(BaseModel):
+class SessionData(_DeferredModel):
     sessionId: Optional[str] = None
+    correlation_id: Optional[str] = None
+    environment_id: Optional[str] = None  # selects environment-specific lexicons
 
-class DspResponse(BaseModel):
+class DspResponse(_DeferredModel):
     schema_version: str | None = None
     document: Dict[str, Any] | None = None
     resources: List[Any] = Field(default_factory=list)
 
-class DragonStandardPayload(BaseModel):
+class DragonStandardPayload(_DeferredModel):
     note: Optional[Note] = None
     sessionData: SessionData | None = None
 
-class ProcessResponse(BaseModel):
+class ProcessResponse(_DeferredModel):
     success: bool = False
     message: Optional[str] = None
     payload: Dict[str, DspResponse | Any] = Field(default_factory=dict)
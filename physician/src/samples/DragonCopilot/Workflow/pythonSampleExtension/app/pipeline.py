@@ -0,0 +1,111 @@
+"""Manifest-driven output selection: run only the stages the requested outputs depend on.
+
+``extension.yaml`` declares the tool's inputs (``note``) and outputs (``sample-entities``,
+``adaptive-card``). At startup ``Pipeline.from_manifest`` reads it and wires the service's stages into a
+dependency graph from the inputs to every declared output; an output without a stage, or a stage needing
+something nobody provides, fails there rather than on a request. Per request, ``plan`` returns the stages
+the selected outputs need, in dependency order (cached per selection), so an output nobody asked for, such
+as the card for a headless integration, is never built.
+
+Enabled outputs are the manifest's, narrowed by ``DGEXT_OUTPUTS``; a request can narrow them further with
+``x-extension-outputs: sample-entities`` (comma-separated).
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+OUTPUTS_HEADER = "x-extension-outputs"
+
+
+class Stage:
+    __slots__ = ("needs", "run")
+
+    def __init__(self, needs: Sequence[str], run: Callable[..., Any]):
+        self.needs = tuple(needs)  # inputs or other stages, passed to run() positionally
+        self.run = run
+
+
+def load_manifest_tool(path: Path, tool: Optional[str] = None) -> Dict[str, Any]:
+    # the named tool of extension.yaml, else its first one
+    import yaml  # only needed at startup
+
+    manifest = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    tools = manifest.get("tools") or []
+    for entry in tools:
+        if tool is None or entry.get("name") == tool:
+            return entry
+    raise ValueError(f"{path}: no tool {tool!r}" if tool else f"{path}: no tools declared")
+
+
+class Pipeline:
+    def __init__(self, inputs: Iterable[str], outputs: Sequence[str], stages: Dict[str, Stage], enabled: Optional[Collection[str]] = None):
+        self.inputs = frozenset(inputs)
+        self.outputs = tuple(outputs)
+        self.stages = stages
+        for output in self.outputs:
+            if output not in stages:
+                raise ValueError(f"Manifest output {output!r} has no stage")
+        # fail at startup on cycles or unmet needs
+        self._order(self.outputs)
+        unknown = set(enabled or ()) - set(self.outputs)
+        if unknown:
+            raise ValueError(f"Enabled outputs not declared in the manifest: {', '.join(sorted(unknown))}")
+        self.enabled = frozenset(self.outputs if enabled is None else enabled)
+        self._plans: Dict[FrozenSet[str], Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_manifest(
+        cls, path: Path, stages: Dict[str, Stage], provided: Iterable[str] = (), enabled: Optional[Collection[str]] = None,
+        tool: Optional[str] = None,
+    ) -> "Pipeline":
+        # `provided`: values the service supplies besides the manifest inputs (e.g. the environment id)
+        entry = load_manifest_tool(path, tool)
+        inputs = [i["name"] for i in entry.get("inputs") or ()]
+        outputs = [o["name"] for o in entry.get("outputs") or ()]
+        return cls([*inputs, *provided], outputs, stages, enabled)
+
+    def select(self, requested: Optional[str]) -> FrozenSet[str]:
+        # outputs for one request: the enabled ones, or those named in the header (ValueError for unknown names)
+        if requested is None:
+            return self.enabled
+        names = {name.strip() for name in requested.split(",") if name.strip()}
+        unknown = names - set(self.outputs)
+        if unknown:
+            raise ValueError(f"Unknown outputs: {', '.join(sorted(unknown))}; declared: {', '.join(self.outputs)}")
+        return frozenset(names) & self.enabled
+
+    def plan(self, outputs: Collection[str]) -> Tuple[str, ...]:
+        key = frozenset(outputs)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._order([o for o in self.outputs if o in key])
+        return plan
+
+    def run(self, outputs: Collection[str], inputs: Dict[str, Any]) -> Dict[str, Any]:
+        # values of the stages in plan(outputs); returns only the outputs
+        values = dict(inputs)
+        for name in self.plan(outputs):
+            stage = self.stages[name]
+            values[name] = stage.run(*(values[need] for need in stage.needs))
+        return {o: values[o] for o in self.outputs if o in outputs}
+
+    def _order(self, targets: Sequence[str]) -> Tuple[str, ...]:
+        order: List[str] = []
+        visiting: set = set()
+
+        def visit(name: str) -> None:
+            if name in self.inputs or name in order:
+                return
+            if name not in self.stages:
+                raise ValueError(f"Nothing provides {name!r}")
+            if name in visiting:
+                raise ValueError(f"Stage cycle through {name!r}")
+            visiting.add(name)
+            for need in self.stages[name].needs:
+                visit(need)
+            visiting.discard(name)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return tuple(order)
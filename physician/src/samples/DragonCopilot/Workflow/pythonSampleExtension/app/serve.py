@@ -0,0 +1,23 @@
+"""Multi-worker server: load the app and its lexicons once, then pre-fork uvicorn workers.
+
+The workers share the parent's keyword engines copy-on-write (see dragon_extension_runtime.prefork).
+From the pythonSampleExtension dir:
+
+    python3.12 -m app.serve --port 5181 --workers 4
+"""
+from __future__ import annotations
+from typing import Sequence
+from dragon_extension_runtime.prefork import main as prefork_main
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    return prefork_main(
+        argv,
+        app="app.main:app",
+        default_port=5181,
+        description="Serve the physician entity-extraction extension with pre-forked workers.",
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
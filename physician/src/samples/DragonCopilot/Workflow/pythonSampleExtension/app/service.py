@@ -1,15 +1,26 @@
 """Processing logic replicating simplified entity extraction from C# sample."""
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, Collection, Dict, List, Sequence, Tuple
 from uuid import uuid4
 from datetime import datetime, timezone
+from pathlib import Path
+from dragon_extension_runtime import EngineRegistry, ExtensionService, RequestContext, safe_path_segment, span
 from . import models
+from .cards import CardRenderer
+from .decoding import NoteView, PayloadView
+from .entities import Entity, aggregate, to_wire
+from .pipeline import Pipeline, Stage
+from .extractors import DEFAULT_EXTRACTORS, NORM, Extractor, Section, Token, tokenize
+from .config import Settings, get_settings
+import json
 import logging
 
 KEYWORD_SETS = {
     "BLOOD PRESSURE": ["BLOOD PRESSURE", "BP"],
     "DIABETES": ["DIABETES", "DIABETIC"],
     "MEDICATION": ["MEDICATION", "PRESCRIBED", "TAKING", "METFORMIN"],
+    "HEART RATE": ["HEART RATE", "HR", "PULSE"],
+    "WEIGHT": ["WEIGHT", "WT"],
 }
 
 EXTENSION_PREFIX = "Dragon Predict"
@@ -17,9 +28,104 @@ EXTENSION_PREFIX = "Dragon Predict"
 
 logger = logging.getLogger("dragon.pyextension")
 
-class ProcessingService:
-    def process(self, payload: models.DragonStandardPayload, request_id: str | None, correlation_id: str | None) -> models.ProcessResponse:
+BUILTIN_LEXICON = "builtin"
+
+
+class KeywordEngine:
+    # Keyword lexicon for one (environment, language), tokenized once at load time and matched as whole
+    # tokens ("BP" no longer matches inside "BPM"): first token -> [(remaining tokens, category)]
+    def __init__(self, keyword_sets: Dict[str, List[str]]):
+        self.keyword_sets = {category: tuple(k.upper() for k in keywords) for category, keywords in keyword_sets.items()}
+        self._index: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for category, keywords in self.keyword_sets.items():
+            for keyword in keywords:
+                norms = tuple(t[NORM] for t in tokenize(keyword))
+                if norms:
+                    self._index.setdefault(norms[0], []).append((norms[1:], category))
+
+    def match(self, tokens: List[Token]) -> Dict[str, List[Tuple[int, int]]]:
+        # category -> [(first token, end token)] of every mention, in text order
+        hits: Dict[str, List[Tuple[int, int]]] = {}
+        index = self._index
+        for i, token in enumerate(tokens):
+            candidates = index.get(token[NORM])
+            if candidates is None:
+                continue
+            for rest, category in candidates:
+                end = i + 1 + len(rest)
+                if all(end <= len(tokens) and tokens[i + 1 + k][NORM] == norm for k, norm in enumerate(rest)):
+                    hits.setdefault(category, []).append((i, end))
+        return hits
+
+
+class ProcessingService(ExtensionService):
+    def __init__(self, settings: Settings | None = None, extractors: Sequence[Extractor] = DEFAULT_EXTRACTORS):
+        settings = settings or get_settings()
+        self._extractors = tuple(extractors)
+        self._cards = CardRenderer(settings.card_max_bytes, settings.card_max_elements)
+        # extension.yaml's outputs -> the stages that build them; only those a request selects are run
+        self.pipeline = Pipeline.from_manifest(
+            Path(__file__).resolve().parents[1] / settings.manifest_path,
+            stages={
+                "entities": Stage(("note", "environment_id"), self._extract),
+                "sample-entities": Stage(("note", "entities"), self._sample_entities),
+                "adaptive-card": Stage(("note", "entities"), self._adaptive_card_output),
+            },
+            provided=("environment_id",),
+            enabled=settings.outputs,
+        )
+        self._lexicons_dir = Path(__file__).resolve().parents[1] / settings.lexicons_dir
+        self._engines: EngineRegistry[KeywordEngine] = EngineRegistry(
+            resolve=self._lexicon_for,
+            load=self._load_engine,
+            memory_budget_bytes=settings.engine_memory_budget_mb * 1024 * 1024,
+            max_idle_seconds=settings.engine_max_idle_seconds,
+        )
+
+    def _lexicon_for(self, environment_id: str | None, language: str | None):
+        # Most specific lexicon file that exists; unknown languages fall back to the built-in keywords
+        lang = safe_path_segment(language)
+        if lang is None:
+            return BUILTIN_LEXICON
+        env = safe_path_segment(environment_id)
+        candidates = ([self._lexicons_dir / env / f"{lang}.json"] if env else []) + [self._lexicons_dir / f"{lang}.json"]
+        for path in candidates:
+            if path.is_file():
+                return path
+        return BUILTIN_LEXICON
+
+    def _load_engine(self, source) -> KeywordEngine:
+        if source == BUILTIN_LEXICON:
+            return KeywordEngine(KEYWORD_SETS)
+        logger.info("Loading keyword lexicon %s", source)
+        return KeywordEngine(json.loads(Path(source).read_text(encoding="utf-8")))
+
+    def load_shared(self) -> None:
+        # Build every lexicon's engine up front so pre-forked workers share them (up to the memory budget)
+        self._engines.get(None, None)
+        for path in sorted(self._lexicons_dir.glob("*.json")):
+            self._engines.get(None, path.stem)
+        for path in sorted(self._lexicons_dir.glob("*/*.json")):
+            self._engines.get(path.parent.name, path.stem)
+
+    def cache_sizes(self) -> dict:
+        return {"engines": self._engines.stats()}
+
+    async def process_async(
+        self, payload: models.DragonStandardPayload | PayloadView, context: RequestContext | None = None, outputs: Collection[str] | None = None,
+    ) -> models.ProcessResponse:
+        context = context or RequestContext()
+        return self.process(payload, context.request_id, context.correlation_id, outputs)
+
+    def process(
+        self, payload: models.DragonStandardPayload | PayloadView, request_id: str | None, correlation_id: str | None,
+        outputs: Collection[str] | None = None,
+    ) -> models.ProcessResponse:
+        # outputs: names from extension.yaml to compute (default: the enabled ones, see pipeline.select)
         response = models.ProcessResponse(success=True, message="Payload processed successfully")
+        # the pipeline reads a PayloadView; validated models (default decoding, bulk) are mapped onto one
+        if not isinstance(payload, PayloadView):
+            payload = PayloadView.from_model(payload)
 
         if payload.note:
             # Structured logging; avoid eager f-string serialization
@@ -32,15 +138,16 @@ class ProcessingService:
             except Exception:  # noqa: BLE001
                 logger.exception("Failed to log note model")
 
-            sample_entities, adaptive_card = self._process_note(payload.note)
-            response.payload["sample-entities"] = sample_entities
-            response.payload["adaptive-card"] = adaptive_card
+            response.payload.update(self.pipeline.run(
+                self.pipeline.enabled if outputs is None else outputs,
+                {"note": payload.note, "environment_id": payload.environment_id},
+            ))
             # NOTE: "samplePluginResult" output is not currently supported by the
             # consuming application and has been removed from the response.
-            # Uncomment the line below (and restore the composite logic in
-            # _process_note) when samplePluginResult support is re-enabled.
-            # response.payload["samplePluginResult"] = composite_plugin
-            logger.info("extension response:\n %s", response)
+            # To re-enable it, declare it in extension.yaml and add its stage
+            # (restoring the composite logic below).
+            # full responses go to the audit log (DGEXT_AUDIT_ENABLED), not the INFO log
+            logger.debug("extension response:\n %s", response)
 
             # TODO: use the payload fields to call out to AI Agents
 
@@ -49,159 +156,69 @@ class ProcessingService:
 
         return response
 
-    def _process_note(self, note: models.Note):
-        resources: List[Any] = []
+    def _extract(self, note: NoteView, environment_id: str | None) -> List[Entity]:
+        # compact slot entities through the pipeline; wire models are built once, for the response
+        with span("lexicon.get", environment_id=environment_id, language=note.language):
+            engine = self._engines.get(environment_id, note.language)
+        entities: List[Entity] = []
 
-        if note.resources:
-            for r in note.resources:
-                content = r.content
-                if not content:
-                    continue
-                upper = content.upper()
-                if any(k in upper for k in KEYWORD_SETS["BLOOD PRESSURE"]):
-                    resources.append(self._vital_sign(145.0, "mmHg"))
-                if any(k in upper for k in KEYWORD_SETS["DIABETES"]):
-                    resources.append(self._medical_code("E11.9", "Type 2 diabetes mellitus without complications"))
-                if any(k in upper for k in KEYWORD_SETS["MEDICATION"]):
-                    resources.append(self._observation_concept("Prescription medication detected", "medication-concept-001"))
+        with span("extraction", resources=len(note.contents or ())) as extraction:
+            if note.contents:
+                for index, content in enumerate(note.contents):
+                    if not content:
+                        continue
+                    # one scan of the section; the lexicon and every extractor read the same tokens
+                    tokens = tokenize(content)
+                    section = Section(index, content, tokens, engine.match(tokens))
+                    for extractor in self._extractors:
+                        entities.extend(extractor.extract(section))
+            mentions = len(entities)
+            # one entity per distinct finding, however many sections mention it
+            entities = aggregate(entities)
+            if extraction is not None:
+                extraction.set_attribute("mentions", mentions)
+                extraction.set_attribute("entities", len(entities))
+        return entities
 
-        dsp_entities = models.DspResponse(
+    def _sample_entities(self, note: NoteView, entities: List[Entity]) -> models.DspResponse:
+        return models.DspResponse.model_construct(
             schema_version="0.1",
             document=note.document,
-            resources=resources,
+            resources=to_wire(entities),
         )
 
-        adaptive_card_resource = self._adaptive_card(resources)
-        adaptive_card = models.DspResponse(
+    def _adaptive_card_output(self, note: NoteView, entities: List[Entity]) -> models.DspResponse:
+        with span("adaptive_card", entities=len(entities)):
+            adaptive_card_resource = self._adaptive_card(entities)
+        return models.DspResponse(
             schema_version="0.1",
             document=note.document,
             resources=[adaptive_card_resource],
         )
 
-        # NOTE: Composite plugin result (samplePluginResult) is not currently
-        # supported by the consuming application. The composite construction
-        # below has been removed. To re-enable, uncomment this block and update
-        # _process_note to return (dsp_entities, adaptive_card, composite).
-        # Also uncomment _composite_medication_summary and _timeline_card below.
-        #
-        # composite = models.DspResponse(
-        #     schema_version="0.1",
-        #     document={
-        #         "title": note.document.get("title") if note.document else "Clinical Note Analysis",
-        #         "type": (note.document or {}).get("type") if note.document else {"text": "note"}
-        #     },
-        #     resources=[self._composite_medication_summary(resources), self._timeline_card(resources)],
-        # )
-
-        return dsp_entities, adaptive_card
-
-    def _medical_code(self, code_value: str, description: str) -> models.MedicalCode:
-        return models.MedicalCode(
-            id=str(uuid4()),
-            code={
-                "identifier": code_value,
-                "description": description,
-                "system": "ICD-10-CM",
-                "systemUrl": "http://hl7.org/fhir/sid/icd-10-cm"
-            },
-            priority=models.Priority.Medium,
-            reason="Detected from clinical documentation"
-        )
-
-    def _vital_sign(self, value: float, unit: str) -> models.ObservationNumber:
-        return models.ObservationNumber(
-            id=str(uuid4()),
-            value=value,
-            valueUnit=unit,
-            priority=models.Priority.High,
-        )
-
-    def _observation_concept(self, concept_text: str, concept_id: str) -> models.ObservationConcept:
-        return models.ObservationConcept(
-            id=str(uuid4()),
-            value=models.ObservationValue(text=concept_text, conceptId=concept_id),
-            priority=models.Priority.Medium,
-        )
-
-    def _adaptive_card(self, entities: List[Any]) -> models.VisualizationResource:
-        # Build card body similar in spirit to C# version
-        body: List[Dict[str, Any]] = [
-            {
-                "type": "TextBlock",
-                "text": "🔍 Clinical Entities Extracted",
-                "weight": "Bolder",
-                "size": "Default"
-            },
-            {
-                "type": "TextBlock",
-                "text": f"Found {len(entities)} clinical {'entity' if len(entities)==1 else 'entities'} in the note",
-                "wrap": True,
-                "size": "Default",
-                "spacing": "Small"
-            },
-        ]
-        if entities:
-            for e in entities:
-                etype = getattr(e, 'type', 'Entity')
-                eid = getattr(e, 'id', '')
-                body.append({
-                    "type": "Container",
-                    "style": "emphasis",
-                    "spacing": "Medium",
-                    "items": [
-                        {"type": "TextBlock", "text": f"**{etype}**", "weight": "Bolder", "size": "Default"},
-                        {"type": "TextBlock", "text": eid, "size": "Small", "wrap": True},
-                    ],
-                })
-        else:
-            body.append({
-                "type": "Container",
-                "style": "attention",
-                "items": [
-                    {"type": "TextBlock", "text": "ℹ️ No clinical entities were detected in this note.", "wrap": True}
-                ],
-            })
-        body.append({
-            "type": "TextBlock",
-            "text": f"Processed at {datetime.now(timezone.utc).isoformat()}",
-            "size": "Small",
-            "spacing": "Medium",
-        })
+    # NOTE: Composite plugin result (samplePluginResult) is not currently
+    # supported by the consuming application. The composite construction
+    # below has been removed. To re-enable, uncomment this block as a
+    # "samplePluginResult" stage (needs "note" and "entities").
+    # Also uncomment _composite_medication_summary and _timeline_card below.
+    #
+    # composite = models.DspResponse(
+    #     schema_version="0.1",
+    #     document={
+    #         "title": note.document.get("title") if note.document else "Clinical Note Analysis",
+    #         "type": (note.document or {}).get("type") if note.document else {"text": "note"}
+    #     },
+    #     resources=[self._composite_medication_summary(resources), self._timeline_card(resources)],
+    # )
 
+    def _adaptive_card(self, entities: List[Entity]) -> models.VisualizationResource:
+        # body rows are capped by DGEXT_CARD_MAX_BYTES / DGEXT_CARD_MAX_ELEMENTS; overflow is summarized (app/cards.py)
         # TODO: add extension prefix to title
         return models.VisualizationResource(
             id=str(uuid4()),
             subtype="note",
             cardTitle=EXTENSION_PREFIX,
-            adaptive_card_payload={
-                "type": "AdaptiveCard",
-                "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                # `version` is intentionally omitted. The Dragon Copilot adaptive
-                # card spec does not require it and the validator's reference
-                # sample omits it. Set it explicitly only if you require a
-                # specific Adaptive Cards schema version.
-                "body": body,
-                "actions": [
-                    {
-                        "type": "Action.Execute",
-                        "title": "Append to note",
-                        "verb": "appendToNoteSection",
-                        "id": "appendToNoteSectionAction",
-                        "data": {
-                            "dragonAppendContent": "appended text content"
-                        }
-                    },
-                    {
-                        "type": "Action.Execute",
-                        "title": "Dismiss",
-                        "verb": "reject",
-                        "id": "rejectAction",
-                        "data": {
-                            "dragonExtensionToolName": "RejectCardTool"
-                        }
-                    }
-                ]
-            },
+            adaptive_card_payload=self._cards.render(entities, datetime.now(timezone.utc).isoformat()),
             payloadSources=[
                 {
                     "identifier": str(uuid4()),
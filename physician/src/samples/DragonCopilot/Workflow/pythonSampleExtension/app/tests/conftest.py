@@ -15,5 +15,6 @@ from app.main import app  # type: ignore  # noqa: E402
 
 @pytest.fixture()
 def client():
-    """Shared FastAPI TestClient fixture."""
-    return TestClient(app)
+    """Shared FastAPI TestClient fixture (lifespan + warm-up run on enter)."""
+    with TestClient(app) as c:
+        yield c
@@ -1,3 +1,9 @@
+from pathlib import Path
+
+from dragon_extension_runtime import ContractValidator
+
+SPEC = Path(__file__).resolve().parents[7] / "physician-extensibility-api.yaml"
+
 # Minimal note payload that triggers at least one entity (blood pressure) so counts are deterministic
 NOTE_CONTENT = "BP: 145/98 mmHg Patient denies chest pain. Diabetes risk evaluated. Medication review done."
 
@@ -52,3 +58,13 @@ def test_adaptive_card_structure(client):
     assert card.get("dragonCopilotCopyData"), "dragonCopilotCopyData missing"
     assert card.get("payloadSources"), "payloadSources missing"
 
+
+
+def test_adaptive_card_matches_the_visualization_resource_contract(client):
+    """The card resource breaks no rule of the physician spec but the deliberately omitted version."""
+    contracts = ContractValidator(SPEC)
+    card = client.post("/v1/process", json=payload).json()["payload"]["adaptive-card"]["resources"][0]
+
+    assert contracts.validate(card, schema="VisualizationResource") == [
+        "VisualizationResource.adaptive_card_payload.version: required"
+    ]
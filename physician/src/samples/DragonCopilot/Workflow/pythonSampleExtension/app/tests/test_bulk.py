@@ -0,0 +1,18 @@
+import json
+
+from app.bulk import main
+
+
+def test_bulk_cli_writes_process_responses(tmp_path, client):
+    note = {"note": {"resources": [{"content": "BP: 145/98 mmHg. Patient is diabetic and taking metformin."}]}}
+    source, results = tmp_path / "notes.ndjson", tmp_path / "results.ndjson"
+    source.write_text(json.dumps(note) + "\n" + json.dumps({"note": {"resources": "oops"}}) + "\n")
+
+    assert main([str(source), "-o", str(results), "--workers", "0", "--quiet"]) == 1  # one bad record
+
+    ok, bad = [json.loads(line) for line in results.read_text().splitlines()]
+    expected = client.post("/v1/process", json=note).json()
+    entities = ok["response"]["payload"]["sample-entities"]["resources"]
+    assert [e["type"] for e in entities] == [e["type"] for e in expected["payload"]["sample-entities"]["resources"]]
+    assert ok["response"].keys() == expected.keys()
+    assert bad["record"] == 2 and bad["error"].startswith("ValidationError")
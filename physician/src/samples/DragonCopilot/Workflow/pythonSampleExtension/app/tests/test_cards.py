@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from dragon_extension_runtime import dumps
+
+from app.cards import CardRenderer
+from app.entities import ConceptEntity, MedicalCodeEntity, VitalSignEntity
+
+NOW = "2025-09-09T12:00:00.000000+00:00"
+
+
+def _entities(n: int) -> list:
+    entities = []
+    for i in range(n):
+        entities.append(ConceptEntity("Prescription medication detected", f"concept-{i}", (0, i, i + 1)))
+        entities.append(VitalSignEntity(i, "mmHg", "Systolic blood pressure", "8480-6", (0, i, i + 1)))
+    entities.append(MedicalCodeEntity("E11.9", "Type 2 diabetes mellitus", "Detected", (0, 0, 1)))
+    return entities
+
+
+def _rows(card: dict) -> list:
+    return [b for b in card["body"] if b["type"] == "Container"]
+
+
+def test_small_notes_render_every_entity():
+    entities = _entities(2)
+    card = CardRenderer(28000, 200).render(entities, NOW)
+
+    assert len(_rows(card)) == len(entities)
+    assert [a["type"] for a in card["actions"]] == ["Action.Execute", "Action.Execute"]
+    # High priority (vital signs) first
+    assert _rows(card)[0]["items"][0]["text"] == "**ObservationNumber**"
+
+
+@pytest.mark.parametrize("max_bytes, max_elements", [(28000, 200), (4000, 200), (28000, 40), (1500, 200)])
+def test_large_notes_are_collapsed_within_the_budget(max_bytes, max_elements):
+    entities = _entities(500)
+    card = CardRenderer(max_bytes, max_elements).render(entities, NOW)
+
+    assert len(dumps(card)) <= max_bytes
+    assert json.dumps(card).count('"type"') <= max_elements
+    shown = len(_rows(card))
+    assert 0 < shown < len(entities)
+    assert card["body"][-2]["text"] == f"+{len(entities) - shown} more entities not shown"
+    show = [a for a in card["actions"] if a["type"] == "Action.ShowCard"]
+    if show:
+        facts = show[0]["card"]["body"][0]["facts"]
+        assert sum(int(f["value"]) for f in facts) == len(entities) - shown
+
+
+def test_the_showcard_is_dropped_before_the_summary_line():
+    renderer = CardRenderer(1500, 200)
+    frame = len(dumps(renderer.render([], NOW)))
+    card = CardRenderer(frame + 120, 200).render(_entities(50), NOW)
+
+    assert _rows(card) == []
+    assert card["body"][-2]["text"] == "+101 more entities not shown"
+    assert [a["type"] for a in card["actions"]] == ["Action.Execute", "Action.Execute"]
+
+
+def test_budget_must_hold_the_card_frame():
+    with pytest.raises(ValueError, match="budget too small"):
+        CardRenderer(500, 200)
+    with pytest.raises(ValueError, match="budget too small"):
+        CardRenderer(28000, 5)
+
+
+def test_response_card_stays_within_the_configured_budget(client):
+    content = " ".join(f"BP {100 + i}/{60 + i} mmHg." for i in range(400))
+    r = client.post("/v1/process", json={"note": {"resources": [{"content": content}]}})
+    card = r.json()["payload"]["adaptive-card"]["resources"][0]["adaptive_card_payload"]
+
+    assert len(r.json()["payload"]["sample-entities"]["resources"]) == 800
+    assert len(json.dumps(card, ensure_ascii=False, separators=(",", ":")).encode()) <= 28000
+    assert card["body"][-2]["text"].endswith("more entities not shown")
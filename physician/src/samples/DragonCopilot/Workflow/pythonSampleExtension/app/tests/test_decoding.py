@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+
+from app.decoding import PayloadView, decode_payload
+from app.models import DragonStandardPayload
+
+PYEXT_ROOT = Path(__file__).resolve().parents[2]
+
+PAYLOAD = {
+    "note": {
+        "language": "en-US",
+        "document": {"title": "Visit", "type": {"text": "note"}, "sections": [{"id": 1, "tags": None}]},
+        "resources": [{"content": "Patient is diabetic. BP 150/95", "extra": [1, 2]}, {}, {"content": None}],
+    },
+    "sessionData": {"sessionId": "s-1", "environment_id": "clinic-a"},
+    "unusedField": {"anything": True},
+}
+
+
+def test_view_matches_the_validated_model():
+    fast = decode_payload(json.dumps(PAYLOAD).encode())
+    model = PayloadView.from_model(DragonStandardPayload.model_validate(PAYLOAD))
+    for view in (fast, model):
+        assert view.environment_id == "clinic-a"
+        assert view.note.language == "en-US"
+        assert view.note.contents == ["Patient is diabetic. BP 150/95", None, None]
+        assert view.note.document == PAYLOAD["note"]["document"]
+    assert decode_payload(b"").note is None
+    assert decode_payload(b'{"note": null}').note is None
+
+
+@pytest.mark.parametrize(
+    "body, loc",
+    [
+        (b"[]", ["body"]),
+        (b'{"note": "text"}', ["body", "note"]),
+        (b'{"note": {"language": 1}}', ["body", "note", "language"]),
+        (b'{"note": {"resources": [{"content": 5}]}}', ["body", "note", "resources", 0, "content"]),
+        (b'{"note": {"resources": {"content": "x"}}}', ["body", "note", "resources"]),
+        (b'{"sessionData": {"environment_id": []}}', ["body", "sessionData", "environment_id"]),
+    ],
+)
+def test_wrongly_typed_fields_are_rejected(body, loc):
+    with pytest.raises(RequestValidationError) as err:
+        decode_payload(body)
+    assert list(err.value.errors()[0]["loc"]) == loc
+
+
+def test_fast_decoding_route():
+    code = (
+        "import json\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "c = TestClient(app)\n"
+        f"r = c.post('/v1/process', json={PAYLOAD!r})\n"
+        "dsp = r.json()['payload']['sample-entities']\n"
+        "print(json.dumps([r.status_code, dsp['document'], [e['type'] for e in dsp['resources']]]))\n"
+        "bad = c.post('/v1/process', content=b'{\"note\": ', headers={'content-type': 'application/json'})\n"
+        "print(json.dumps([bad.status_code, bad.json()['detail'][0]['type']]))\n"
+    )
+    env = {**os.environ, "DGEXT_FAST_DECODING": "true", "DGEXT_WARMUP_ENABLED": "false"}
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=PYEXT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    assert json.loads(out[0]) == [200, PAYLOAD["note"]["document"], ["ObservationNumber", "ObservationNumber", "MedicalCode"]]
+    assert json.loads(out[1]) == [422, "json_invalid"]
@@ -0,0 +1,39 @@
+from app.config import Settings
+from app.models import DragonStandardPayload
+from app.service import ProcessingService
+
+
+def _payload(content: str, language: str | None = None, environment_id: str | None = None):
+    return DragonStandardPayload.model_validate({
+        "sessionData": {"environment_id": environment_id},
+        "note": {"language": language, "resources": [{"content": content}]},
+    })
+
+
+def _entity_types(service: ProcessingService, payload) -> list[str]:
+    resp = service.process(payload, None, None)
+    return [r["type"] for r in resp.payload["sample-entities"].resources]
+
+
+def test_language_selects_lexicon():
+    service = ProcessingService()
+    spanish = "Paciente diabético, tomando metformina."
+
+    assert _entity_types(service, _payload(spanish, "es-ES")) == ["MedicalCode", "ObservationConcept"]
+    # unknown languages fall back to the built-in English keywords, matched as whole tokens
+    # ("DIABETIC" does not match "DIABÉTICO", nor "METFORMIN" "METFORMINA")
+    assert _entity_types(service, _payload(spanish, "xx-XX")) == []
+    assert _entity_types(service, _payload("Paciente tomando metformin.", "xx-XX")) == ["ObservationConcept"]
+    assert _entity_types(service, _payload("Presión arterial 150/95.", "en-US")) == []
+    assert _entity_types(service, _payload("Presión arterial 150/95.", "es-ES")) == ["ObservationNumber", "ObservationNumber"]
+
+
+def test_environment_lexicon_overrides_language_lexicon(tmp_path):
+    (tmp_path / "tenant-a").mkdir()
+    (tmp_path / "tenant-a" / "en-US.json").write_text('{"DIABETES": ["T2DM"]}')
+    service = ProcessingService(Settings(lexicons_dir=str(tmp_path)))
+
+    assert _entity_types(service, _payload("Known T2DM.", "en-US", "tenant-a")) == ["MedicalCode"]
+    assert _entity_types(service, _payload("Known T2DM.", "en-US", "tenant-b")) == []
+    assert _entity_types(service, _payload("Known T2DM.", "en-US", "../tenant-a")) == []
+
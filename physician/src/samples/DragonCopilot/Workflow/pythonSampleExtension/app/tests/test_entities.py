@@ -0,0 +1,84 @@
+from app import models
+import uuid
+import pytest
+from app.entities import ConceptEntity, Entity, MedicalCodeEntity, VitalSignEntity, new_id, to_wire
+from dragon_extension_runtime import encode_model
+
+
+def _wire(resources, exclude_none):
+    return encode_model(models.DspResponse(schema_version="0.1", resources=resources), exclude_none=exclude_none)
+
+
+PROVENANCE = [{"source": "document", "document_sections": [{"id": "0", "positions": [4, 10]}]}]
+
+
+def test_slot_entities_encode_like_validated_models():
+    entities = [
+        VitalSignEntity(145, "mmHg", "Systolic blood pressure", "8480-6", (0, 4, 10)),
+        MedicalCodeEntity("E11.9", "Type 2 diabetes mellitus without complications", "Detected from clinical documentation", (0, 4, 10)),
+        ConceptEntity("Prescription medication detected", "medication-concept-001", (0, 4, 10)),
+        VitalSignEntity(500, "mg", "Medication dose", None, (0, 4, 10), models.Priority.Medium),
+    ]
+    vital, code, concept, dose = entities
+    validated = [
+        models.ObservationNumber(
+            id=vital.id,
+            value=145.0,
+            valueUnit="mmHg",
+            priority=models.Priority.High,
+            context={
+                "display_description": "Systolic blood pressure",
+                "codes": [{"identifier": "8480-6", "description": "Systolic blood pressure", "system": "LOINC", "system_url": "http://loinc.org"}],
+            },
+            provenance=PROVENANCE,
+            occurrences=1,
+        ),
+        models.MedicalCode(
+            id=code.id,
+            code={
+                "identifier": "E11.9",
+                "description": "Type 2 diabetes mellitus without complications",
+                "system": "ICD-10-CM",
+                "systemUrl": "http://hl7.org/fhir/sid/icd-10-cm",
+            },
+            priority=models.Priority.Medium,
+            reason="Detected from clinical documentation",
+            provenance=PROVENANCE,
+            occurrences=1,
+        ),
+        models.ObservationConcept(
+            id=concept.id,
+            value=models.ObservationValue(text="Prescription medication detected", conceptId="medication-concept-001"),
+            priority=models.Priority.Medium,
+            provenance=PROVENANCE,
+            occurrences=1,
+        ),
+        models.ObservationNumber(
+            id=dose.id, value=500.0, valueUnit="mg", priority=models.Priority.Medium,
+            context={"display_description": "Medication dose"}, provenance=PROVENANCE, occurrences=1,
+        ),
+    ]
+    for exclude_none in (False, True):
+        assert _wire(to_wire(entities), exclude_none) == _wire(validated, exclude_none)
+    assert [e.type for e in entities] == [m.type for m in validated]
+
+
+def test_slot_entities_have_no_instance_dict():
+    assert not hasattr(VitalSignEntity(1.0, "mmHg", "Systolic blood pressure", "8480-6", (0, 0, 1)), "__dict__")
+
+
+def test_entity_subclasses_must_define_key_and_to_wire():
+    class Partial(Entity):
+        __slots__ = ()
+
+        def key(self):
+            return "partial"
+
+    with pytest.raises(TypeError, match="to_wire"):
+        Partial(models.Priority.Low, (0, 0, 1))
+
+
+def test_ids_are_unique_version_4_uuids():
+    ids = {new_id() for _ in range(1000)}
+    assert len(ids) == 1000
+    assert all(uuid.UUID(i).version == 4 and uuid.UUID(i).variant == uuid.RFC_4122 for i in ids)
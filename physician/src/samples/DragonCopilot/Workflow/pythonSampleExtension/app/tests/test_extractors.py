@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import pytest
+
+from dragon_extension_runtime import ContractValidator
+
+from app.decoding import NoteView, PayloadView
+from app.entities import VitalSignEntity
+from app.extractors import DEFAULT_EXTRACTORS, Extractor, tokenize
+from app.service import KeywordEngine, KEYWORD_SETS, ProcessingService
+
+SPEC = Path(__file__).resolve().parents[7] / "physician-extensibility-api.yaml"
+NOTE = "Vitals: BP: 145/98 mmHg, HR 78, Weight: 210 lbs. Glucose 108 mg/dL. Taking metformin 500 mg daily. Pulse 82 bpm."
+
+
+def _entities(service: ProcessingService, *contents: str) -> list[dict]:
+    resp = service.process(PayloadView(NoteView("en-US", None, list(contents)), None), None, None)
+    return resp.payload["sample-entities"].resources
+
+
+def _numbers(entities: list[dict]) -> list[tuple]:
+    return [(e["context"]["display_description"], e["value"], e["valueUnit"]) for e in entities if e["type"] == "ObservationNumber"]
+
+
+def test_vital_signs_and_doses_are_parsed_with_values_and_units():
+    entities = _entities(ProcessingService(), NOTE)
+
+    assert _numbers(entities) == [
+        ("Systolic blood pressure", 145.0, "mmHg"),
+        ("Diastolic blood pressure", 98.0, "mmHg"),
+        ("Heart rate", 78.0, "bpm"),
+        ("Heart rate", 82.0, "bpm"),
+        ("Body weight", 210.0, "lb"),
+        ("Medication dose", 500.0, "mg"),  # "108 mg/dL" is a concentration, not a dose
+    ]
+    assert [e["type"] for e in entities][-1] == "ObservationConcept"
+    assert entities[0]["context"]["codes"][0]["identifier"] == "8480-6"
+
+
+def test_offsets_point_at_the_source_text():
+    entities = _entities(ProcessingService(), "No vitals.", NOTE)
+
+    for entity in entities:
+        for section in entity["provenance"][0]["document_sections"]:
+            assert section["id"] == "1"
+            start, end = section["positions"]
+            if entity["type"] == "ObservationNumber":
+                assert str(int(entity["value"])) in NOTE[start:end]
+    taking, metformin = (section["positions"][0] for section in entities[-1]["provenance"][0]["document_sections"])
+    assert (NOTE[taking:taking + 6], NOTE[metformin:metformin + 9]) == ("Taking", "metformin")
+    assert NOTE[slice(*entities[0]["provenance"][0]["document_sections"][0]["positions"])] == "145/98 mmHg"
+
+
+def test_repeated_mentions_keep_one_position_pair_per_section(client):
+    note = "Diabetes noted. BP: 145/98 mmHg. Diabetes follow-up. BP 145/98 mmHg again."
+    body = client.post("/v1/process", json={"note": {"resources": [{"content": note}, {"content": "Diabetes"}]}}).json()
+
+    diabetes = body["payload"]["sample-entities"]["resources"][-1]
+    assert diabetes["provenance"] == [
+        {"source": "document", "document_sections": [{"id": "0", "positions": [0, 8]}, {"id": "0", "positions": [33, 41]}]},
+        {"source": "document", "document_sections": [{"id": "1", "positions": [0, 8]}]},
+    ]
+    # the response breaks only the spec rules the README lists, none of Provenance's
+    assert set(ContractValidator(SPEC).validate(body)) == {
+        "Document: type",
+        "MedicalCode.context: required",
+        "MedicalCode.priority: enum",
+        "ObservationNumber.priority: enum",
+        "VisualizationResource.adaptive_card_payload.version: required",
+    }
+
+
+def test_positions_are_utf16_code_units():
+    # an emoji is one code point but two UTF-16 units; positions after it follow the .NET string offsets
+    note = "\U0001F9E0 Patient is diabetic \U0001F600. BP: 145/98 mmHg"
+    units = note.encode("utf-16-le")
+    entities = _entities(ProcessingService(), note)
+
+    texts = []
+    for entity in entities:
+        start, end = entity["provenance"][0]["document_sections"][0]["positions"]
+        texts.append(units[2 * start:2 * end].decode("utf-16-le"))
+    assert texts == ["145/98 mmHg", "145/98 mmHg", "diabetic"]
+
+
+def test_mentions_are_whole_tokens_and_need_a_value():
+    engine = KeywordEngine(KEYWORD_SETS)
+
+    assert engine.match(tokenize("BPM logged")) == {}
+    assert engine.match(tokenize("elevated blood pressure")) == {"BLOOD PRESSURE": [(1, 3)]}
+    assert _entities(ProcessingService(), "Elevated blood pressure. 150/95 on file.") == []
+
+
+def test_custom_extractors_share_the_token_stream():
+    seen = []
+
+    class Temperature(Extractor):
+        def extract(self, section):
+            seen.append(section.tokens)
+            for i, (kind, norm, start, end) in enumerate(section.tokens[:-1]):
+                if kind == "num" and section.tokens[i + 1][1] == "°":
+                    yield VitalSignEntity(float(norm), "[degF]", "Body temperature", "8310-5", (section.index, start, end))
+
+    service = ProcessingService(extractors=(*DEFAULT_EXTRACTORS, Temperature()))
+    entities = _entities(service, "Temp: 98.6°F, BP 120/80")
+
+    assert _numbers(entities)[-1] == ("Body temperature", 98.6, "[degF]")
+    assert seen[0] == tokenize("Temp: 98.6°F, BP 120/80")
+
+
+def test_extractors_must_define_extract():
+    class Unfinished(Extractor):
+        pass
+
+    with pytest.raises(TypeError, match="extract"):
+        Unfinished()
+
+
+def test_duplicate_findings_are_merged_across_sections():
+    sections = ["BP 145/98 mmHg, diabetic.", "No change.", "Repeat BP: 145/98. Diabetes type 2.", "BP 150/95"]
+    entities = _entities(ProcessingService(), *sections)
+
+    assert [(e["type"], e["occurrences"]) for e in entities] == [
+        ("ObservationNumber", 2),
+        ("ObservationNumber", 2),
+        ("MedicalCode", 2),
+        ("ObservationNumber", 1),
+        ("ObservationNumber", 1),
+    ]
+    # one provenance entry per note resource the finding appears in
+    systolic = entities[0]["provenance"]
+    assert [[s["id"] for s in entry["document_sections"]] for entry in systolic] == [["0"], ["2"]]
+    assert sections[2][slice(*systolic[1]["document_sections"][0]["positions"])] == "145/98"
+    assert [[s["id"] for s in entry["document_sections"]] for entry in entities[2]["provenance"]] == [["0"], ["2"]]
@@ -0,0 +1,55 @@
+import pytest
+
+from app.config import Settings
+from app.decoding import NoteView, PayloadView
+from app.pipeline import Pipeline, Stage
+from app.service import ProcessingService
+
+PAYLOAD = {"note": {"resources": [{"content": "BP: 145/98 mmHg. Patient is diabetic."}]}}
+
+
+def test_manifest_outputs_map_to_stages():
+    pipeline = ProcessingService().pipeline
+
+    assert pipeline.outputs == ("sample-entities", "adaptive-card")
+    assert pipeline.plan(pipeline.enabled) == ("entities", "sample-entities", "adaptive-card")
+    assert pipeline.plan({"sample-entities"}) == ("entities", "sample-entities")
+    assert pipeline.plan(()) == ()
+
+
+def test_unselected_outputs_are_not_built():
+    service = ProcessingService(Settings(outputs=["sample-entities"]))
+    service._cards.render = None  # would fail if the card were built
+    payload = PayloadView(NoteView(None, None, ["BP: 145/98 mmHg"]), None)
+
+    resp = service.process(payload, None, None)
+
+    assert list(resp.payload) == ["sample-entities"]
+    assert len(resp.payload["sample-entities"].resources) == 2
+    assert service.process(payload, None, None, outputs=frozenset()).payload == {}
+
+
+def test_outputs_header_selects_outputs(client):
+    r = client.post("/v1/process", json=PAYLOAD, headers={"x-extension-outputs": "adaptive-card"})
+    assert r.status_code == 200
+    assert list(r.json()["payload"]) == ["adaptive-card"]
+
+    assert list(client.post("/v1/process", json=PAYLOAD).json()["payload"]) == ["sample-entities", "adaptive-card"]
+
+    bad = client.post("/v1/process", json=PAYLOAD, headers={"x-extension-outputs": "sample-entities, nope"})
+    assert bad.status_code == 400
+    assert "nope" in bad.json()["detail"]
+
+
+def test_graph_errors_fail_at_startup(tmp_path):
+    with pytest.raises(ValueError, match="has no stage"):
+        Pipeline(["note"], ["card"], {})
+    with pytest.raises(ValueError, match="Nothing provides 'session'"):
+        Pipeline(["note"], ["card"], {"card": Stage(("note", "session"), lambda n, s: None)})
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline(["note"], ["a"], {"a": Stage(("b",), len), "b": Stage(("a",), len)})
+    with pytest.raises(ValueError, match="not declared"):
+        ProcessingService(Settings(outputs=["samplePluginResult"]))
+    (tmp_path / "extension.yaml").write_text("name: x\ntools: []\n")
+    with pytest.raises(ValueError, match="no tools"):
+        ProcessingService(Settings(manifest_path=str(tmp_path / "extension.yaml")))
@@ -3,6 +3,19 @@ def test_health(client):
     assert r.status_code == 200
     assert r.json()["status"] == "healthy"
 
+def test_readiness_after_warmup(client):
+    r = client.get("/health/readiness")
+    assert r.status_code == 200
+    assert r.json()["status"] == "healthy"
+
+def test_readiness_before_warmup():
+    from fastapi.testclient import TestClient
+    from app.main import app
+    app.state.ready = False
+    # lifespan (and warm-up) only runs when the client is entered as a context manager
+    r = TestClient(app).get("/health/readiness")
+    assert r.status_code == 503
+
 def test_v1_health(client):
     r = client.get("/v1/health")
     assert r.status_code == 200
@@ -22,3 +35,45 @@ def test_process_empty_payload(client):
         if isinstance(se, dict):
             # DSP response shape expectation
             assert "resources" in se
+
+def test_process_respond_async(client):
+    import time
+    payload = {"note": {"resources": [{"content": "Patient is diabetic. BP: 150/95"}]}}
+    r = client.post("/v1/process", json=payload, headers={"Prefer": "respond-async"})
+    assert r.status_code == 202
+    assert r.headers["location"] == r.json()["statusUrl"]
+    for _ in range(500):
+        job = client.get(r.headers["location"]).json()
+        if job["status"] in ("succeeded", "failed"):
+            break
+        time.sleep(0.01)
+    assert job["status"] == "succeeded"
+    assert job["result"]["success"] is True
+    assert "sample-entities" in job["result"]["payload"]
+
+def test_process_is_audited_with_redacted_output(client, tmp_path):
+    import asyncio, gzip, json
+    from dragon_extension_runtime import AuditLog
+    from app.config import get_settings
+    from app.main import app
+    app.state.audit = AuditLog(tmp_path, include_outputs=True, redact_fields=get_settings().audit_redact_fields)
+    try:
+        payload = {"note": {"resources": [{"content": "Patient is diabetic and taking metformin."}]}}
+        r = client.post("/v1/process", json=payload, headers={"x-ms-request-id": "req-1"})
+        asyncio.run(app.state.audit.flush())
+    finally:
+        app.state.audit = None
+    [path] = tmp_path.glob("audit-*.ndjson.gz")
+    [record] = [json.loads(line) for line in gzip.open(path, "rt")]
+    assert record["requestId"] == "req-1"
+    assert record["responseBytes"] == len(r.content)
+    assert record["counts"] == {"entities": 2}
+    concept = record["output"]["payload"]["sample-entities"]["resources"][1]
+    assert concept["value"] == "[REDACTED]"
+
+def test_cache_sizes_report_the_engine_registry(client):
+    from app.main import app
+    client.post("/v1/process", json={"note": {"language": "en-US", "resources": [{"content": "diabetic"}]}})
+    engines = app.state.service.cache_sizes()["engines"]
+    assert engines["entries"] >= 1
+    assert engines["hits"] + engines["misses"] >= 1
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PYEXT_ROOT = Path(__file__).resolve().parents[2]
+
+# Budget for the extension's app.* and the shared dragon_extension_runtime.* modules (framework imports excluded),
+# measured with -X importtime
+APP_IMPORT_BUDGET_MS = 100
+OWN_PACKAGES = ("app", "dragon_extension_runtime")
+# standard library modules of runtime subsystems that are off by default (job store, profiling, memory, process pools)
+OPTIONAL_MODULES = ("sqlite3", "cProfile", "tracemalloc", "multiprocessing")
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DGEXT_STARTUP_OPTIMIZED": "true"}
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=PYEXT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def test_app_import_time_budget():
+    stderr = _run("import app.main", "-X", "importtime").stderr
+    app_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit() and name.strip().split(".")[0] in OWN_PACKAGES:
+            app_us += int(self_us)
+    assert 0 < app_us / 1000 <= APP_IMPORT_BUDGET_MS
+
+
+def test_disabled_subsystems_are_not_imported():
+    code = f"import sys, app.main\nprint(*sorted(set({OPTIONAL_MODULES!r}) & set(sys.modules)))"
+    assert _run(code).stdout.split() == []
+
+
+def test_startup_optimized_disables_openapi():
+    code = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "c = TestClient(app)\n"
+        "print(c.get('/openapi.json').status_code, c.get('/docs').status_code)\n"
+        "print(c.post('/v1/process', json={'note': {'resources': [{'content': 'BP 120/80'}]}}).status_code)\n"
+    )
+    assert _run(code).stdout.split() == ["404", "404", "200"]
@@ -0,0 +1,34 @@
+"""Startup warm-up: prime validators and caches before /health/readiness reports ready.
+
+Models use pydantic ``defer_build`` and FastAPI builds its request-body adapter lazily, so the
+first real request would pay for validator compilation. ``warm_up`` sends a synthetic note through
+``POST /v1/process`` in-process (straight into the ASGI app) during the lifespan instead.
+"""
+from __future__ import annotations
+import json
+import logging
+import time
+from dragon_extension_runtime import post_in_process
+
+logger = logging.getLogger("dragon.pyextension")
+
+SYNTHETIC_PAYLOAD = {
+    "sessionData": {"sessionId": "warmup"},
+    "note": {
+        "document": {"title": "Warm-up Note", "type": {"text": "Clinic Note"}},
+        "resources": [
+            {"content": "BP: 145/98 mmHg. Patient is diabetic and taking metformin."},
+        ],
+    },
+}
+
+
+async def warm_up(app) -> None:
+    started = time.perf_counter()
+    status = await post_in_process(
+        app, "/v1/process", json.dumps(SYNTHETIC_PAYLOAD).encode("utf-8"), headers=[(b"x-ms-request-id", b"warmup")]
+    )
+    if status != 200:
+        logger.warning("Warm-up request to /v1/process returned %s", status)
+    logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
+
@@ -0,0 +1,71 @@
+"""Benchmark: bulk-processing throughput of ``python -m app.bulk`` by worker count.
+
+Generates synthetic notes in NDJSON and runs them through the bulk processor
+inline (0 workers) and with 1, 2, 4, ... worker processes up to the number of
+cores. It reports records per second and the speed-up over one worker. Pool
+start-up is included, so use enough records to amortize it. Run from the
+``pythonSampleExtension`` directory::
+
+    python3.12 benchmarks/bench_bulk.py --records 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+PYEXT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYEXT_ROOT))
+
+import app  # noqa: E402,F401 - makes the shared runtime importable
+from dragon_extension_runtime import run_bulk  # noqa: E402
+
+from app.bulk import create_service  # noqa: E402
+from app.models import DragonStandardPayload  # noqa: E402
+
+
+def _write_notes(path: Path, records: int) -> None:
+    with path.open("w", encoding="utf-8") as stream:
+        for i in range(records):
+            content = (
+                f"Visit {i}. BP: {110 + i % 50}/{70 + i % 20} mmHg. "
+                "Patient is diabetic and taking metformin. " * 4
+            )
+            stream.write(json.dumps({"note": {"resources": [{"content": content}]}}) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = [0] + [n for n in (1, 2, 4, 8, 16, 32, 64) if n <= cores]
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "notes.ndjson"
+        _write_notes(source, args.records)
+        one_worker = None
+        for workers in worker_counts:
+            stats = run_bulk(
+                [str(source)],
+                io.BytesIO(),
+                create_service,
+                DragonStandardPayload,
+                workers=workers,
+                chunk_size=args.chunk_size,
+                exclude_none=False,
+            )
+            if workers == 1:
+                one_worker = stats.records_per_second
+            scaling = f" ({stats.records_per_second / one_worker:4.2f}x one worker)" if one_worker else ""
+            print(f"{workers:>3} workers: {stats.records_per_second:8.0f} records/s{scaling}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: time to first successful ``POST /v1/process`` from a cold interpreter.
+
+Each run starts a fresh Python process that imports ``app.main`` and sends one
+request straight into the ASGI app (no server, no HTTP client), then exits. The
+wall-clock time of the whole process is reported for the default and the
+startup-optimized (``DGEXT_STARTUP_OPTIMIZED=true``) configurations. Run from
+the ``pythonSampleExtension`` directory::
+
+    python3.12 benchmarks/bench_cold_start.py --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PYEXT_ROOT = Path(__file__).resolve().parents[1]
+
+_FIRST_REQUEST = """
+import asyncio, json
+from app.main import app
+
+body = json.dumps({
+    "note": {"resources": [{"content": "BP 145/98 mmHg. Diabetic, taking metformin."}]},
+}).encode()
+
+async def first_request():
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/v1/process",
+        "raw_path": b"/v1/process", "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 5181),
+    }
+    await app(scope, receive, send)
+    assert status == [200], status
+
+asyncio.run(first_request())
+"""
+
+
+def _time_first_request(optimized: bool) -> float:
+    env = {**os.environ, "DGEXT_STARTUP_OPTIMIZED": "true" if optimized else "false"}
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", _FIRST_REQUEST],
+        cwd=PYEXT_ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, optimized in (("default", False), ("optimized", True)):
+        samples = [_time_first_request(optimized) for _ in range(args.runs)]
+        print(
+            f"{label:>9}: median {statistics.median(samples) * 1e3:.0f} ms, "
+            f"min {min(samples) * 1e3:.0f} ms over {args.runs} cold starts"
+        )
+
+
+if __name__ == "__main__":
+    main()
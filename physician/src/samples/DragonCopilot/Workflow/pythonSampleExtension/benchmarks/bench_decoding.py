@@ -0,0 +1,71 @@
+"""Benchmark: full DragonStandardPayload validation vs the fast decoding view (DGEXT_FAST_DECODING).
+
+For notes of 1 to 200 resources with a document of growing size, both paths go from the raw request body
+to what the pipeline reads. "validated" is FastAPI's default: parse the JSON, then validate the payload
+model (Note, every NoteResource, a copy of the document). "view" is app.decoding.decode_payload: parse
+once, check only the language, environment id and resource texts. Run from the ``pythonSampleExtension``
+directory::
+
+    python3.12 benchmarks/bench_decoding.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+PYEXT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYEXT_ROOT))
+
+import app  # noqa: E402,F401 - makes the shared runtime importable
+from dragon_extension_runtime import loads  # noqa: E402
+
+from app.decoding import PayloadView, decode_payload  # noqa: E402
+from app.models import DragonStandardPayload  # noqa: E402
+
+
+def _body(resources: int) -> bytes:
+    payload = {
+        "note": {
+            "language": "en-US",
+            "document": {
+                "title": "Visit",
+                "type": {"text": "note"},
+                "sections": [{"id": i, "title": f"Section {i}", "codes": [i, i + 1]} for i in range(resources)],
+            },
+            "resources": [
+                {"content": "Patient is diabetic, taking metformin. BP 150/95. " * 4, "kind": "note", "id": str(i)}
+                for i in range(resources)
+            ],
+        },
+        "sessionData": {"sessionId": "s-1", "environment_id": "clinic-a"},
+    }
+    return json.dumps(payload).encode()
+
+
+def _validated(body: bytes) -> PayloadView:
+    return PayloadView.from_model(DragonStandardPayload.model_validate(loads(body)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    _validated(_body(1))  # build the deferred validators outside the timings
+    print(f"{'resources':>9} {'body':>9} {'validated':>12} {'view':>12}")
+    for resources in (1, 20, 200):
+        body = _body(resources)
+        number = max(1, 2000 // resources)
+        times = [
+            min(timeit.repeat(lambda: decode(body), number=number, repeat=args.repeat)) / number
+            for decode in (_validated, decode_payload)
+        ]
+        print(f"{resources:>9} {len(body) / 1024:>6.1f} KiB {times[0] * 1e6:>9.1f} us {times[1] * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
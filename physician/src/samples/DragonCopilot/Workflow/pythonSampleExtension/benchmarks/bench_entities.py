@@ -0,0 +1,126 @@
+"""Benchmark: slot entities encoded once at the boundary vs a validated pydantic model per match.
+
+For notes yielding 30 to 900 entities, both paths build the entities, the "sample-entities" DspResponse
+and its JSON. The "validated" path is the pipeline's previous one: a MedicalCode / ObservationNumber /
+ObservationConcept validated per match and a validated DspResponse. The "slots" path is the current
+one (app.entities). Reports time per note and the memory allocated while building it (tracemalloc
+peak). Run from the ``pythonSampleExtension`` directory::
+
+    python3.12 benchmarks/bench_entities.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from uuid import uuid4
+
+PYEXT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYEXT_ROOT))
+
+import app  # noqa: E402,F401 - makes the shared runtime importable
+from dragon_extension_runtime import encode_model  # noqa: E402
+
+from app import models  # noqa: E402
+from app.entities import ConceptEntity, MedicalCodeEntity, VitalSignEntity, to_wire  # noqa: E402
+
+
+def _provenance() -> list:
+    return [{"source": "document", "document_sections": [{"id": "0", "positions": [4, 10]}]}]
+
+
+def _validated(matches: int) -> bytes:
+    resources = []
+    for _ in range(matches):
+        resources.append(
+            models.ObservationNumber(
+                id=str(uuid4()),
+                value=145.0,
+                valueUnit="mmHg",
+                priority=models.Priority.High,
+                context={
+                    "display_description": "Systolic blood pressure",
+                    "codes": [
+                        {
+                            "identifier": "8480-6",
+                            "description": "Systolic blood pressure",
+                            "system": "LOINC",
+                            "system_url": "http://loinc.org",
+                        }
+                    ],
+                },
+                provenance=_provenance(),
+            )
+        )
+        resources.append(
+            models.MedicalCode(
+                id=str(uuid4()),
+                code={
+                    "identifier": "E11.9",
+                    "description": "Type 2 diabetes mellitus without complications",
+                    "system": "ICD-10-CM",
+                    "systemUrl": "http://hl7.org/fhir/sid/icd-10-cm",
+                },
+                priority=models.Priority.Medium,
+                reason="Detected from clinical documentation",
+                provenance=_provenance(),
+            )
+        )
+        resources.append(
+            models.ObservationConcept(
+                id=str(uuid4()),
+                value=models.ObservationValue(text="Prescription medication detected", conceptId="medication-concept-001"),
+                priority=models.Priority.Medium,
+                provenance=_provenance(),
+            )
+        )
+    card_rows = [(getattr(e, "type", "Entity"), getattr(e, "id", "")) for e in resources]
+    dsp = models.DspResponse(schema_version="0.1", document=None, resources=resources)
+    return encode_model(dsp, exclude_none=False) + repr(len(card_rows)).encode()
+
+
+def _slots(matches: int) -> bytes:
+    entities = []
+    for _ in range(matches):
+        entities.append(VitalSignEntity(145.0, "mmHg", "Systolic blood pressure", "8480-6", (0, 4, 10)))
+        entities.append(
+            MedicalCodeEntity(
+                "E11.9", "Type 2 diabetes mellitus without complications", "Detected from clinical documentation", (0, 4, 10)
+            )
+        )
+        entities.append(ConceptEntity("Prescription medication detected", "medication-concept-001", (0, 4, 10)))
+    card_rows = [(e.type, e.id) for e in entities]
+    dsp = models.DspResponse.model_construct(schema_version="0.1", document=None, resources=to_wire(entities))
+    return encode_model(dsp, exclude_none=False) + repr(len(card_rows)).encode()
+
+
+def _peak_bytes(build, matches: int) -> int:
+    tracemalloc.start()
+    try:
+        build(matches)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for build in (_validated, _slots):  # build validators and serializers outside the timings
+        build(1)
+    print(f"{'entities':>8} {'path':>9} {'per note':>12} {'allocated':>12}")
+    for matches in (10, 100, 300):
+        for name, build in (("validated", _validated), ("slots", _slots)):
+            number = max(1, 3000 // matches)
+            best = min(timeit.repeat(lambda: build(matches), number=number, repeat=args.repeat)) / number
+            peak = _peak_bytes(build, matches)
+            print(f"{matches * 3:>8} {name:>9} {best * 1e6:>9.0f} us {peak / 1024:>9.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: one shared token stream for all extractors vs one regex scan per extractor.
+
+For notes of 1 to 100 copies of the clinic-note vitals paragraph, both paths find the same blood pressure,
+heart rate, weight, dose and keyword mentions. Both build the entities. "per-regex" runs one compiled pattern
+per extractor over the text, the approach app.extractors replaces; "single-pass" is the pipeline's:
+``tokenize`` once, then lexicon matching and every extractor on the tokens. Run from the ``pythonSampleExtension``
+directory::
+
+    python3.12 benchmarks/bench_extractors.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+PYEXT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PYEXT_ROOT))
+
+import app  # noqa: E402,F401 - makes the shared runtime importable
+
+from app.entities import ConceptEntity, MedicalCodeEntity, VitalSignEntity  # noqa: E402
+from app.extractors import DEFAULT_EXTRACTORS, Section, tokenize  # noqa: E402
+from app.service import KEYWORD_SETS, KeywordEngine  # noqa: E402
+
+PARAGRAPH = (
+    "Vitals: BP: 145/98 mmHg, HR 78, Weight: 210 lbs. Patient is diabetic, fasting glucose 108 mg/dL. "
+    "Taking metformin 500 mg daily; prescribed lisinopril 10 mg. Repeat blood pressure 150/95 in two weeks. "
+)
+
+_BP = re.compile(r"\b(?:BP|blood pressure)\b\W{0,3}(\d+)\s*/\s*(\d+)", re.I)
+_HR = re.compile(r"\b(?:HR|heart rate|pulse)\b\W{0,3}(\d+)|(\d+)\s*bpm\b", re.I)
+_WEIGHT = re.compile(r"\b(?:weight|wt)\b\W{0,3}(\d+(?:\.\d+)?)\s*(kg|lbs?)\b", re.I)
+_DOSE = re.compile(r"(\d+(?:\.\d+)?)\s*(mg|mcg|g|ml)\b(?!\s*/)", re.I)
+_DIABETES = re.compile(r"\b(?:diabetes|diabetic)\b", re.I)
+_MEDICATION = re.compile(r"\b(?:medication|prescribed|taking|metformin)\b", re.I)
+
+
+def _per_regex(text: str) -> list:
+    entities = []
+    for m in _BP.finditer(text):
+        offsets = (0, m.start(1), m.end(2))
+        entities.append(VitalSignEntity(int(m[1]), "mmHg", "Systolic blood pressure", "8480-6", offsets))
+        entities.append(VitalSignEntity(int(m[2]), "mmHg", "Diastolic blood pressure", "8462-4", offsets))
+    for m in _HR.finditer(text):
+        entities.append(VitalSignEntity(float(m[1] or m[2]), "bpm", "Heart rate", "8867-4", (0, m.start(), m.end())))
+    for m in _WEIGHT.finditer(text):
+        entities.append(VitalSignEntity(float(m[1]), m[2].lower(), "Body weight", "29463-7", (0, m.start(1), m.end())))
+    for m in _DOSE.finditer(text):
+        entities.append(VitalSignEntity(float(m[1]), m[2].lower(), "Medication dose", None, (0, m.start(), m.end())))
+    for m in _DIABETES.finditer(text):
+        entities.append(MedicalCodeEntity("E11.9", "Type 2 diabetes mellitus", "Detected", (0, m.start(), m.end())))
+    for m in _MEDICATION.finditer(text):
+        entities.append(ConceptEntity("Prescription medication detected", "medication-concept-001", (0, m.start(), m.end())))
+    return entities
+
+
+def _single_pass(engine: KeywordEngine, text: str) -> list:
+    tokens = tokenize(text)
+    section = Section(0, text, tokens, engine.match(tokens))
+    return [entity for extractor in DEFAULT_EXTRACTORS for entity in extractor.extract(section)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = KeywordEngine(KEYWORD_SETS)
+    assert len(_per_regex(PARAGRAPH)) == len(_single_pass(engine, PARAGRAPH))
+    print(f"{'note':>9} {'per-regex':>12} {'single-pass':>12}")
+    for copies in (1, 10, 100):
+        text = PARAGRAPH * copies
+        number = max(1, 1000 // copies)
+        per_regex = min(timeit.repeat(lambda: _per_regex(text), number=number, repeat=args.repeat)) / number
+        single = min(timeit.repeat(lambda: _single_pass(engine, text), number=number, repeat=args.repeat)) / number
+        print(f"{len(text) / 1024:>5.1f} KiB {per_regex * 1e6:>9.0f} us {single * 1e6:>9.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Radiologists quality-check sample extension (Python).
+
+The sample is built on the shared runtime in ``shared/python`` at the
+repository root. When that package is not installed it is imported straight
+from the checkout.
+"""
+
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+
+if find_spec("dragon_extension_runtime") is None:
+    for _parent in Path(__file__).resolve().parents:
+        _runtime_root = _parent / "shared" / "python"
+        if (_runtime_root / "dragon_extension_runtime").is_dir():
+            sys.path.append(str(_runtime_root))
+            break
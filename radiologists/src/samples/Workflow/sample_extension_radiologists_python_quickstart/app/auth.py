@@ -14,13 +14,32 @@ off, the FastAPI dependency is a no-op and every route is anonymous.
 A well-known, idiomatic library (`PyJWT`, with the ``crypto`` extra) performs
 signature validation. The signing-key resolver is injectable so tests can
 supply a local key and run hermetically without contacting Entra ID.
+
+Validated claims are kept in a small bounded cache keyed by a SHA-256 digest of
+the token, so a token Dragon reuses across requests is only signature-checked
+once. Entries expire at the token's ``exp`` minus the configured clock skew and
+are dropped whenever the resolver reports a signing-key rotation.
+
+The default resolver (:mod:`app.jwks`) fetches the tenant JWKS asynchronously,
+so the event loop never blocks on Entra ID. PyJWT, ``cryptography`` and
+``httpx`` are imported lazily, only once authentication is actually used, which
+keeps them off the cold-start path when authentication is disabled. Signature
+verification itself can optionally run on a small dedicated thread pool
+(``TokenVerificationThreads``) so concurrent requests are not serialized
+behind the RSA work on the event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Protocol
 
-import jwt
+from dragon_extension_runtime import span
 from fastapi import Depends, Header, HTTPException, status
 
 from .config import AuthenticationSettings, Settings, get_settings
@@ -33,25 +52,92 @@ class SigningKeyResolver(Protocol):
         ...
 
 
-class JwksSigningKeyResolver:
-    """Resolves signing keys from the tenant's Entra ID JWKS endpoint."""
+class ValidatedTokenCache:
+    """Bounded LRU of validated token claims.
 
-    def __init__(self, jwks_uri: str) -> None:
-        # PyJWKClient caches keys and refreshes on cache miss.
-        self._client = jwt.PyJWKClient(jwks_uri)
+    Keys are SHA-256 digests, so raw bearer tokens are never held in memory
+    longer than the request that carried them. Each entry records when it
+    stops being trustworthy (``exp`` minus clock skew) and the signing-key set
+    version it was verified against; a different version clears the cache.
+    """
 
-    def get_signing_key(self, token: str) -> object:
-        return self._client.get_signing_key_from_jwt(token).key
+    def __init__(self, max_entries: int, clock_skew_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._clock_skew_seconds = clock_skew_seconds
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._key_set_version: object = None
+        # Token validation may run on worker threads, so guard the LRU.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes, key_set_version: object) -> dict | None:
+        """Return cached claims for ``key`` or ``None`` on a miss."""
+
+        with self._lock:
+            self._sync_key_set_version(key_set_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, key: bytes, claims: dict, key_set_version: object) -> None:
+        """Cache ``claims`` until the token's ``exp`` minus clock skew."""
+
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        expires_at = exp - self._clock_skew_seconds
+        if expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._sync_key_set_version(key_set_version)
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def _sync_key_set_version(self, key_set_version: object) -> None:
+        if key_set_version != self._key_set_version:
+            self._entries.clear()
+            self._key_set_version = key_set_version
 
 
 # Module-level resolver cache keyed by JWKS URI so we reuse one PyJWKClient.
 _resolvers: dict[str, SigningKeyResolver] = {}
 
+# Validated-token caches, keyed by JWKS URI like the resolvers above.
+_token_caches: dict[str, ValidatedTokenCache] = {}
+
+# Dedicated pool for signature verification (created on first use).
+_verification_executor: ThreadPoolExecutor | None = None
+_verification_executor_size = 0
+
 
 def _default_resolver(auth: AuthenticationSettings) -> SigningKeyResolver:
     resolver = _resolvers.get(auth.jwks_uri)
     if resolver is None:
-        resolver = JwksSigningKeyResolver(auth.jwks_uri)
+        from .jwks import AsyncJwksSigningKeyResolver
+
+        resolver = AsyncJwksSigningKeyResolver(
+            auth.jwks_uri,
+            refresh_interval_seconds=auth.jwks_refresh_interval_seconds,
+            min_refetch_interval_seconds=auth.jwks_min_refetch_interval_seconds,
+            timeout_seconds=auth.jwks_timeout_seconds,
+        )
         _resolvers[auth.jwks_uri] = resolver
     return resolver
 
@@ -65,6 +151,7 @@ def set_signing_key_resolver_factory(factory) -> None:
 
     global _resolver_factory
     _resolver_factory = factory
+    _token_caches.clear()
 
 
 def reset_signing_key_resolver_factory() -> None:
@@ -72,6 +159,79 @@ def reset_signing_key_resolver_factory() -> None:
 
     global _resolver_factory
     _resolver_factory = _default_resolver
+    _token_caches.clear()
+
+
+async def start_signing_key_resolver(auth: AuthenticationSettings) -> None:
+    """Prefetch signing keys at startup (no-op when authentication is off)."""
+
+    if not auth.enabled:
+        return
+    start = getattr(_resolver_factory(auth), "start", None)
+    if start is not None:
+        await start()
+
+
+async def stop_signing_key_resolvers() -> None:
+    """Stop background key refreshes on shutdown."""
+
+    for resolver in list(_resolvers.values()):
+        stop = getattr(resolver, "stop", None)
+        if stop is not None:
+            await stop()
+
+
+def auth_cache_sizes() -> dict[str, int]:
+    """Sizes of the module-level resolver and validated-token caches (for ``/debug/memory``)."""
+
+    return {
+        "signingKeyResolvers": len(_resolvers),
+        "tokenCaches": len(_token_caches),
+        "validatedTokens": sum(len(cache) for cache in list(_token_caches.values())),
+    }
+
+
+def shutdown_token_verification_executor() -> None:
+    """Release the signature-verification thread pool (on shutdown)."""
+
+    global _verification_executor
+    executor, _verification_executor = _verification_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _token_verification_executor(
+    auth: AuthenticationSettings,
+) -> ThreadPoolExecutor | None:
+    global _verification_executor, _verification_executor_size
+    size = auth.token_verification_threads
+    if size <= 0:
+        return None
+    executor = _verification_executor
+    if executor is None or _verification_executor_size != size:
+        shutdown_token_verification_executor()
+        executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="jwt-verify")
+        _verification_executor = executor
+        _verification_executor_size = size
+    return executor
+
+
+def _token_cache(auth: AuthenticationSettings) -> ValidatedTokenCache | None:
+    if auth.token_cache_size <= 0:
+        return None
+    cache = _token_caches.get(auth.jwks_uri)
+    if cache is None:
+        cache = ValidatedTokenCache(
+            auth.token_cache_size, auth.token_cache_clock_skew_seconds
+        )
+        _token_caches[auth.jwks_uri] = cache
+    return cache
+
+
+def _token_cache_key(token: str, auth: AuthenticationSettings) -> bytes:
+    # Audience and issuer are checked during decode, so bind them into the key.
+    material = f"{auth.authority}\n{auth.client_id}\n{token}"
+    return hashlib.sha256(material.encode("utf-8")).digest()
 
 
 def _unauthorized(detail: str) -> HTTPException:
@@ -86,11 +246,65 @@ def validate_token(token: str, auth: AuthenticationSettings) -> dict:
     """Validate a bearer token, returning its claims or raising 401."""
 
     resolver = _resolver_factory(auth)
+    claims = _cached_claims(token, auth, resolver)
+    if claims is not None:
+        return claims
+
     try:
         signing_key = resolver.get_signing_key(token)
     except Exception as exc:  # noqa: BLE001 - any key-resolution failure is a 401
         raise _unauthorized("Unable to resolve token signing key.") from exc
 
+    return _verify_token(token, signing_key, auth, resolver)
+
+
+async def validate_token_async(token: str, auth: AuthenticationSettings) -> dict:
+    """Validate a bearer token without blocking the event loop on key fetches."""
+
+    resolver = _resolver_factory(auth)
+    claims = _cached_claims(token, auth, resolver)
+    if claims is not None:
+        return claims
+
+    try:
+        get_signing_key_async = getattr(resolver, "get_signing_key_async", None)
+        if get_signing_key_async is not None:
+            signing_key = await get_signing_key_async(token)
+        else:
+            signing_key = resolver.get_signing_key(token)
+    except Exception as exc:  # noqa: BLE001 - any key-resolution failure is a 401
+        raise _unauthorized("Unable to resolve token signing key.") from exc
+
+    executor = _token_verification_executor(auth)
+    if executor is None:
+        return _verify_token(token, signing_key, auth, resolver)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, _verify_token, token, signing_key, auth, resolver
+    )
+
+
+def _cached_claims(
+    token: str, auth: AuthenticationSettings, resolver: SigningKeyResolver
+) -> dict | None:
+    cache = _token_cache(auth)
+    if cache is None:
+        return None
+    claims = cache.get(
+        _token_cache_key(token, auth), getattr(resolver, "key_set_version", None)
+    )
+    if claims is not None:
+        _check_required_claims(claims, auth)
+    return claims
+
+
+def _verify_token(
+    token: str,
+    signing_key: object,
+    auth: AuthenticationSettings,
+    resolver: SigningKeyResolver,
+) -> dict:
+    import jwt
+
     try:
         claims = jwt.decode(
             token,
@@ -103,6 +317,20 @@ def validate_token(token: str, auth: AuthenticationSettings) -> dict:
     except jwt.PyJWTError as exc:
         raise _unauthorized("Invalid token.") from exc
 
+    _check_required_claims(claims, auth)
+    cache = _token_cache(auth)
+    if cache is not None:
+        cache.put(
+            _token_cache_key(token, auth),
+            claims,
+            getattr(resolver, "key_set_version", None),
+        )
+    return claims
+
+
+def _check_required_claims(claims: dict, auth: AuthenticationSettings) -> None:
+    """Enforce the ``RequiredClaims`` policy (also re-run on cache hits)."""
+
     # idtyp (when present) must indicate an application token.
     idtyp = claims.get("idtyp")
     if idtyp is not None and idtyp not in auth.required_claims.idtyp:
@@ -113,8 +341,6 @@ def validate_token(token: str, auth: AuthenticationSettings) -> dict:
     if caller not in auth.required_claims.azp:
         raise _unauthorized("Caller is not in the allowed-caller list.")
 
-    return claims
-
 
 async def require_auth(
     authorization: str | None = Header(default=None),
@@ -134,4 +360,5 @@ async def require_auth(
         raise _unauthorized("Missing bearer token.")
 
     token = authorization[len("Bearer ") :].strip()
-    return validate_token(token, auth)
+    with span("auth.validate_token"):
+        return await validate_token_async(token, auth)
@@ -0,0 +1,41 @@
+"""Offline bulk quality checks: ``ProcessRequest`` NDJSON in, results NDJSON out.
+
+Runs :class:`~app.service.QualityCheckService` over stored reports without the
+HTTP layer, on a pool of worker processes (see
+:mod:`dragon_extension_runtime.bulk`). Each input line is one ``/v1/process``
+request body. From the sample root::
+
+    python3.12 -m app.bulk reports.ndjson -o results.ndjson --workers 8 --checkpoint run.ckpt
+
+Settings are read as for the web app (``DCR_RAD_*`` and ``.env``), except
+that chunked checking is turned off: the bulk workers already use every core.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from dragon_extension_runtime.bulk import main as bulk_main
+
+from .config import get_settings
+from .models import ProcessRequest
+from .service import QualityCheckService
+
+
+def create_service() -> QualityCheckService:
+    """Build the service in a bulk worker process."""
+
+    return QualityCheckService(get_settings().model_copy(update={"chunk_workers": 0}))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    return bulk_main(
+        argv,
+        service_factory=create_service,
+        payload_model=ProcessRequest,
+        description="Run radiology quality checks over NDJSON ProcessRequest records.",
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
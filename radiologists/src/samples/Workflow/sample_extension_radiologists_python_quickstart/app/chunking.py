@@ -0,0 +1,317 @@
+"""Chunked, multi-process execution of quality checks on long reports.
+
+``reportText`` has no length limit, and a check that scans it serially makes
+latency grow with report length. For reports longer than
+``chunk_size_chars`` the service instead:
+
+1. splits the text at section or sentence boundaries into chunks that overlap
+   by up to ``chunk_overlap_chars`` (so a finding that straddles a cut is seen
+   whole by at least one chunk);
+2. runs the check on every chunk in a pool of worker processes;
+3. shifts each chunk's ``Provenance`` offsets back to report-global offsets
+   and drops the duplicate findings produced by the overlap regions.
+
+Chunks are cut, checked and merged in code points; the merged findings are
+converted to UTF-16 positions with the report's
+:class:`~dragon_extension_runtime.OffsetIndex` when one is given.
+
+Workers are started with the ``spawn`` method and build their own detector
+from the default correction dictionary in the pool initializer; dictionaries
+of other environments are built on first use and kept in a small cache.
+``multiprocessing`` is imported only when the pool starts, which keeps it off
+the cold start when chunked checking is disabled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Iterable
+
+from dragon_extension_runtime import OffsetIndex
+
+from .detection import MisrecognitionDetector, to_utf16
+from .models import Recommendation
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# A boundary is the start of the text that follows a sentence terminator or a
+# line break (section headings and list items sit on their own lines).
+_BOUNDARY_RE = re.compile(r"(?<=[.!?;:])\s+|\n\s*")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A slice of the report and its offset within the full text."""
+
+    start: int
+    text: str
+
+
+def split_report(text: str, chunk_size: int, overlap: int) -> list[Chunk]:
+    """Split ``text`` into chunks of at most ``chunk_size`` characters.
+
+    Chunks end at the last section/sentence boundary that fits (falling back to
+    whitespace, then to a hard cut for unbroken text). Each chunk after the
+    first starts at the earliest boundary within ``overlap`` characters before
+    the previous chunk's end.
+    """
+
+    if overlap >= chunk_size:
+        raise ValueError("overlap must be smaller than chunk_size")
+    if len(text) <= chunk_size:
+        return [Chunk(0, text)]
+
+    boundaries = [match.end() for match in _BOUNDARY_RE.finditer(text)]
+    chunks: list[Chunk] = []
+    start = 0
+    while True:
+        limit = start + chunk_size
+        if limit >= len(text):
+            chunks.append(Chunk(start, text[start:]))
+            return chunks
+
+        end = _last_boundary(boundaries, start, limit)
+        if end is None:
+            space = text.rfind(" ", start + 1, limit)
+            end = space + 1 if space > start else limit
+        chunks.append(Chunk(start, text[start:end]))
+
+        # Step back into the previous chunk so the regions overlap.
+        i = bisect.bisect_left(boundaries, end - overlap)
+        next_start = boundaries[i] if i < len(boundaries) else end
+        start = next_start if start < next_start <= end else end
+
+
+def _last_boundary(boundaries: list[int], start: int, limit: int) -> int | None:
+    i = bisect.bisect_right(boundaries, limit) - 1
+    if i >= 0 and boundaries[i] > start:
+        return boundaries[i]
+    return None
+
+
+def merge_recommendations(
+    results: Iterable[tuple[int, list[Recommendation]]],
+) -> list[Recommendation]:
+    """Merge per-chunk results into report-global, de-duplicated recommendations.
+
+    ``results`` pairs each chunk's start offset with its recommendations.
+    Findings of the same quality-check type whose spans overlap are the same
+    finding seen from two chunks; the longest span wins.
+    """
+
+    shifted = [
+        _shift_recommendation(recommendation, offset)
+        for offset, recommendations in results
+        for recommendation in recommendations
+    ]
+
+    shifted.sort(key=lambda rec: (_span(rec)[0], -(_span(rec)[1] - _span(rec)[0])))
+    merged: list[Recommendation] = []
+    last_end: dict[str, float] = {}
+    seen_unanchored: set[tuple[str, str]] = set()
+    for recommendation in shifted:
+        kind = recommendation.quality_check_type.value
+        start, end = _span(recommendation)
+        if start < 0:
+            key = (kind, recommendation.description)
+            if key in seen_unanchored:
+                continue
+            seen_unanchored.add(key)
+        elif start < last_end.get(kind, -1):
+            continue
+        else:
+            last_end[kind] = end
+        merged.append(recommendation)
+    return merged
+
+
+def _shift_recommendation(recommendation: Recommendation, offset: int) -> Recommendation:
+    if not offset or not recommendation.provenance:
+        return recommendation
+    return recommendation.model_copy(
+        update={
+            "provenance": [
+                span.model_copy(
+                    update={
+                        "start_position": _shift(span.start_position, offset),
+                        "end_position": _shift(span.end_position, offset),
+                    }
+                )
+                for span in recommendation.provenance
+            ]
+        }
+    )
+
+
+def _shift(position: float | None, offset: int) -> float | None:
+    return None if position is None else position + offset
+
+
+def _span(recommendation: Recommendation) -> tuple[float, float]:
+    # Recommendations without offsets sort first and are de-duplicated by text.
+    if not recommendation.provenance or recommendation.provenance[0].start_position is None:
+        return (-1.0, -1.0)
+    span = recommendation.provenance[0]
+    end = span.end_position if span.end_position is not None else span.start_position
+    return (span.start_position, end)
+
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+
+_worker_max_edit_distance = 2
+
+
+def _init_worker(dictionary_path: str, max_edit_distance: int) -> None:
+    global _worker_max_edit_distance
+    _worker_max_edit_distance = max_edit_distance
+    _worker_detector(dictionary_path)
+
+
+@lru_cache(maxsize=8)
+def _worker_detector(dictionary_path: str) -> MisrecognitionDetector:
+    # Each environment may bring its own dictionary; workers keep the few most
+    # recently used ones.
+    return MisrecognitionDetector.from_file(
+        Path(dictionary_path), max_edit_distance=_worker_max_edit_distance
+    )
+
+
+def _check_chunk(dictionary_path: str, text: str) -> list[Recommendation]:
+    return _worker_detector(dictionary_path).recommendations(text)
+
+
+def _ready() -> bool:
+    return True
+
+
+class ChunkedCheckRunner:
+    """Runs the mis-recognition check over report chunks in a process pool."""
+
+    def __init__(
+        self,
+        dictionary_path: Path,
+        max_edit_distance: int,
+        workers: int,
+        chunk_size: int,
+        overlap: int,
+    ) -> None:
+        if overlap >= chunk_size:
+            raise ValueError("chunk_overlap_chars must be smaller than chunk_size_chars")
+        self._dictionary_path = dictionary_path
+        self._max_edit_distance = max_edit_distance
+        self._workers = workers
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._executor: ProcessPoolExecutor | None = None
+        # Concurrent first requests (warm-up disabled) must not each build a pool.
+        self._start_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker processes and wait until each has its detector."""
+
+        with self._start_lock:
+            if self._executor is not None:
+                return
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(self._dictionary_path), self._max_edit_distance),
+            )
+            for future in [executor.submit(_ready) for _ in range(self._workers)]:
+                future.result()
+            self._executor = executor
+
+    async def run(
+        self,
+        text: str,
+        dictionary_path: Path | None = None,
+        offsets: OffsetIndex | None = None,
+    ) -> list[Recommendation]:
+        """Check ``text`` chunk by chunk in parallel and merge the findings.
+
+        Positions are UTF-16 when ``offsets`` (the index of ``text``) is given.
+        """
+
+        if self._executor is None:
+            await asyncio.to_thread(self.start)
+        source = str(dictionary_path or self._dictionary_path)
+        chunks = split_report(text, self.chunk_size, self.overlap)
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _check_chunk, source, chunk.text)
+                for chunk in chunks
+            )
+        )
+        merged = merge_recommendations(zip((chunk.start for chunk in chunks), results))
+        if offsets is None:
+            return merged
+        return [to_utf16(recommendation, offsets) for recommendation in merged]
+
+    async def stream(
+        self,
+        text: str,
+        dictionary_path: Path | None = None,
+        offsets: OffsetIndex | None = None,
+    ) -> AsyncIterator[Recommendation]:
+        """Yield findings chunk by chunk, as soon as each chunk finishes.
+
+        Chunks complete out of order, so a finding is dropped when a finding of
+        the same type overlapping its span has already been yielded.
+        """
+
+        if self._executor is None:
+            await asyncio.to_thread(self.start)
+        source = str(dictionary_path or self._dictionary_path)
+        loop = asyncio.get_running_loop()
+
+        async def check(chunk: Chunk) -> tuple[int, list[Recommendation]]:
+            result = await loop.run_in_executor(self._executor, _check_chunk, source, chunk.text)
+            return chunk.start, result
+
+        tasks = [
+            asyncio.ensure_future(check(chunk))
+            for chunk in split_report(text, self.chunk_size, self.overlap)
+        ]
+        emitted: dict[str, list[tuple[float, float]]] = {}
+        seen_unanchored: set[tuple[str, str]] = set()
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                offset, recommendations = await next_done
+                for recommendation in recommendations:
+                    recommendation = _shift_recommendation(recommendation, offset)
+                    kind = recommendation.quality_check_type.value
+                    start, end = _span(recommendation)
+                    if start < 0:
+                        key = (kind, recommendation.description)
+                        if key in seen_unanchored:
+                            continue
+                        seen_unanchored.add(key)
+                    else:
+                        spans = emitted.setdefault(kind, [])
+                        if any(start < other_end and other_start < end for other_start, other_end in spans):
+                            continue
+                        spans.append((start, end))
+                    yield recommendation if offsets is None else to_utf16(recommendation, offsets)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def shutdown(self) -> None:
+        with self._start_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
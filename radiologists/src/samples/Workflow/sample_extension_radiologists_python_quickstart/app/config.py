@@ -13,8 +13,9 @@ from __future__ import annotations
 
 from functools import lru_cache
 
+from dragon_extension_runtime import ExtensionSettings
 from pydantic import BaseModel, Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import SettingsConfigDict
 
 
 class RequiredClaims(BaseModel):
@@ -41,6 +42,30 @@ class AuthenticationSettings(BaseModel):
     required_claims: RequiredClaims = Field(
         default_factory=RequiredClaims, alias="RequiredClaims"
     )
+    # Bounded cache of already-validated tokens (0 disables it). Dragon reuses
+    # one app token for its whole lifetime, so steady-state requests skip the
+    # RS256 signature check entirely.
+    token_cache_size: int = Field(default=1024, ge=0, alias="TokenCacheSize")
+    # Cached entries expire this many seconds before the token's ``exp``
+    # (mirrors the 5-minute default ClockSkew of the C# JWT bearer handler).
+    token_cache_clock_skew_seconds: int = Field(
+        default=300, ge=0, alias="TokenCacheClockSkewSeconds"
+    )
+    # Signing keys are prefetched at startup and refreshed in the background on
+    # this schedule; a failed refresh keeps serving the previous keys.
+    jwks_refresh_interval_seconds: float = Field(
+        default=3600, gt=0, alias="JwksRefreshIntervalSeconds"
+    )
+    # Minimum gap between refetches triggered by a token with an unknown kid.
+    jwks_min_refetch_interval_seconds: float = Field(
+        default=30, ge=0, alias="JwksMinRefetchIntervalSeconds"
+    )
+    jwks_timeout_seconds: float = Field(default=10, gt=0, alias="JwksTimeoutSeconds")
+    # Size of the dedicated thread pool that runs RS256 signature verification
+    # off the event loop. 0 verifies inline on the event loop.
+    token_verification_threads: int = Field(
+        default=0, ge=0, le=64, alias="TokenVerificationThreads"
+    )
 
     model_config = SettingsConfigDict(populate_by_name=True)
 
@@ -66,8 +91,12 @@ class AuthenticationSettings(BaseModel):
         ]
 
 
-class Settings(BaseSettings):
-    """Top-level application settings."""
+class Settings(ExtensionSettings):
+    """Top-level application settings.
+
+    Startup, warm-up, admission-control, job and audit settings are inherited
+    from :class:`~dragon_extension_runtime.ExtensionSettings`.
+    """
 
     model_config = SettingsConfigDict(
         env_prefix="DCR_RAD_",
@@ -79,6 +108,33 @@ class Settings(BaseSettings):
     app_name: str = "Sample Radiologists Extension (Python)"
     version: str = "0.0.1"
     mock_data_file: str = "MockData/qualitycheck_response.json"
+    # Detect speech-recognition errors in the report text against a correction
+    # dictionary instead of returning the canned mock response.
+    misrecognition_detection_enabled: bool = False
+    correction_dictionary_file: str = "Data/correction_dictionary.json"
+    # Upper bound on edits between report text and a known mis-hearing for a
+    # fuzzy match (shorter phrases use a tighter bound).
+    misrecognition_max_edit_distance: int = Field(default=2, ge=0, le=3)
+    # Per-environment dictionaries live at
+    # ``<environment_dictionaries_dir>/<environment_id>/correction_dictionary.json``
+    # and are loaded on an environment's first request. Built detectors are kept
+    # in an LRU bounded by ``engine_memory_budget_mb``; those unused for
+    # ``engine_max_idle_seconds`` are evicted (0 keeps them until the budget
+    # needs the room).
+    environment_dictionaries_dir: str = "Data/environments"
+    engine_memory_budget_mb: int = Field(default=256, ge=1)
+    engine_max_idle_seconds: float = Field(default=0, ge=0)
+    # Reports longer than ``chunk_size_chars`` are split at section/sentence
+    # boundaries (overlapping by ``chunk_overlap_chars``) and checked on a pool
+    # of this many worker processes. 0 checks every report inline.
+    chunk_workers: int = Field(default=0, ge=0, le=64)
+    chunk_size_chars: int = Field(default=8000, ge=500)
+    chunk_overlap_chars: int = Field(default=200, ge=0)
+    # Audited outputs keep the structure of each recommendation but not the
+    # report wording it quotes or explains.
+    audit_redact_fields: list[str] = Field(
+        default_factory=lambda: ["text", "content", "description", "reason"]
+    )
     authentication: AuthenticationSettings = Field(
         default_factory=AuthenticationSettings
     )
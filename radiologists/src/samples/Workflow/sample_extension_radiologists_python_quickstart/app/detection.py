@@ -0,0 +1,473 @@
+"""Speech-recognition mis-recognition detector for radiology reports.
+
+Dictation errors such as "paddock steatosis" (for "hepatic steatosis") or
+"for views" (for "4 views") are detected against a correction dictionary
+loaded once at startup (``Data/correction_dictionary.json``). Each entry maps a
+known mis-heard phrase to its correction plus the recommendation metadata.
+
+The dictionary is compiled into three indexes so each report n-gram is checked
+in sub-linear time, however large the dictionary grows:
+
+* an exact index of normalized mis-heard phrases (dict lookup);
+* a phonetic index keyed by Metaphone-style codes, which catches spelling
+  variants of a known mis-hearing ("padock steatosis");
+* per-word-count :class:`EditDistanceIndex` instances over the mis-heard
+  phrases for bounded edit-distance lookups.
+
+Fuzzy matches that are at least as close to the *correct* phrase as to the
+mis-heard one are ignored, so correctly dictated terms are never flagged.
+Findings become :class:`~app.models.Recommendation` objects whose
+:class:`~app.models.Provenance` offsets index into the original report text.
+Findings hold Python (code point) offsets; given the report's
+:class:`~dragon_extension_runtime.OffsetIndex`, the recommendation reports
+them in UTF-16 code units, as the .NET consumers index strings.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from dragon_extension_runtime import OffsetIndex
+
+from .models import Provenance, QualityCheckType, Recommendation
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z]+)?")
+
+_DEFAULT_REASON = (
+    "'{heard}' is a likely speech-recognition error for '{correct}'. Leaving it "
+    "in the final report can mislead downstream clinicians and break automated "
+    "coding that keys off standard terminology."
+)
+
+# Each edit separating the report text from a known mis-hearing lowers the
+# confidence (and so the severity) of a fuzzy finding.
+_SEVERITY_PENALTY_PER_EDIT = 10.0
+
+
+@dataclass(frozen=True)
+class Correction:
+    """One correction-dictionary entry."""
+
+    heard: str
+    correct: str
+    quality_check_type: QualityCheckType = QualityCheckType.Clinical
+    severity_score_percent: float = 50.0
+    reason: str | None = None
+
+    @property
+    def key(self) -> str:
+        return _normalize(self.heard)
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A detected mis-recognition span in the report text."""
+
+    start: int
+    end: int
+    text: str
+    correction: Correction
+    distance: int
+
+    def to_recommendation(self, offsets: OffsetIndex | None = None) -> Recommendation:
+        """The recommendation for this finding; UTF-16 positions when ``offsets`` is given."""
+
+        severity = max(
+            self.correction.severity_score_percent
+            - _SEVERITY_PENALTY_PER_EDIT * self.distance,
+            0.0,
+        )
+        reason = self.correction.reason or _DEFAULT_REASON.format(
+            heard=self.text, correct=self.correction.correct
+        )
+        return Recommendation(
+            quality_check_type=self.correction.quality_check_type,
+            description=f"Replace '{self.text}' with '{self.correction.correct}'.",
+            reason=reason,
+            severity_score_percent=severity,
+            provenance=[_provenance(self.text, self.start, self.end, offsets)],
+        )
+
+
+def _provenance(text: str, start: int, end: int, offsets: OffsetIndex | None) -> Provenance:
+    if offsets is not None:
+        start, end = offsets.utf16_span(start, end)
+    return Provenance(text=text, start_position=start, end_position=end)
+
+
+def to_utf16(recommendation: Recommendation, offsets: OffsetIndex) -> Recommendation:
+    """Copy of ``recommendation`` with its code point positions converted to UTF-16."""
+
+    if offsets.utf16_length == offsets.length or not recommendation.provenance:
+        return recommendation
+    return recommendation.model_copy(
+        update={
+            "provenance": [
+                span.model_copy(
+                    update={
+                        "start_position": _utf16(span.start_position, offsets),
+                        "end_position": _utf16(span.end_position, offsets),
+                    }
+                )
+                for span in recommendation.provenance
+            ]
+        }
+    )
+
+
+def _utf16(position: float | None, offsets: OffsetIndex) -> float | None:
+    # float, as pydantic makes the positions of a validated Provenance
+    return None if position is None else float(offsets.utf16(int(position)))
+
+
+def _normalize(text: str) -> str:
+    return " ".join(match.group(0).lower() for match in _TOKEN_RE.finditer(text))
+
+
+# ---------------------------------------------------------------------------
+# Phonetic keys
+# ---------------------------------------------------------------------------
+
+_VOWELS = frozenset("AEIOU")
+_FRONT_VOWELS = frozenset("EIY")
+
+
+@lru_cache(maxsize=65536)
+def metaphone(word: str) -> str:
+    """Return a Metaphone-style phonetic key for a single word.
+
+    Implements the classic Metaphone rules (initial-letter exceptions, soft
+    C/G, PH, SH/TH/CH digraphs, silent letters, and vowels kept only at the
+    start). Digits are kept as-is so "4" and "for" stay distinct.
+    """
+
+    word = "".join(ch for ch in word.upper() if ch.isalnum())
+    if not word:
+        return ""
+    if word[:2] in ("AE", "GN", "KN", "PN", "WR"):
+        word = word[1:]
+    elif word[0] == "X":
+        word = "S" + word[1:]
+    elif word[:2] == "WH":
+        word = "W" + word[2:]
+
+    key: list[str] = []
+    length = len(word)
+    for i, ch in enumerate(word):
+        prev = word[i - 1] if i > 0 else ""
+        nxt = word[i + 1] if i + 1 < length else ""
+        nxt2 = word[i + 2] if i + 2 < length else ""
+
+        if ch == prev and ch != "C":
+            continue
+        if ch.isdigit():
+            key.append(ch)
+        elif ch in _VOWELS:
+            if i == 0:
+                key.append(ch)
+        elif ch == "B":
+            if not (prev == "M" and i == length - 1):
+                key.append("B")
+        elif ch == "C":
+            if nxt == "I" and nxt2 == "A":
+                key.append("X")
+            elif nxt == "H":
+                key.append("K" if prev == "S" else "X")
+            elif nxt in _FRONT_VOWELS:
+                if prev != "S":
+                    key.append("S")
+            else:
+                key.append("K")
+        elif ch == "D":
+            key.append("J" if nxt == "G" and nxt2 in _FRONT_VOWELS else "T")
+        elif ch == "G":
+            if nxt == "H" and nxt2 and nxt2 not in _VOWELS:
+                continue
+            if nxt == "N" and (i + 2 == length or word[i + 2 :] == "ED"):
+                continue
+            if prev == "D" and nxt in _FRONT_VOWELS:
+                continue
+            key.append("J" if nxt in _FRONT_VOWELS and prev != "G" else "K")
+        elif ch == "H":
+            if nxt in _VOWELS and (not prev or prev not in "CSPTG"):
+                key.append("H")
+        elif ch == "K":
+            if prev != "C":
+                key.append("K")
+        elif ch == "P":
+            key.append("F" if nxt == "H" else "P")
+        elif ch == "Q":
+            key.append("K")
+        elif ch == "S":
+            if nxt == "H" or (nxt == "I" and nxt2 in ("O", "A")):
+                key.append("X")
+            else:
+                key.append("S")
+        elif ch == "T":
+            if nxt == "I" and nxt2 in ("O", "A"):
+                key.append("X")
+            elif nxt == "H":
+                key.append("0")
+            elif not (nxt == "C" and nxt2 == "H"):
+                key.append("T")
+        elif ch == "V":
+            key.append("F")
+        elif ch == "W" or ch == "Y":
+            if nxt in _VOWELS:
+                key.append(ch)
+        elif ch == "X":
+            key.append("KS")
+        elif ch == "Z":
+            key.append("S")
+        else:  # F, J, L, M, N, R
+            key.append(ch)
+    return "".join(key)
+
+
+def phonetic_key(phrase: str) -> str:
+    """Metaphone key for each word of a normalized phrase, space-joined."""
+
+    return " ".join(metaphone(word) for word in phrase.split())
+
+
+# ---------------------------------------------------------------------------
+# Edit distance and the bounded-distance index
+# ---------------------------------------------------------------------------
+
+
+def _pattern_masks(pattern: str) -> dict[str, int]:
+    masks: dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def _bit_parallel_distance(pattern: str, masks: dict[str, int], text: str) -> int:
+    # Myers/Hyyro bit-vector Levenshtein: one pass over ``text`` with a few
+    # integer operations per character instead of a full DP row.
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for ch in text:
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Classic Levenshtein distance (insert / delete / substitute)."""
+
+    if a == b:
+        return 0
+    return _bit_parallel_distance(a, _pattern_masks(a), b)
+
+
+@lru_cache(maxsize=256)
+def _segments(length: int, parts: int) -> tuple[tuple[int, int], ...]:
+    """Split ``length`` characters into ``parts`` near-equal ``(start, size)`` runs."""
+
+    base, extra = divmod(length, parts)
+    runs: list[tuple[int, int]] = []
+    start = 0
+    for i in range(parts):
+        size = base + (1 if i < extra else 0)
+        runs.append((start, size))
+        start += size
+    return tuple(runs)
+
+
+class EditDistanceIndex:
+    """Index of strings for bounded edit-distance lookups.
+
+    Uses the pigeonhole filter: each term is cut into ``max_distance + 1``
+    segments, and any string within ``max_distance`` edits of the term must
+    contain one of those segments unedited, shifted by at most
+    ``max_distance`` positions. A query therefore probes a handful of
+    ``(segment, text)`` keys for each nearby term length and verifies only the terms they return,
+    independent of how many terms are indexed. (A BK-tree prunes poorly on
+    short strings and still visits a large fraction of the dictionary.)
+    """
+
+    def __init__(self, max_distance: int) -> None:
+        self._max_distance = max_distance
+        # term length -> (segment number, segment text) -> terms
+        self._postings: dict[int, dict[tuple[int, str], list[str]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, term: str) -> None:
+        postings = self._postings.setdefault(len(term), {})
+        runs = _segments(len(term), self._max_distance + 1)
+        for number, (start, size) in enumerate(runs):
+            postings.setdefault((number, term[start : start + size]), []).append(term)
+        self._size += 1
+
+    def search(self, term: str, max_distance: int) -> list[tuple[int, str]]:
+        """Return ``(distance, term)`` pairs within ``max_distance``, closest first."""
+
+        max_distance = min(max_distance, self._max_distance)
+        candidates: set[str] = set()
+        for length in range(max(len(term) - max_distance, 0), len(term) + max_distance + 1):
+            postings = self._postings.get(length)
+            if postings is None:
+                continue
+            runs = _segments(length, self._max_distance + 1)
+            for number, (start, size) in enumerate(runs):
+                for shift in range(-max_distance, max_distance + 1):
+                    begin = start + shift
+                    if begin < 0 or begin + size > len(term):
+                        continue
+                    candidates.update(postings.get((number, term[begin : begin + size]), ()))
+        if not candidates:
+            return []
+
+        masks = _pattern_masks(term)
+        matches = [
+            (distance, candidate)
+            for candidate in candidates
+            if (distance := _bit_parallel_distance(term, masks, candidate)) <= max_distance
+        ]
+        matches.sort()
+        return matches
+
+
+# ---------------------------------------------------------------------------
+# Detector
+# ---------------------------------------------------------------------------
+
+
+class MisrecognitionDetector:
+    """Finds known speech-recognition errors in report text."""
+
+    def __init__(self, corrections: list[Correction], max_edit_distance: int = 2) -> None:
+        self._max_edit_distance = max_edit_distance
+        self._exact: dict[str, Correction] = {}
+        self._phonetic: dict[str, list[Correction]] = {}
+        self._indexes: dict[int, EditDistanceIndex] = {}
+        self._correct_phrases: set[str] = set()
+
+        for correction in corrections:
+            key = correction.key
+            if not key or key in self._exact:
+                continue
+            self._exact[key] = correction
+            self._phonetic.setdefault(phonetic_key(key), []).append(correction)
+            self._indexes.setdefault(
+                len(key.split()), EditDistanceIndex(max_edit_distance)
+            ).add(key)
+            self._correct_phrases.add(_normalize(correction.correct))
+
+        self._max_words = max(self._indexes, default=0)
+
+    @classmethod
+    def from_file(cls, path: Path, max_edit_distance: int = 2) -> "MisrecognitionDetector":
+        """Build a detector from a correction-dictionary JSON file."""
+
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        corrections = [
+            Correction(
+                heard=entry["heard"],
+                correct=entry["correct"],
+                quality_check_type=QualityCheckType(
+                    entry.get("qualityCheckType", QualityCheckType.Clinical.value)
+                ),
+                severity_score_percent=float(entry.get("severityScorePercent", 50)),
+                reason=entry.get("reason"),
+            )
+            for entry in raw.get("corrections", [])
+        ]
+        return cls(corrections, max_edit_distance=max_edit_distance)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def detect(self, text: str) -> list[Finding]:
+        """Return non-overlapping findings in ``text``, in document order."""
+
+        return list(self.iter_detect(text))
+
+    def iter_detect(self, text: str) -> Iterator[Finding]:
+        """Yield non-overlapping findings in ``text`` as the scan reaches them."""
+
+        tokens = [(m.start(), m.end(), m.group(0).lower()) for m in _TOKEN_RE.finditer(text)]
+        codes = [metaphone(token) for _, _, token in tokens]
+        i = 0
+        while i < len(tokens):
+            best: tuple[Finding, int] | None = None
+            # Prefer the longest phrase starting at this token.
+            for n in range(min(self._max_words, len(tokens) - i), 0, -1):
+                window = tokens[i : i + n]
+                phrase = " ".join(token for _, _, token in window)
+                match = self._match(phrase, " ".join(codes[i : i + n]), n)
+                if match is not None:
+                    correction, distance = match
+                    start, end = window[0][0], window[-1][1]
+                    best = (Finding(start, end, text[start:end], correction, distance), n)
+                    break
+            if best is None:
+                i += 1
+                continue
+            yield best[0]
+            i += best[1]
+
+    def recommendations(
+        self, text: str, offsets: OffsetIndex | None = None
+    ) -> list[Recommendation]:
+        """Findings as recommendations; pass ``OffsetIndex(text)`` for UTF-16 positions."""
+
+        return [finding.to_recommendation(offsets) for finding in self.detect(text)]
+
+    def _match(
+        self, phrase: str, phrase_key: str, word_count: int
+    ) -> tuple[Correction, int] | None:
+        exact = self._exact.get(phrase)
+        if exact is not None:
+            return exact, 0
+        if phrase in self._correct_phrases:
+            return None
+
+        candidates: list[tuple[int, Correction]] = []
+        for correction in self._phonetic.get(phrase_key, ()):
+            candidates.append((levenshtein(phrase, correction.key), correction))
+
+        index = self._indexes.get(word_count)
+        max_distance = self._max_edit_distance_for(phrase)
+        if index is not None and max_distance > 0:
+            for distance, key in index.search(phrase, max_distance):
+                candidates.append((distance, self._exact[key]))
+
+        for distance, correction in sorted(candidates, key=lambda item: item[0]):
+            # Closer to the right answer than to the mis-hearing: not an error.
+            if levenshtein(phrase, _normalize(correction.correct)) <= distance:
+                continue
+            return correction, distance
+        return None
+
+    def _max_edit_distance_for(self, phrase: str) -> int:
+        # Short phrases tolerate fewer edits before unrelated words collide.
+        if len(phrase) < 5:
+            return 0
+        if len(phrase) < 10:
+            return min(1, self._max_edit_distance)
+        return self._max_edit_distance
@@ -0,0 +1,175 @@
+"""Signing-key resolvers backed by the tenant's Entra ID JWKS endpoint.
+
+:class:`AsyncJwksSigningKeyResolver` is the default: it keeps an in-memory
+snapshot of the key set that is refreshed off the request path, so resolving a
+key never blocks the event loop. :class:`JwksSigningKeyResolver` wraps PyJWT's
+synchronous ``PyJWKClient`` for scripts and other non-async callers.
+
+This module is imported lazily by :mod:`app.auth` so PyJWT, ``cryptography``
+and ``httpx`` stay out of the import graph until authentication is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import httpx
+import jwt
+from dragon_extension_runtime import inject, span
+from dragon_extension_runtime.tracing import KIND_CLIENT
+
+logger = logging.getLogger("dragon.radiologists.pyextension")
+
+
+class _RotationAwareJwkClient(jwt.PyJWKClient):
+    """PyJWKClient that bumps ``key_set_version`` when the fetched key IDs change."""
+
+    key_set_version = 0
+    _key_ids: frozenset[str] = frozenset()
+
+    def fetch_data(self):
+        jwk_set = super().fetch_data()
+        key_ids = frozenset(
+            str(key.get("kid")) for key in jwk_set.get("keys", []) if isinstance(key, dict)
+        )
+        if key_ids != self._key_ids:
+            self._key_ids = key_ids
+            self.key_set_version += 1
+        return jwk_set
+
+
+class JwksSigningKeyResolver:
+    """Resolves signing keys from the tenant's Entra ID JWKS endpoint."""
+
+    def __init__(self, jwks_uri: str) -> None:
+        # PyJWKClient caches keys and refreshes on cache miss.
+        self._client = _RotationAwareJwkClient(jwks_uri)
+
+    @property
+    def key_set_version(self) -> int:
+        """Changes whenever a refetch returns a different set of key IDs."""
+
+        return self._client.key_set_version
+
+    def get_signing_key(self, token: str) -> object:
+        return self._client.get_signing_key_from_jwt(token).key
+
+
+class AsyncJwksSigningKeyResolver:
+    """Resolves signing keys from an in-memory JWKS snapshot refreshed off-request.
+
+    * :meth:`start` prefetches the key set and schedules background refreshes
+      every ``refresh_interval_seconds``.
+    * A failed refresh logs a warning and keeps serving the previous (stale)
+      keys until a later refresh succeeds.
+    * A token whose ``kid`` is not in the snapshot triggers a refetch. Refetches
+      are single-flight (concurrent callers await the same fetch) and rate
+      limited to one per ``min_refetch_interval_seconds``.
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        refresh_interval_seconds: float = 3600,
+        min_refetch_interval_seconds: float = 30,
+        timeout_seconds: float = 10,
+    ) -> None:
+        self._jwks_uri = jwks_uri
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._min_refetch_interval_seconds = min_refetch_interval_seconds
+        self._timeout_seconds = timeout_seconds
+        self._keys: dict[str, object] = {}
+        self._last_fetch_attempt: float | None = None
+        self._inflight: asyncio.Task | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self.key_set_version = 0
+
+    async def start(self) -> None:
+        """Prefetch the key set and start the background refresh loop."""
+
+        await self.refresh()
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh loop."""
+
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def refresh(self) -> bool:
+        """Refetch the key set, joining a fetch already in flight.
+
+        Returns ``True`` when the snapshot was updated from Entra ID.
+        """
+
+        inflight = self._inflight
+        if inflight is None or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = asyncio.create_task(self._fetch())
+            self._inflight = inflight
+        return await asyncio.shield(inflight)
+
+    async def get_signing_key_async(self, token: str) -> object:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        now = time.monotonic()
+        if (
+            self._inflight is not None
+            or self._last_fetch_attempt is None
+            or now - self._last_fetch_attempt >= self._min_refetch_interval_seconds
+        ):
+            await self.refresh()
+            key = self._keys.get(kid)
+            if key is not None:
+                return key
+        raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+
+    def get_signing_key(self, token: str) -> object:
+        """Synchronous lookup against the current snapshot (never fetches)."""
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    async def _fetch(self) -> bool:
+        self._last_fetch_attempt = time.monotonic()
+        try:
+            # Traced (and traceparent-propagated) when a request triggers the fetch.
+            with span("jwks.fetch", kind=KIND_CLIENT, **{"url.full": self._jwks_uri}):
+                async with httpx.AsyncClient(timeout=self._timeout_seconds) as client:
+                    response = await client.get(self._jwks_uri, headers=inject({}))
+                    response.raise_for_status()
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        except Exception as exc:  # noqa: BLE001 - keep serving stale keys
+            logger.warning(
+                "JWKS refresh from %s failed; serving %s cached key(s). error=%s",
+                self._jwks_uri,
+                len(self._keys),
+                exc,
+            )
+            return False
+        finally:
+            self._inflight = None
+
+        keys = {jwk.key_id: jwk.key for jwk in jwk_set.keys if jwk.key_id}
+        if keys.keys() != self._keys.keys():
+            self.key_set_version += 1
+        self._keys = keys
+        return True
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval_seconds)
+            await self.refresh()
@@ -1,99 +1,235 @@
 """FastAPI application for the Radiologists quality-check sample extension.
 
 Exposes ``POST /v1/process`` plus liveness/readiness probes, mirroring the C#
-Quickstart. CORS is fully open for local testing (lock this down in
-production). Swagger UI is served by FastAPI at ``/docs``; ``GET /`` redirects
-there.
+Quickstart. The app itself (lifespan, probes, middleware, the ``/`` → ``/docs``
+redirect) is built by the shared runtime's
+:func:`~dragon_extension_runtime.create_app`; this module adds the process
+route. CORS is fully open for local testing (lock this down in production).
+In startup-optimized mode (``DCR_RAD_STARTUP_OPTIMIZED=true``) the OpenAPI
+schema, Swagger UI and the root redirect are turned off. With
+``Prefer: respond-async`` a request is queued as a job and answered with
+``202 Accepted``; the result is polled from ``GET /v1/jobs/{id}`` (see
+:mod:`dragon_extension_runtime.jobs`). The body is read and validated by a
+dependency rather than a FastAPI body parameter so that both run inside a
+``validation`` span of the request trace.
 """
 
 from __future__ import annotations
 
 import logging
-
-from fastapi import Depends, FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
-
-from .auth import require_auth
+import time
+from typing import AsyncIterator
+
+from dragon_extension_runtime import (
+    ModelResponse,
+    RequestContext,
+    configure_logging,
+    create_app,
+    current_span,
+    respond_async_requested,
+    span,
+)
+from fastapi import Depends, Header, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from .auth import (
+    require_auth,
+    shutdown_token_verification_executor,
+    start_signing_key_resolver,
+    stop_signing_key_resolvers,
+)
 from .config import get_settings
-from .models import ProcessRequest, ProcessResponse, serialize_response
-from .service import QualityCheckService
+from .models import ProcessRequest, ProcessResponse, Recommendation
+from .service import QualityCheckService, quality_check_response
+from .streaming import EVENT_STREAM, encode_stream, negotiate_stream_format
+from .warmup import warm_up
 
 logger = logging.getLogger("dragon.radiologists.pyextension")
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(asctime)s] %(levelname)s %(name)s - %(message)s",
-)
+configure_logging()
 
 settings = get_settings()
 service = QualityCheckService(settings)
 
-app = FastAPI(
+app = create_app(
+    settings,
+    service,
     title="Simple Radiologists Extension API",
-    version=settings.version,
     description=(
         "A simple radiologists extension sample that demonstrates the extension "
         "pattern for Dragon Copilot."
     ),
+    logger=logger,
+    # Prefetch signing keys before reporting ready; clean up on exit.
+    on_startup=[lambda: start_signing_key_resolver(settings.authentication)],
+    on_shutdown=[stop_signing_key_resolvers, shutdown_token_verification_executor],
+    warm_up=warm_up,
+    cors=True,
+    # Job results are report findings: polling needs the same token as /v1/process.
+    dependencies=[Depends(require_auth)],
 )
 
-# CORS is fully open here for easy local testing.
-# WARNING: restrict allowed origins, methods, and headers for production.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-def _health_payload() -> dict[str, str]:
-    return {"status": "Healthy"}
-
-
-@app.get("/", include_in_schema=False)
-async def root_redirect() -> RedirectResponse:
-    """Redirect the root to the bundled Swagger UI (mirrors the C# sample)."""
 
-    return RedirectResponse(url="/docs")
+async def read_process_request(request: Request) -> ProcessRequest:
+    """Decode and validate the body, answering 422 like a FastAPI body parameter."""
 
+    body = await request.body()
+    with span("validation"):
+        if not body:
+            raise RequestValidationError(
+                [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+            )
+        try:
+            return ProcessRequest.model_validate_json(body)
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            ) from None
 
-@app.get("/health/liveness", tags=["health"])
-async def liveness() -> dict[str, str]:
-    """Liveness probe. Returns ``{"status": "Healthy"}``."""
 
-    return _health_payload()
+# The body is read by the dependency above, so its schema is documented here.
+PROCESS_BODY = None if settings.startup_optimized else {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": ProcessRequest.model_json_schema()}},
+    }
+}
 
 
-@app.get("/health/readiness", tags=["health"])
-async def readiness() -> JSONResponse:
-    """Readiness probe. Healthy only when the canned mock data is present."""
-
-    if service.mock_data_exists():
-        return JSONResponse(status_code=200, content=_health_payload())
-    return JSONResponse(status_code=503, content={"status": "Unhealthy"})
-
-
-@app.post("/v1/process", response_model=ProcessResponse)
+@app.post("/v1/process", response_model=ProcessResponse, openapi_extra=PROCESS_BODY)
 async def process(
-    payload: ProcessRequest,
+    payload: ProcessRequest = Depends(read_process_request),
+    accept: str | None = Header(default=None),
+    prefer: str | None = Header(default=None),
+    x_callback_url: str | None = Header(default=None, alias="x-callback-url"),
+    content_length: int | None = Header(default=None),
+    x_ms_request_id: str | None = Header(default=None, alias="x-ms-request-id"),
+    x_ms_correlation_id: str | None = Header(default=None, alias="x-ms-correlation-id"),
     _claims: dict | None = Depends(require_auth),
-) -> JSONResponse:
+) -> ModelResponse | StreamingResponse:
     """Analyze a radiology report and return quality-check recommendations.
 
     This sample returns stubbed data loaded from
     ``MockData/qualitycheck_response.json``. Replace
     :meth:`QualityCheckService.process_async` with your real implementation.
+    With ``Accept: application/x-ndjson`` or ``text/event-stream`` the
+    recommendations are streamed as they are produced (see
+    :mod:`app.streaming`). With ``Prefer: respond-async`` the report is queued
+    and ``202 Accepted`` is returned with the job's status URL.
     """
 
+    started = time.perf_counter()
     logger.info(
         "Received POST /v1/process - correlation_id=%s",
         payload.session_data.correlation_id,
     )
-    result = await service.process_async(payload)
+    context = RequestContext(
+        request_id=x_ms_request_id,
+        correlation_id=x_ms_correlation_id or payload.session_data.correlation_id,
+    )
+    request_span = current_span()
+    if x_ms_correlation_id is None and request_span is not None:
+        # the tracing middleware only sees the header; fall back to the body's id
+        request_span.set_attribute("dragon.correlation_id", payload.session_data.correlation_id)
+    if app.state.jobs is not None and respond_async_requested(prefer):
+
+        async def run_job() -> ProcessResponse:
+            result = await service.process_async(payload, context)
+            if app.state.audit is not None:
+                # the result is encoded by the job manager; its size is not known here
+                _record_exchange(
+                    context,
+                    started,
+                    request_bytes=content_length,
+                    response_bytes=None,
+                    recommendations=_count_recommendations(result),
+                    output=result,
+                )
+            return result
+
+        return await app.state.jobs.accept(run_job, callback_url=x_callback_url)
+    stream_format = negotiate_stream_format(accept)
+    if stream_format is not None:
+        headers = {"Cache-Control": "no-cache"}
+        if stream_format == EVENT_STREAM:
+            headers["X-Accel-Buffering"] = "no"
+
+        def on_complete(recommendations: int, response_bytes: int) -> None:
+            if app.state.audit is not None:
+                _record_exchange(
+                    context,
+                    started,
+                    request_bytes=content_length,
+                    response_bytes=response_bytes,
+                    recommendations=recommendations,
+                )
+
+        recommendations = service.stream_async(payload, context)
+        if app.state.contracts is not None:
+            recommendations = _check_contract(recommendations)
+        return StreamingResponse(
+            encode_stream(recommendations, stream_format, on_complete),
+            media_type=stream_format,
+            headers=headers,
+        )
+    result = await service.process_async(payload, context)
     logger.info(
         "Response POST /v1/process - success=%s message=%s",
         result.success,
         result.message,
     )
-    return JSONResponse(status_code=200, content=serialize_response(result))
+    response = ModelResponse(result)
+    if app.state.audit is not None:
+        _record_exchange(
+            context,
+            started,
+            request_bytes=content_length,
+            response_bytes=len(response.body),
+            recommendations=_count_recommendations(result),
+            output=result,
+        )
+    if app.state.contracts is not None:
+        app.state.contracts.submit(response.body)
+    return response
+
+
+def _count_recommendations(result: ProcessResponse) -> int:
+    return sum(len(output.recommendations) for output in (result.payload or {}).values())
+
+
+def _record_exchange(
+    context: RequestContext,
+    started: float,
+    *,
+    request_bytes: int | None,
+    response_bytes: int | None,
+    recommendations: int,
+    output: ProcessResponse | None = None,
+) -> None:
+    """Buffer the audit record of a JSON response, a finished stream or a completed job."""
+
+    app.state.audit.record_exchange(
+        context,
+        request_bytes=request_bytes,
+        response_bytes=response_bytes,
+        seconds=time.perf_counter() - started,
+        counts={"recommendations": recommendations},
+        output=output,
+    )
+
+
+async def _check_contract(
+    recommendations: AsyncIterator[Recommendation],
+) -> AsyncIterator[Recommendation]:
+    """Pass ``recommendations`` through, then submit the equivalent JSON response.
+
+    A stream that fails part-way is not submitted: its JSON counterpart would
+    have been a 500.
+    """
+
+    streamed = []
+    async for recommendation in recommendations:
+        streamed.append(recommendation)
+        yield recommendation
+    app.state.contracts.submit(ModelResponse(quality_check_response(streamed)).body)
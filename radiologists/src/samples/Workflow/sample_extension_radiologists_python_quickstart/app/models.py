@@ -9,14 +9,15 @@ mapping is expressed with pydantic ``alias`` values, mirroring the
 * ``SessionData`` -> snake_case (inherited from the upstream Dragon contract).
 
 ``populate_by_name=True`` lets tests and internal code construct models with
-either the Python attribute name or the wire alias.
+either the Python attribute name or the wire alias. ``defer_build=True`` keeps
+validator compilation off the import path: each model is built the first time
+it is used, so cold start only pays for the models a request actually touches.
 """
 
 from __future__ import annotations
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -24,7 +25,7 @@ from pydantic import BaseModel, ConfigDict, Field
 class _WireModel(BaseModel):
     """Base model: serialize by alias, accept either alias or field name."""
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
 
 class BiologicalSex(str, Enum):
@@ -137,8 +138,3 @@ class ProcessResponse(_WireModel):
     message: str | None = None
     payload: dict[str, QualityCheckResult] | None = None
 
-
-def serialize_response(response: ProcessResponse) -> dict[str, Any]:
-    """Serialize a ProcessResponse to a wire-shaped dict (camelCase aliases)."""
-
-    return response.model_dump(by_alias=True, exclude_none=True)
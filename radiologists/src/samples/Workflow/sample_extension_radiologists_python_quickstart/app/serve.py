@@ -0,0 +1,31 @@
+"""Multi-worker server: load the app once, then pre-fork uvicorn workers.
+
+The parent loads the correction dictionary's detector (or the canned mock
+response) once and forks the workers, which share it copy-on-write instead of
+each loading their own (see :mod:`dragon_extension_runtime.prefork`). From the
+sample root::
+
+    python3.12 -m app.serve --port 5080 --workers 4
+
+``kill -HUP <parent pid>`` replaces the workers one at a time; ``SIGTERM``
+stops them gracefully. Settings are read as for ``uvicorn app.main:app``.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from dragon_extension_runtime.prefork import main as prefork_main
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    return prefork_main(
+        argv,
+        app="app.main:app",
+        default_port=5080,
+        description="Serve the radiology quality-check extension with pre-forked workers.",
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,26 +1,54 @@
 """Quality-check service.
 
-Returns a stubbed response loaded from ``MockData/qualitycheck_response.json``.
-This is the single integration point: partners replace
+Returns a stubbed response loaded from ``MockData/qualitycheck_response.json``,
+or, when ``misrecognition_detection_enabled`` is set, runs the speech-recognition
+error detector from :mod:`app.detection` over the report text (in parallel
+chunks for long reports, see :mod:`app.chunking`). This is the single
+integration point: partners replace
 :meth:`QualityCheckService.process_async` with their real implementation.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from pathlib import Path
+from typing import AsyncIterator
 
+from dragon_extension_runtime import (
+    EngineRegistry,
+    ExtensionService,
+    OffsetIndex,
+    RequestContext,
+    safe_path_segment,
+    span,
+)
+
+from .auth import auth_cache_sizes
+from .chunking import ChunkedCheckRunner
 from .config import Settings, get_settings
-from .models import ProcessRequest, ProcessResponse, QualityCheckResult
+from .detection import MisrecognitionDetector
+from .models import ProcessRequest, ProcessResponse, QualityCheckResult, Recommendation
+from .streaming import merge_streams
 
 logger = logging.getLogger("dragon.radiologists.pyextension")
 
 _QUALITY_CHECK_PAYLOAD_KEY = "qualityCheckResult"
 
 
-class QualityCheckService:
-    """Loads canned quality-check data and returns it for any request."""
+def quality_check_response(recommendations: list[Recommendation]) -> ProcessResponse:
+    """The successful response envelope around ``recommendations``."""
+
+    return ProcessResponse(
+        success=True,
+        message="Payload processed successfully.",
+        payload={_QUALITY_CHECK_PAYLOAD_KEY: QualityCheckResult(recommendations=recommendations)},
+    )
+
+
+class QualityCheckService(ExtensionService):
+    """Returns canned quality-check data, or detector findings when enabled."""
 
     def __init__(self, settings: Settings | None = None) -> None:
         self._settings = settings or get_settings()
@@ -28,17 +56,85 @@ class QualityCheckService:
         sample_root = Path(__file__).resolve().parents[1]
         self._mock_data_path = sample_root / self._settings.mock_data_file
         self._mock_response: ProcessResponse | None = None
+        self._dictionary_path = sample_root / self._settings.correction_dictionary_file
+        self._environments_dir = sample_root / self._settings.environment_dictionaries_dir
+        # One detector per distinct dictionary, built the first time an
+        # environment that uses it sends a report.
+        self._detectors: EngineRegistry[MisrecognitionDetector] = EngineRegistry(
+            resolve=self._dictionary_for,
+            load=self._build_detector,
+            memory_budget_bytes=self._settings.engine_memory_budget_mb * 1024 * 1024,
+            max_idle_seconds=self._settings.engine_max_idle_seconds,
+        )
+        self._chunk_runner: ChunkedCheckRunner | None = None
+        if self._settings.misrecognition_detection_enabled and self._settings.chunk_workers:
+            self._chunk_runner = ChunkedCheckRunner(
+                self._dictionary_path,
+                max_edit_distance=self._settings.misrecognition_max_edit_distance,
+                workers=self._settings.chunk_workers,
+                chunk_size=self._settings.chunk_size_chars,
+                overlap=self._settings.chunk_overlap_chars,
+            )
 
-    def mock_data_exists(self) -> bool:
-        """Whether the canned mock-data file is present (readiness probe)."""
+    def data_file_exists(self) -> bool:
+        """Whether the active data file is present (readiness probe).
+
+        That is the correction dictionary when the detector is enabled,
+        otherwise the canned mock-data file.
+        """
 
+        if self._settings.misrecognition_detection_enabled:
+            return self._dictionary_path.is_file()
         return self._mock_data_path.is_file()
 
-    async def process_async(self, payload: ProcessRequest) -> ProcessResponse:
+    def is_ready(self) -> bool:
+        return self.data_file_exists()
+
+    def load_shared(self) -> None:
+        """Load the default dictionary's detector, or the canned mock response."""
+
+        if self._settings.misrecognition_detection_enabled:
+            self._detectors.get(None)
+        else:
+            self._load_mock_response()
+
+    def preload(self) -> None:
+        """Load data files and build indexes now rather than on the first request."""
+
+        self.load_shared()
+        if self._settings.misrecognition_detection_enabled and self._chunk_runner is not None:
+            self._chunk_runner.start()
+
+    def close(self) -> None:
+        """Stop the chunk worker processes, if any."""
+
+        if self._chunk_runner is not None:
+            self._chunk_runner.shutdown()
+
+    def cache_sizes(self) -> dict[str, object]:
+        """Detector registry stats, the cached mock response and the auth caches."""
+
+        mock = self._mock_response
+        return {
+            "detectors": self._detectors.stats(),
+            "mockResponse": {
+                "cached": mock is not None,
+                "recommendations": sum(
+                    len(result.recommendations) for result in (mock.payload or {}).values()
+                )
+                if mock is not None
+                else 0,
+            },
+            "auth": auth_cache_sizes(),
+        }
+
+    async def process_async(
+        self, payload: ProcessRequest, context: RequestContext | None = None
+    ) -> ProcessResponse:
         """Run the quality check for an incoming request.
 
-        The only logic here is returning the canned mock data. Partners replace
-        this method with their real implementation.
+        Returns the canned mock data unless the mis-recognition detector is
+        enabled. Partners replace this method with their real implementation.
         """
 
         report_length = len(payload.report.report_text) if payload.report else 0
@@ -47,8 +143,72 @@ class QualityCheckService:
             payload.session_data.correlation_id,
             report_length,
         )
+        if self._settings.misrecognition_detection_enabled:
+            with span("quality_check.detector", report_length=report_length):
+                return await self._process_with_detector(payload)
         logger.info("No model provider configured. Returning mock data.")
-        return self._process_with_mock_data()
+        with span("quality_check.mock_data"):
+            return self._process_with_mock_data()
+
+    async def stream_async(
+        self, payload: ProcessRequest, context: RequestContext | None = None
+    ) -> AsyncIterator[Recommendation]:
+        """Yield recommendations as each check produces them (streaming mode).
+
+        Checks run concurrently and their findings are interleaved in the order
+        they are produced. Partners add further (e.g. model-backed) checks as
+        async generators in ``checks``. A check that runs synchronous code
+        should yield to the event loop between findings, as the detector does.
+        """
+
+        logger.info(
+            "Streaming quality check on radiology request. correlation_id=%s",
+            context.correlation_id if context else payload.session_data.correlation_id,
+        )
+        report_text = payload.report.report_text if payload.report else ""
+        if self._settings.misrecognition_detection_enabled:
+            checks = [
+                self._stream_detector(payload.session_data.environment_id, report_text)
+            ]
+        else:
+            checks = [self._stream_mock_data()]
+        async for recommendation in merge_streams(*checks):
+            yield recommendation
+
+    async def _stream_detector(
+        self, environment_id: str | None, report_text: str
+    ) -> AsyncIterator[Recommendation]:
+        offsets = OffsetIndex(report_text)
+        if self._chunk_runner is not None and len(report_text) > self._chunk_runner.chunk_size:
+            dictionary = self._dictionary_for(environment_id, None)
+            async for recommendation in self._chunk_runner.stream(report_text, dictionary, offsets):
+                yield recommendation
+            return
+        detector = await self._detectors.get_async(environment_id)
+        for finding in detector.iter_detect(report_text):
+            yield finding.to_recommendation(offsets)
+            # the detector is synchronous: let other requests run between findings
+            await asyncio.sleep(0)
+
+    async def _stream_mock_data(self) -> AsyncIterator[Recommendation]:
+        template = self._load_mock_response()
+        if template.payload and _QUALITY_CHECK_PAYLOAD_KEY in template.payload:
+            for recommendation in template.payload[_QUALITY_CHECK_PAYLOAD_KEY].recommendations:
+                yield recommendation
+
+    async def _process_with_detector(self, payload: ProcessRequest) -> ProcessResponse:
+        report_text = payload.report.report_text if payload.report else ""
+        environment_id = payload.session_data.environment_id
+        # Provenance positions are UTF-16 code units, like the .NET consumers' string offsets.
+        offsets = OffsetIndex(report_text)
+        if self._chunk_runner is not None and len(report_text) > self._chunk_runner.chunk_size:
+            dictionary = self._dictionary_for(environment_id, None)
+            with span("quality_check.chunks", workers=self._settings.chunk_workers):
+                recommendations = await self._chunk_runner.run(report_text, dictionary, offsets)
+        else:
+            detector = await self._detectors.get_async(environment_id)
+            recommendations = detector.recommendations(report_text, offsets)
+        return quality_check_response(recommendations)
 
     def _process_with_mock_data(self) -> ProcessResponse:
         template = self._load_mock_response()
@@ -92,3 +252,21 @@ class QualityCheckService:
         )
         self._mock_response = response
         return self._mock_response
+
+    def _dictionary_for(self, environment_id: str | None, _language: str | None) -> Path:
+        """The environment's own dictionary if it has one, else the default."""
+
+        segment = safe_path_segment(environment_id)
+        if segment is not None:
+            candidate = self._environments_dir / segment / "correction_dictionary.json"
+            if candidate.is_file():
+                return candidate
+        return self._dictionary_path
+
+    def _build_detector(self, dictionary_path: Path) -> MisrecognitionDetector:
+        detector = MisrecognitionDetector.from_file(
+            dictionary_path,
+            max_edit_distance=self._settings.misrecognition_max_edit_distance,
+        )
+        logger.info("Loaded %s correction(s) from %s.", len(detector), dictionary_path)
+        return detector
@@ -0,0 +1,128 @@
+"""Streaming ``/v1/process`` responses (NDJSON or Server-Sent Events).
+
+Callers opt in with the ``Accept`` header:
+
+* ``application/x-ndjson``: one JSON object per line,
+  ``{"recommendation": {...}}`` for each finding, then ``{"summary": {...}}``;
+* ``text/event-stream``: an ``event: recommendation`` per finding, then an
+  ``event: summary``; each ``data:`` line carries the same inner object.
+
+Each recommendation is written as soon as its check yields it, so fast checks
+reach the UI while slower (e.g. model-backed) checks are still running. The
+summary reports ``success``, ``message`` and ``recommendationCount``; a check
+that fails mid-stream ends the stream with ``success: false``. Callers that do
+not opt in get the regular :class:`~app.models.ProcessResponse` JSON. Once the
+stream ends, ``on_complete`` (e.g. the audit log) gets the recommendation
+count and the bytes written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from dragon_extension_runtime import dumps
+
+from .models import Recommendation
+
+logger = logging.getLogger("dragon.radiologists.pyextension")
+
+NDJSON = "application/x-ndjson"
+EVENT_STREAM = "text/event-stream"
+# Items buffered between the checks and the response (see merge_streams).
+MERGE_QUEUE_SIZE = 16
+
+T = TypeVar("T")
+
+
+def negotiate_stream_format(accept: str | None) -> str | None:
+    """Return the streaming media type requested by ``accept``, if any."""
+
+    if not accept:
+        return None
+    media_types = [part.split(";", 1)[0].strip().lower() for part in accept.split(",")]
+    for media_type in media_types:
+        if media_type in (NDJSON, EVENT_STREAM):
+            return media_type
+    return None
+
+
+async def merge_streams(*streams: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Yield items from several async iterators in the order they are produced.
+
+    Each stream is drained by its own task into a bounded queue, so a stream
+    that produces faster than the client reads waits instead of buffering its
+    whole output. The first exception raised by any stream is re-raised here
+    after the remaining tasks are cancelled.
+    """
+
+    queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue(MERGE_QUEUE_SIZE)
+
+    async def drain(stream: AsyncIterator[T]) -> None:
+        try:
+            async for item in stream:
+                await queue.put((False, item))
+        except Exception as exc:  # noqa: BLE001 - forwarded to the consumer
+            await queue.put((True, exc))
+            return
+        await queue.put((True, None))
+
+    tasks = [asyncio.create_task(drain(stream)) for stream in streams]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            finished, item = await queue.get()
+            if not finished:
+                yield item
+            elif item is not None:
+                raise item
+            else:
+                remaining -= 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def encode_stream(
+    recommendations: AsyncIterator[Recommendation],
+    media_type: str,
+    on_complete: Callable[[int, int], None] | None = None,
+) -> AsyncIterator[bytes]:
+    """Encode recommendations, then a summary record, as NDJSON or SSE frames.
+
+    ``on_complete(recommendation_count, bytes_written)`` is called once the
+    stream ends, also when the client disconnects early.
+    """
+
+    count = 0
+    written = 0
+    summary: dict[str, Any] = {"success": True, "message": "Payload processed successfully."}
+    try:
+        try:
+            async for recommendation in recommendations:
+                count += 1
+                frame = _frame(
+                    media_type,
+                    "recommendation",
+                    recommendation.model_dump(by_alias=True, exclude_none=True, mode="json"),
+                )
+                written += len(frame)
+                yield frame
+        except Exception:  # noqa: BLE001 - the status line has already been sent
+            logger.exception("Quality check failed while streaming recommendations.")
+            summary = {"success": False, "message": "Quality check failed."}
+        summary["recommendationCount"] = count
+        frame = _frame(media_type, "summary", summary)
+        written += len(frame)
+        yield frame
+    finally:
+        if on_complete is not None:
+            on_complete(count, written)
+
+
+def _frame(media_type: str, kind: str, data: dict[str, Any]) -> bytes:
+    if media_type == EVENT_STREAM:
+        return b"event: " + kind.encode("ascii") + b"\ndata: " + dumps(data) + b"\n\n"
+    return dumps({kind: data}) + b"\n"
@@ -21,10 +21,11 @@ from app.main import app  # type: ignore  # noqa: E402
 
 @pytest.fixture()
 def client() -> TestClient:
-    """FastAPI TestClient with cached settings cleared between tests."""
+    """Started FastAPI TestClient (lifespan and warm-up run) with fresh settings."""
 
     get_settings.cache_clear()
-    return TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture()
@@ -0,0 +1,71 @@
+"""A local stub JWKS endpoint for hermetic key-resolution tests.
+
+Serves a JWKS document over HTTP on an ephemeral localhost port so the real
+async resolver can be exercised without contacting Entra ID. Tests can swap
+the published keys (rotation), make the endpoint fail, and count fetches.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jwt.algorithms import RSAAlgorithm
+
+
+def jwk_for(public_key, kid: str) -> dict:
+    """Build a JWKS entry (``kty``/``n``/``e`` plus ``kid``) for a public key."""
+
+    jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return jwk
+
+
+class StubJwksServer:
+    """Threaded HTTP server that publishes a mutable JWKS document."""
+
+    def __init__(self, keys: list[dict] | None = None) -> None:
+        self.keys: list[dict] = list(keys or [])
+        self.fail = False
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    @property
+    def uri(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/discovery/v2.0/keys"
+
+    def __enter__(self) -> "StubJwksServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                with stub._lock:
+                    stub.request_count += 1
+                if stub.fail:
+                    self.send_error(503)
+                    return
+                body = json.dumps({"keys": stub.keys}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                pass
+
+        return _Handler
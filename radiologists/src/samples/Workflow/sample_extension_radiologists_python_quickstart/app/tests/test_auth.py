@@ -7,11 +7,13 @@ call to Entra ID is made.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 import jwt
 import pytest
 from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 from app import auth as auth_module
@@ -28,6 +30,16 @@ _CLIENT_ID = "22222222-2222-2222-2222-222222222222"
 _CALLER_ID = "33333333-3333-3333-3333-333333333333"
 
 
+class StaticKeyResolver:
+    """Hermetic signing-key resolver that always returns one local public key."""
+
+    def __init__(self, public_key) -> None:
+        self.public_key = public_key
+
+    def get_signing_key(self, token: str):
+        return self.public_key
+
+
 @pytest.fixture()
 def rsa_key_pair():
     private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
@@ -49,11 +61,7 @@ def auth_enabled_client(rsa_key_pair):
 
     app.dependency_overrides[get_settings] = lambda: enabled_settings
 
-    class _StubResolver:
-        def get_signing_key(self, token: str):
-            return public_key
-
-    auth_module.set_signing_key_resolver_factory(lambda auth: _StubResolver())
+    auth_module.set_signing_key_resolver_factory(lambda auth: StaticKeyResolver(public_key))
 
     try:
         yield TestClient(app), enabled_settings.authentication, private_key
@@ -62,7 +70,11 @@ def auth_enabled_client(rsa_key_pair):
         auth_module.reset_signing_key_resolver_factory()
 
 
-def _make_token(private_key, auth: AuthenticationSettings) -> str:
+def make_token(
+    private_key, auth: AuthenticationSettings, lifetime: timedelta = timedelta(hours=1)
+) -> str:
+    """Sign an app token for ``auth`` with the local private key."""
+
     now = datetime.now(tz=timezone.utc)
     claims = {
         "iss": f"{auth.authority}/v2.0",
@@ -70,7 +82,7 @@ def _make_token(private_key, auth: AuthenticationSettings) -> str:
         "azp": _CALLER_ID,
         "idtyp": "app",
         "iat": now,
-        "exp": now + timedelta(hours=1),
+        "exp": now + lifetime,
     }
     return jwt.encode(claims, private_key, algorithm="RS256")
 
@@ -83,7 +95,7 @@ def test_enabled_without_token_returns_401(auth_enabled_client, sample_request):
 
 def test_enabled_with_valid_token_returns_200(auth_enabled_client, sample_request):
     client, auth, private_key = auth_enabled_client
-    token = _make_token(private_key, auth)
+    token = make_token(private_key, auth)
 
     response = client.post(
         "/v1/process",
@@ -94,3 +106,99 @@ def test_enabled_with_valid_token_returns_200(auth_enabled_client, sample_reques
     assert response.status_code == 200
     recommendations = response.json()["payload"]["qualityCheckResult"]["recommendations"]
     assert len(recommendations) == 3
+
+
+class _CountingResolver(StaticKeyResolver):
+    """Returns a fixed public key and counts signature-key lookups."""
+
+    def __init__(self, public_key) -> None:
+        super().__init__(public_key)
+        self.calls = 0
+        self.key_set_version = 1
+
+    def get_signing_key(self, token: str):
+        self.calls += 1
+        return super().get_signing_key(token)
+
+
+@pytest.fixture()
+def counting_resolver(rsa_key_pair):
+    _private_key, public_key = rsa_key_pair
+    resolver = _CountingResolver(public_key)
+    auth_module.set_signing_key_resolver_factory(lambda auth: resolver)
+    try:
+        yield resolver
+    finally:
+        auth_module.reset_signing_key_resolver_factory()
+
+
+def _enabled_auth() -> AuthenticationSettings:
+    return AuthenticationSettings(
+        enabled=True,
+        tenant_id=_TENANT_ID,
+        client_id=_CLIENT_ID,
+        required_claims=RequiredClaims(idtyp=["app"], azp=[_CALLER_ID]),
+    )
+
+
+def test_validated_token_is_served_from_cache(rsa_key_pair, counting_resolver):
+    private_key, _public_key = rsa_key_pair
+    auth = _enabled_auth()
+    token = make_token(private_key, auth)
+
+    first = auth_module.validate_token(token, auth)
+    second = auth_module.validate_token(token, auth)
+
+    assert first == second
+    assert counting_resolver.calls == 1
+
+
+def test_signing_key_rotation_invalidates_cached_tokens(rsa_key_pair, counting_resolver):
+    private_key, _public_key = rsa_key_pair
+    auth = _enabled_auth()
+    token = make_token(private_key, auth)
+
+    auth_module.validate_token(token, auth)
+    counting_resolver.key_set_version += 1
+    auth_module.validate_token(token, auth)
+
+    assert counting_resolver.calls == 2
+
+
+def test_token_inside_clock_skew_window_is_not_cached(rsa_key_pair, counting_resolver):
+    private_key, _public_key = rsa_key_pair
+    auth = _enabled_auth()
+    token = make_token(private_key, auth, lifetime=timedelta(minutes=2))
+
+    auth_module.validate_token(token, auth)
+    auth_module.validate_token(token, auth)
+
+    assert counting_resolver.calls == 2
+
+
+def test_cached_token_still_enforces_allowed_callers(rsa_key_pair, counting_resolver):
+    private_key, _public_key = rsa_key_pair
+    auth = _enabled_auth()
+    token = make_token(private_key, auth)
+    auth_module.validate_token(token, auth)
+
+    auth.required_claims.azp = ["44444444-4444-4444-4444-444444444444"]
+    with pytest.raises(HTTPException) as exc_info:
+        auth_module.validate_token(token, auth)
+
+    assert exc_info.value.status_code == 401
+
+
+def test_verification_thread_pool_validates_token(rsa_key_pair, counting_resolver):
+    private_key, _public_key = rsa_key_pair
+    auth = _enabled_auth()
+    auth.token_verification_threads = 2
+    auth.token_cache_size = 0
+    token = make_token(private_key, auth)
+
+    try:
+        claims = asyncio.run(auth_module.validate_token_async(token, auth))
+    finally:
+        auth_module.shutdown_token_verification_executor()
+
+    assert claims["azp"] == _CALLER_ID
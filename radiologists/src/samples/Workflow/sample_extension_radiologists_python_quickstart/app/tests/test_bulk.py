@@ -0,0 +1,22 @@
+"""Bulk CLI tests."""
+
+from __future__ import annotations
+
+import json
+
+from app.bulk import main
+
+
+def test_bulk_cli_matches_the_process_endpoint(tmp_path, client, sample_request):
+    source, results = tmp_path / "reports.ndjson", tmp_path / "results.ndjson"
+    source.write_text(json.dumps(sample_request) + "\n" + json.dumps(sample_request) + "\n")
+
+    status = main([str(source), "-o", str(results), "--workers", "0", "--quiet"])
+
+    expected = client.post("/v1/process", json=sample_request).json()
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert status == 0
+    assert records == [
+        {"record": 1, "response": expected},
+        {"record": 2, "response": expected},
+    ]
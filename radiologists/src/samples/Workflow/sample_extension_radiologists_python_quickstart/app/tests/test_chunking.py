@@ -0,0 +1,180 @@
+"""Chunked execution tests: splitting, offset merging and the process pool."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from dragon_extension_runtime import OffsetIndex
+
+from app.chunking import ChunkedCheckRunner, merge_recommendations, split_report
+from app.config import Settings
+from app.detection import MisrecognitionDetector
+from app.models import Provenance, QualityCheckType, Recommendation
+from app.service import QualityCheckService
+
+_DICTIONARY = Path(__file__).resolve().parents[2] / "Data" / "correction_dictionary.json"
+
+_SENTENCES = [
+    "FINDINGS:\n",
+    "The liver demonstrates paddock steatosis. ",
+    "No focal lesion is seen. ",
+    "Chest X-ray performed with for views shows clear lung fields. ",
+    "Small plural effusion on the left. ",
+    "IMPRESSION:\n",
+    "Mild cardio megaly. ",
+]
+
+
+def _long_report(repeats: int) -> str:
+    return "".join(_SENTENCES * repeats)
+
+
+def _recommendation(start: int, end: int) -> Recommendation:
+    return Recommendation(
+        quality_check_type=QualityCheckType.Clinical,
+        description="Replace it.",
+        reason="Because.",
+        provenance=[Provenance(text="x", start_position=start, end_position=end)],
+    )
+
+
+def test_split_report_cuts_at_boundaries_and_overlaps():
+    text = _long_report(20)
+
+    chunks = split_report(text, chunk_size=500, overlap=100)
+
+    assert len(chunks) > 1
+    assert chunks[0].start == 0
+    assert chunks[-1].start + len(chunks[-1].text) == len(text)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert len(previous.text) <= 500
+        assert text[current.start : current.start + len(current.text)] == current.text
+        # Consecutive chunks overlap (or at least touch) and start on a boundary.
+        assert current.start <= previous.start + len(previous.text)
+        assert text[current.start - 1] in " \n"
+
+
+def test_split_report_hard_cuts_unbroken_text():
+    chunks = split_report("x" * 1200, chunk_size=500, overlap=50)
+
+    assert "".join(chunk.text for chunk in chunks) == "x" * 1200
+
+
+def test_merge_shifts_offsets_and_drops_overlap_duplicates():
+    merged = merge_recommendations(
+        [
+            (0, [_recommendation(10, 20), _recommendation(95, 105)]),
+            # Second chunk starts at 90 and sees the 95-105 finding again.
+            (90, [_recommendation(5, 15), _recommendation(30, 40)]),
+        ]
+    )
+
+    spans = [(r.provenance[0].start_position, r.provenance[0].end_position) for r in merged]
+    assert spans == [(10, 20), (95, 105), (120, 130)]
+
+
+def test_chunked_run_matches_inline_detection():
+    text = _long_report(60)
+    inline = MisrecognitionDetector.from_file(_DICTIONARY).recommendations(text)
+    runner = ChunkedCheckRunner(
+        _DICTIONARY, max_edit_distance=2, workers=2, chunk_size=700, overlap=150
+    )
+
+    try:
+        chunked = asyncio.run(runner.run(text))
+    finally:
+        runner.shutdown()
+
+    assert [r.model_dump() for r in chunked] == [r.model_dump() for r in inline]
+    for recommendation in chunked:
+        span = recommendation.provenance[0]
+        assert text[int(span.start_position) : int(span.end_position)] == span.text
+
+
+def test_chunked_run_reports_utf16_positions_like_inline_detection():
+    # Emoji shift UTF-16 offsets by one unit each; chunk starts are code points.
+    text = "".join(f"🧠 {sentence}" for sentence in _SENTENCES * 40)
+    offsets = OffsetIndex(text)
+    inline = MisrecognitionDetector.from_file(_DICTIONARY).recommendations(text, offsets)
+    runner = ChunkedCheckRunner(
+        _DICTIONARY, max_edit_distance=2, workers=2, chunk_size=700, overlap=150
+    )
+
+    try:
+        chunked = asyncio.run(runner.run(text, offsets=offsets))
+    finally:
+        runner.shutdown()
+
+    assert [r.model_dump() for r in chunked] == [r.model_dump() for r in inline]
+    units = text.encode("utf-16-le")
+    for recommendation in chunked:
+        span = recommendation.provenance[0]
+        # 13 == 13.0, but a serializer may write an int as 13: one wire type on both paths
+        assert type(span.start_position) is type(span.end_position) is float
+        start, end = int(span.start_position), int(span.end_position)
+        assert units[2 * start : 2 * end].decode("utf-16-le") == span.text
+
+
+def test_concurrent_first_requests_share_one_pool(monkeypatch):
+    import concurrent.futures
+
+    pools = []
+
+    class CountingPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", CountingPool)
+    runner = ChunkedCheckRunner(
+        _DICTIONARY, max_edit_distance=2, workers=1, chunk_size=700, overlap=150
+    )
+
+    async def first_requests():
+        return await asyncio.gather(*(runner.run(_long_report(2)) for _ in range(4)))
+
+    try:
+        results = asyncio.run(first_requests())
+    finally:
+        runner.shutdown()
+
+    assert len(pools) == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_chunk_overlap_must_be_smaller_than_chunk_size():
+    with pytest.raises(ValueError):
+        QualityCheckService(
+            Settings(
+                misrecognition_detection_enabled=True,
+                chunk_workers=1,
+                chunk_size_chars=500,
+                chunk_overlap_chars=500,
+            )
+        )
+
+
+def test_chunked_stream_yields_each_finding_once():
+    text = _long_report(60)
+    runner = ChunkedCheckRunner(
+        _DICTIONARY, max_edit_distance=2, workers=2, chunk_size=700, overlap=150
+    )
+
+    async def collect():
+        merged = await runner.run(text)
+        streamed = [r async for r in runner.stream(text)]
+        return merged, streamed
+
+    try:
+        merged, streamed = asyncio.run(collect())
+    finally:
+        runner.shutdown()
+
+    def spans(recommendations):
+        return sorted(
+            (r.provenance[0].start_position, r.provenance[0].end_position) for r in recommendations
+        )
+
+    assert spans(streamed) == spans(merged)
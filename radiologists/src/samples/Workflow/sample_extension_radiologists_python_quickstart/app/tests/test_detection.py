@@ -0,0 +1,109 @@
+"""Mis-recognition detector tests: phonetic keys, distance index and report scanning."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+from dragon_extension_runtime import OffsetIndex
+
+from app.config import Settings
+from app.detection import (
+    Correction,
+    EditDistanceIndex,
+    MisrecognitionDetector,
+    levenshtein,
+    metaphone,
+)
+from app.models import ProcessRequest
+from app.service import QualityCheckService
+
+
+@pytest.fixture()
+def detector() -> MisrecognitionDetector:
+    return MisrecognitionDetector(
+        [
+            Correction("paddock steatosis", "hepatic steatosis", severity_score_percent=85),
+            Correction("for views", "4 views", severity_score_percent=50),
+            Correction("plural effusion", "pleural effusion", severity_score_percent=70),
+        ]
+    )
+
+
+def test_metaphone_groups_sound_alike_spellings():
+    assert metaphone("paddock") == metaphone("padock") == metaphone("paddok")
+    assert metaphone("phone") == metaphone("fone")
+    assert metaphone("knight") == metaphone("night")
+    assert metaphone("for") != metaphone("4")
+
+
+def test_edit_distance_index_matches_brute_force_search():
+    rng = random.Random(7)
+    words = {"".join(rng.choices("abcde", k=rng.randint(1, 9))) for _ in range(300)}
+    index = EditDistanceIndex(max_distance=2)
+    for word in words:
+        index.add(word)
+
+    for query in ["", "abc", "eeddccbba", *rng.sample(sorted(words), 20)]:
+        for k in (1, 2):
+            expected = sorted((levenshtein(query, w), w) for w in words if levenshtein(query, w) <= k)
+            assert index.search(query, k) == expected
+
+
+def test_detect_reports_exact_offsets_into_original_text(detector):
+    text = "CT ABDOMEN: The liver demonstrates Paddock steatosis. Chest X-ray with for views."
+
+    findings = detector.detect(text)
+
+    assert [f.correction.correct for f in findings] == ["hepatic steatosis", "4 views"]
+    for finding in findings:
+        assert text[finding.start : finding.end] == finding.text
+    assert findings[0].text == "Paddock steatosis"
+    assert findings[0].distance == 0
+
+
+def test_detect_catches_misspelled_variants_with_lower_severity(detector):
+    (recommendation,) = detector.recommendations("Mild padock steatosis.")
+
+    assert recommendation.description == "Replace 'padock steatosis' with 'hepatic steatosis'."
+    assert recommendation.severity_score_percent == 75
+    assert recommendation.provenance[0].start_position == 5
+    assert recommendation.provenance[0].end_position == 21
+
+
+def test_positions_are_utf16_code_units_after_astral_characters(detector):
+    text = "🩻 CT 🧠 head: the liver demonstrates paddock steatosis. Chest X-ray with for views."
+    units = text.encode("utf-16-le")
+
+    recommendations = detector.recommendations(text, OffsetIndex(text))
+
+    assert [r.provenance[0].start_position for r in recommendations] == [
+        text.index("paddock") + 2,
+        text.index("for views") + 2,
+    ]
+    for recommendation in recommendations:
+        span = recommendation.provenance[0]
+        start, end = int(span.start_position), int(span.end_position)
+        assert units[2 * start : 2 * end].decode("utf-16-le") == span.text
+
+
+def test_detect_ignores_correctly_dictated_terms(detector):
+    text = "Small pleural effusion. Diffuse hepatic steatosis. 4 views obtained."
+
+    assert detector.detect(text) == []
+
+
+def test_service_returns_detector_findings_when_enabled(sample_request):
+    settings = Settings(misrecognition_detection_enabled=True)
+    service = QualityCheckService(settings)
+    assert service.data_file_exists()
+
+    response = asyncio.run(service.process_async(ProcessRequest.model_validate(sample_request)))
+
+    report_text = sample_request["report"]["reportText"]
+    recommendations = response.payload["qualityCheckResult"].recommendations
+    assert [r.provenance[0].text for r in recommendations] == ["paddock steatosis", "for views"]
+    for recommendation in recommendations:
+        span = recommendation.provenance[0]
+        assert report_text[int(span.start_position) : int(span.end_position)] == span.text
@@ -0,0 +1,30 @@
+"""Per-environment correction dictionaries (engines from the shared registry)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.config import Settings
+from app.models import ProcessRequest
+from app.service import QualityCheckService
+
+
+def test_environment_dictionary_overrides_the_default(tmp_path, sample_request):
+    environment = tmp_path / "tenant-a"
+    environment.mkdir()
+    (environment / "correction_dictionary.json").write_text(
+        json.dumps({"corrections": [{"heard": "clear lung fields", "correct": "clear lungs"}]})
+    )
+    service = QualityCheckService(
+        Settings(misrecognition_detection_enabled=True, environment_dictionaries_dir=str(tmp_path))
+    )
+
+    def descriptions(environment_id: str) -> list[str]:
+        body = {**sample_request, "sessionData": {"environment_id": environment_id}}
+        response = asyncio.run(service.process_async(ProcessRequest.model_validate(body)))
+        return [r.description for r in response.payload["qualityCheckResult"].recommendations]
+
+    assert descriptions("tenant-a") == ["Replace 'clear lung fields' with 'clear lungs'."]
+    assert len(descriptions("tenant-b")) == 2  # default dictionary
+    assert len(descriptions("../tenant-a")) == 2
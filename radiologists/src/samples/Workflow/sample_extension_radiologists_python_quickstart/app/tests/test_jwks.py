@@ -0,0 +1,149 @@
+"""Async JWKS resolver tests against a local stub JWKS server.
+
+Each test drives its own event loop with ``asyncio.run`` so no async pytest
+plugin is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app import auth as auth_module
+from app.config import AuthenticationSettings, RequiredClaims
+from app.jwks import AsyncJwksSigningKeyResolver
+from app.tests.jwks_stub import StubJwksServer, jwk_for
+
+_CALLER_ID = "33333333-3333-3333-3333-333333333333"
+
+
+def _new_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _token(private_key, kid: str, auth: AuthenticationSettings | None = None) -> str:
+    now = datetime.now(tz=timezone.utc)
+    claims = {"azp": _CALLER_ID, "idtyp": "app", "iat": now, "exp": now + timedelta(hours=1)}
+    if auth is not None:
+        claims.update({"iss": f"{auth.authority}/v2.0", "aud": auth.client_id})
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture()
+def signing_key():
+    return _new_key()
+
+
+@pytest.fixture()
+def jwks_server(signing_key):
+    with StubJwksServer([jwk_for(signing_key.public_key(), "key-1")]) as server:
+        yield server
+
+
+def test_start_prefetches_keys(jwks_server, signing_key):
+    async def scenario():
+        resolver = AsyncJwksSigningKeyResolver(jwks_server.uri)
+        await resolver.start()
+        try:
+            # The synchronous path is served from the prefetched snapshot.
+            return resolver.get_signing_key(_token(signing_key, "key-1"))
+        finally:
+            await resolver.stop()
+
+    key = asyncio.run(scenario())
+
+    assert key.public_numbers() == signing_key.public_key().public_numbers()
+    assert jwks_server.request_count == 1
+
+
+def test_background_refresh_runs_on_schedule(jwks_server):
+    async def scenario():
+        resolver = AsyncJwksSigningKeyResolver(jwks_server.uri, refresh_interval_seconds=0.05)
+        await resolver.start()
+        await asyncio.sleep(0.3)
+        await resolver.stop()
+
+    asyncio.run(scenario())
+
+    assert jwks_server.request_count >= 3
+
+
+def test_failed_refresh_keeps_serving_stale_keys(jwks_server, signing_key):
+    async def scenario():
+        resolver = AsyncJwksSigningKeyResolver(jwks_server.uri)
+        await resolver.refresh()
+        jwks_server.fail = True
+        refreshed = await resolver.refresh()
+        key = await resolver.get_signing_key_async(_token(signing_key, "key-1"))
+        return refreshed, key
+
+    refreshed, key = asyncio.run(scenario())
+
+    assert refreshed is False
+    assert key is not None
+
+
+def test_unknown_kid_triggers_single_flight_refetch(jwks_server, signing_key):
+    rotated_key = _new_key()
+
+    async def scenario():
+        resolver = AsyncJwksSigningKeyResolver(jwks_server.uri, min_refetch_interval_seconds=0)
+        await resolver.refresh()
+        version = resolver.key_set_version
+        jwks_server.keys = [jwk_for(rotated_key.public_key(), "key-2")]
+        token = _token(rotated_key, "key-2")
+        keys = await asyncio.gather(*(resolver.get_signing_key_async(token) for _ in range(10)))
+        return keys, resolver.key_set_version != version
+
+    keys, rotated = asyncio.run(scenario())
+
+    assert len(keys) == 10
+    assert rotated
+    assert jwks_server.request_count == 2
+
+
+def test_unknown_kid_refetch_is_rate_limited(jwks_server, signing_key):
+    async def scenario():
+        resolver = AsyncJwksSigningKeyResolver(jwks_server.uri, min_refetch_interval_seconds=60)
+        await resolver.refresh()
+        token = _token(signing_key, "unknown-kid")
+        for _ in range(3):
+            with pytest.raises(jwt.PyJWKClientError):
+                await resolver.get_signing_key_async(token)
+
+    asyncio.run(scenario())
+
+    # The initial fetch happened just now, so no refetch is allowed yet.
+    assert jwks_server.request_count == 1
+
+
+def test_validate_token_async_uses_default_resolver(jwks_server, signing_key, monkeypatch):
+    auth = AuthenticationSettings(
+        enabled=True,
+        tenant_id="11111111-1111-1111-1111-111111111111",
+        client_id="22222222-2222-2222-2222-222222222222",
+        required_claims=RequiredClaims(idtyp=["app"], azp=[_CALLER_ID]),
+    )
+    monkeypatch.setattr(
+        AuthenticationSettings, "jwks_uri", property(lambda self: jwks_server.uri)
+    )
+    monkeypatch.setattr(auth_module, "_resolvers", {})
+
+    async def scenario():
+        await auth_module.start_signing_key_resolver(auth)
+        try:
+            return await auth_module.validate_token_async(_token(signing_key, "key-1", auth), auth)
+        finally:
+            await auth_module.stop_signing_key_resolvers()
+
+    try:
+        claims = asyncio.run(scenario())
+    finally:
+        auth_module.reset_signing_key_resolver_factory()
+
+    assert claims["azp"] == _CALLER_ID
+    assert jwks_server.request_count == 1
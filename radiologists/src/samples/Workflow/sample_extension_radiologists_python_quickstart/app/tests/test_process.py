@@ -2,6 +2,17 @@
 
 from __future__ import annotations
 
+import logging
+import time
+
+from dragon_extension_runtime import ContractValidator
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.tests.conftest import SAMPLE_ROOT
+
+SPEC = SAMPLE_ROOT.parents[3] / "radiologists-extensibility-api.yaml"
+
 
 def test_liveness_returns_healthy(client):
     response = client.get("/health/liveness")
@@ -36,8 +47,83 @@ def test_process_happy_path_returns_canned_response(client, sample_request):
     assert paddock["severityScorePercent"] == 85
 
 
+def test_process_response_matches_the_radiology_spec(client, sample_request):
+    response = client.post("/v1/process", json=sample_request)
+
+    assert ContractValidator(SPEC).validate(response.json()) == []
+
+
+def test_cache_sizes_report_the_mock_response_and_auth_caches(client, sample_request):
+    client.post("/v1/process", json=sample_request)
+
+    sizes = app.state.service.cache_sizes()
+
+    assert sizes["mockResponse"] == {"cached": True, "recommendations": 3}
+    assert sizes["detectors"]["entries"] == 0
+    assert set(sizes["auth"]) == {"signingKeyResolvers", "tokenCaches", "validatedTokens"}
+
+
 def test_process_missing_required_fields_returns_validation_error(client):
     # sessionData is required by the contract; omitting it triggers FastAPI's
     # default 422 validation error.
     response = client.post("/v1/process", json={})
     assert response.status_code == 422
+
+
+def test_readiness_is_unhealthy_until_warm_up_has_run(caplog):
+    # Without entering the client context the lifespan (and warm-up) never runs.
+    app.state.ready = False
+    response = TestClient(app).get("/health/readiness")
+    assert response.status_code == 503
+
+    with caplog.at_level(logging.INFO, logger="dragon.radiologists.pyextension"):
+        with TestClient(app) as started:
+            assert started.get("/health/readiness").status_code == 200
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Warm-up finished") for message in messages)
+    assert not any("Warm-up request" in message for message in messages)
+
+
+def test_process_respond_async_returns_202_and_the_same_result(client, sample_request):
+    sync = client.post("/v1/process", json=sample_request).json()
+
+    accepted = client.post(
+        "/v1/process", json=sample_request, headers={"Prefer": "respond-async"}
+    )
+    assert accepted.status_code == 202
+    location = accepted.headers["location"]
+
+    deadline = time.monotonic() + 5
+    job = client.get(location).json()
+    while job["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(0.01)
+        job = client.get(location).json()
+
+    assert job["status"] == "succeeded"
+    assert job["result"] == sync
+
+
+def test_completed_job_is_audited(client, sample_request, monkeypatch):
+    records = []
+
+    class Recorder:
+        def record_exchange(self, context, **fields):
+            records.append((context, fields))
+
+    monkeypatch.setattr(app.state, "audit", Recorder())
+    accepted = client.post(
+        "/v1/process",
+        json=sample_request,
+        headers={"Prefer": "respond-async", "x-ms-correlation-id": "from-header"},
+    )
+
+    deadline = time.monotonic() + 5
+    job = client.get(accepted.headers["location"]).json()
+    while job["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(0.01)
+        job = client.get(accepted.headers["location"]).json()
+
+    ((context, fields),) = records
+    assert context.correlation_id == "from-header"
+    assert fields["counts"] == {"recommendations": 3}
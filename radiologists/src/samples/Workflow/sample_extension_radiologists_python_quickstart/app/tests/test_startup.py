@@ -0,0 +1,86 @@
+"""Cold-start tests: import-time budget and startup-optimized mode.
+
+Each test runs a fresh interpreter so module caching in the test process does
+not hide import cost. Import times come from ``python -X importtime``.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SAMPLE_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules that are only needed once authentication is used.
+_LAZY_MODULES = ("jwt", "httpx", "cryptography")
+
+# Standard library modules of runtime subsystems that are off by default (job
+# store, profiling, memory diagnostics, process pools).
+_OPTIONAL_MODULES = ("sqlite3", "cProfile", "tracemalloc", "multiprocessing")
+
+# Self time of the sample's ``app.*`` and the shared ``dragon_extension_runtime.*``
+# modules (framework imports excluded).
+_APP_IMPORT_BUDGET_MS = 100
+_OWN_PACKAGES = ("app", "dragon_extension_runtime")
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DCR_RAD_STARTUP_OPTIMIZED": "true"}
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=SAMPLE_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_times() -> dict[str, int]:
+    """Map module name -> self import time in microseconds."""
+
+    stderr = _run("import app.main", "-X", "importtime").stderr
+    times: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _cumulative_us, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def test_app_import_fits_budget_and_skips_auth_dependencies():
+    times = _import_times()
+
+    assert "app.main" in times
+    for module in _LAZY_MODULES:
+        assert module not in times, f"{module} should be imported lazily"
+
+    own_ms = sum(us for name, us in times.items() if name.split(".")[0] in _OWN_PACKAGES) / 1000
+    assert own_ms <= _APP_IMPORT_BUDGET_MS, f"app.* and runtime imports took {own_ms:.1f} ms"
+
+
+def test_disabled_subsystems_are_not_imported():
+    code = f"import sys, app.main\nprint(*sorted(set({_OPTIONAL_MODULES!r}) & set(sys.modules)))"
+
+    assert _run(code).stdout.split() == []
+
+
+def test_startup_optimized_mode_disables_openapi_and_still_processes():
+    code = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "client = TestClient(app)\n"
+        "print(client.get('/openapi.json').status_code)\n"
+        "print(client.get('/docs').status_code)\n"
+        "body = {'sessionData': {'correlation_id': 'cold-start'},"
+        " 'report': {'reportText': 'CT ABDOMEN'}}\n"
+        "print(client.post('/v1/process', json=body).status_code)\n"
+    )
+
+    statuses = _run(code).stdout.split()
+
+    assert statuses == ["404", "404", "200"]
@@ -0,0 +1,159 @@
+"""Streaming (NDJSON / SSE) /v1/process tests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.main import service
+from app.streaming import MERGE_QUEUE_SIZE, encode_stream, merge_streams, negotiate_stream_format
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_ndjson_streams_each_recommendation_then_a_summary(client, sample_request):
+    expected = client.post("/v1/process", json=sample_request).json()
+    expected_recommendations = expected["payload"]["qualityCheckResult"]["recommendations"]
+
+    response = client.post(
+        "/v1/process", json=sample_request, headers={"Accept": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["recommendation"] for r in records[:-1]] == expected_recommendations
+    assert records[-1] == {
+        "summary": {
+            "success": True,
+            "message": "Payload processed successfully.",
+            "recommendationCount": 3,
+        }
+    }
+
+
+def test_event_stream_uses_named_events(client, sample_request):
+    response = client.post(
+        "/v1/process", json=sample_request, headers={"Accept": "text/event-stream"}
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["recommendation"] * 3 + ["summary"]
+    assert events[0][1]["qualityCheckType"] == "Clinical"
+    assert events[-1][1]["recommendationCount"] == 3
+
+
+def test_default_accept_keeps_the_json_envelope(client, sample_request):
+    response = client.post(
+        "/v1/process", json=sample_request, headers={"Accept": "application/json, */*"}
+    )
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["success"] is True
+
+
+def test_negotiate_stream_format_ignores_parameters_and_order():
+    assert negotiate_stream_format(None) is None
+    assert negotiate_stream_format("application/json") is None
+    assert negotiate_stream_format("application/json, application/x-ndjson;q=0.9") == (
+        "application/x-ndjson"
+    )
+    assert negotiate_stream_format("Text/Event-Stream") == "text/event-stream"
+
+
+def test_merge_streams_yields_fast_checks_before_slow_ones():
+    async def check(name: str, delay: float):
+        await asyncio.sleep(delay)
+        yield name
+
+    async def collect():
+        return [item async for item in merge_streams(check("slow", 0.05), check("fast", 0))]
+
+    assert asyncio.run(collect()) == ["fast", "slow"]
+
+
+def test_merge_streams_bounds_what_a_fast_check_buffers_ahead_of_the_client():
+    produced = []
+
+    async def fast_check():
+        for i in range(10 * MERGE_QUEUE_SIZE):
+            produced.append(i)
+            yield i
+
+    async def first_item():
+        merged = merge_streams(fast_check())
+        item = await merged.__anext__()
+        await asyncio.sleep(0.01)  # the check runs on while the client is slow
+        buffered = len(produced)
+        await merged.aclose()
+        return item, buffered
+
+    item, buffered = asyncio.run(first_item())
+    assert item == 0
+    assert buffered <= MERGE_QUEUE_SIZE + 2
+
+
+def test_failing_check_ends_the_stream_with_an_unsuccessful_summary(sample_request, monkeypatch):
+    async def broken(payload):
+        raise RuntimeError("model endpoint down")
+        yield  # pragma: no cover - makes this an async generator
+
+    monkeypatch.setattr(service, "stream_async", broken)
+
+    async def collect():
+        return [
+            frame
+            async for frame in encode_stream(service.stream_async(None), "application/x-ndjson")
+        ]
+
+    (frame,) = asyncio.run(collect())
+    assert json.loads(frame)["summary"] == {
+        "success": False,
+        "message": "Quality check failed.",
+        "recommendationCount": 0,
+    }
+
+
+def test_finished_stream_is_audited_with_the_body_correlation_id(
+    client, sample_request, monkeypatch
+):
+    records = []
+
+    class Recorder:
+        def record_exchange(self, context, **fields):
+            records.append((context, fields))
+
+    monkeypatch.setattr(client.app.state, "audit", Recorder())
+    response = client.post(
+        "/v1/process", json=sample_request, headers={"Accept": "application/x-ndjson"}
+    )
+
+    ((context, fields),) = records
+    assert context.correlation_id == sample_request["sessionData"]["correlation_id"]
+    assert fields["counts"] == {"recommendations": 3}
+    assert fields["response_bytes"] == len(response.content)
+
+
+def test_finished_stream_is_checked_against_the_contract_as_a_json_response(
+    client, sample_request, monkeypatch
+):
+    bodies = []
+
+    class Checker:
+        def submit(self, body):
+            bodies.append(body)
+
+    monkeypatch.setattr(client.app.state, "contracts", Checker())
+    expected = client.post("/v1/process", json=sample_request).content
+    bodies.clear()
+
+    client.post("/v1/process", json=sample_request, headers={"Accept": "application/x-ndjson"})
+
+    assert bodies == [expected]
@@ -0,0 +1,70 @@
+"""Startup warm-up that runs before the readiness probe reports healthy.
+
+The first real requests after a deploy would otherwise pay for pydantic
+validator compilation (models use ``defer_build``), FastAPI's request-body
+adapter, loading the mock-data file, and cold caches. :func:`warm_up` runs
+during the application lifespan, after the service has preloaded its data
+files and before ``/health/readiness`` turns healthy. It sends a synthetic
+request through ``POST /v1/process`` in-process (straight into the ASGI app,
+with authentication bypassed for that one call), which exercises the same
+validation, service and serialization path as real traffic.
+
+Signing keys are prefetched separately by a startup hook (see
+:func:`app.auth.start_signing_key_resolver`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+
+from dragon_extension_runtime import post_in_process
+from fastapi import FastAPI
+
+from .auth import require_auth
+
+logger = logging.getLogger("dragon.radiologists.pyextension")
+
+_SYNTHETIC_REQUEST = {
+    "extensibilityApiVersion": "1.1.1",
+    "sessionData": {
+        "correlation_id": "warmup",
+        "session_start": "2025-01-01T10:00:00Z",
+        "environment_id": "warmup",
+    },
+    "patientInformation": {"dateOfBirth": "1980-05-12", "biologicalSex": "Female"},
+    "report": {
+        "reportText": (
+            "CT ABDOMEN WITH CONTRAST: The liver demonstrates paddock steatosis. "
+            "Chest X-ray performed with for views shows clear lung fields."
+        )
+    },
+}
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Prime validators and caches before reporting ready."""
+
+    started = time.perf_counter()
+
+    # The synthetic request is internal, so it must not need a bearer token.
+    bypass_auth = require_auth not in app.dependency_overrides
+    if bypass_auth:
+        app.dependency_overrides[require_auth] = _anonymous
+    try:
+        status = await post_in_process(
+            app, "/v1/process", json.dumps(_SYNTHETIC_REQUEST).encode("utf-8")
+        )
+    finally:
+        if bypass_auth:
+            app.dependency_overrides.pop(require_auth, None)
+
+    if status != 200:
+        logger.warning("Warm-up request to /v1/process returned %s.", status)
+    logger.info("Warm-up finished in %.0f ms.", (time.perf_counter() - started) * 1000)
+
+
+def _anonymous() -> None:
+    return None
+
@@ -0,0 +1,75 @@
+"""Benchmark: mis-recognition detection on a multi-page report, inline vs chunked.
+
+Builds a long synthetic report from the sample sentences and times the inline
+detector against :class:`app.chunking.ChunkedCheckRunner` with 1..N worker
+processes (N defaults to the number of CPU cores). Pool start-up is excluded;
+the service starts its pool during warm-up. Run from the sample root::
+
+    python3.12 benchmarks/bench_chunked.py --pages 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Ensure the sample root (parent of the ``app`` package) is importable.
+SAMPLE_ROOT = Path(__file__).resolve().parents[1]
+if str(SAMPLE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SAMPLE_ROOT))
+
+from app.chunking import ChunkedCheckRunner  # noqa: E402
+from app.detection import MisrecognitionDetector  # noqa: E402
+
+_DICTIONARY = SAMPLE_ROOT / "Data" / "correction_dictionary.json"
+
+_PAGE = (
+    "FINDINGS:\n"
+    "The liver demonstrates paddock steatosis. No focal hepatic lesion is seen. "
+    "The gallbladder is unremarkable without wall thickening or pericholecystic fluid. "
+    "Chest X-ray performed with for views shows clear lung fields. "
+    "Small plural effusion on the left with adjacent a tell ectasis. "
+    "The kidneys enhance symmetrically; there is no hydro nephrosis. "
+    "IMPRESSION:\n"
+    "Mild cardio megaly. Findings were discussed with the referring physician.\n"
+) * 6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=8000)
+    args = parser.parse_args()
+
+    text = _PAGE * args.pages
+    detector = MisrecognitionDetector.from_file(_DICTIONARY)
+    start = time.perf_counter()
+    findings = detector.recommendations(text)
+    inline = time.perf_counter() - start
+    print(f"   inline: {len(text)} chars in {inline * 1e3:.0f} ms ({len(findings)} findings)")
+
+    for workers in range(1, args.max_workers + 1):
+        runner = ChunkedCheckRunner(
+            _DICTIONARY, max_edit_distance=2, workers=workers,
+            chunk_size=args.chunk_size, overlap=200,
+        )
+        runner.start()
+        try:
+            start = time.perf_counter()
+            findings = asyncio.run(runner.run(text))
+            elapsed = time.perf_counter() - start
+        finally:
+            runner.shutdown()
+        print(
+            f"{workers:>2} worker(s): {elapsed * 1e3:.0f} ms "
+            f"({inline / elapsed:.2f}x inline, {len(findings)} findings)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: mis-recognition detection against a large synthetic dictionary.
+
+Builds a dictionary of ``--entries`` random mis-hearing phrases, then scans a
+report of ``--words`` tokens with the indexed detector and with a brute-force
+scan that computes the edit distance to every entry. The brute-force scan allows
+two edits for every word, while the detector tightens the bound for short
+phrases, so it reports more matches. Run from the sample root::
+
+    python3.12 benchmarks/bench_detection.py --entries 20000 --words 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Ensure the sample root (parent of the ``app`` package) is importable.
+SAMPLE_ROOT = Path(__file__).resolve().parents[1]
+if str(SAMPLE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SAMPLE_ROOT))
+
+from app.detection import Correction, MisrecognitionDetector, levenshtein  # noqa: E402
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def _brute_force(text_words: list[str], keys: list[str], max_distance: int) -> int:
+    hits = 0
+    for word in text_words:
+        hits += any(levenshtein(word, key) <= max_distance for key in keys)
+    return hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=400)
+    args = parser.parse_args()
+
+    rng = random.Random(31)
+    keys = [_word(rng) for _ in range(args.entries)]
+    start = time.perf_counter()
+    detector = MisrecognitionDetector([Correction(key, "corrected term") for key in keys])
+    build = time.perf_counter() - start
+    print(f"   build: {len(detector)} entries indexed in {build:.2f}s")
+
+    text_words = [_word(rng) for _ in range(args.words)]
+    text = " ".join(text_words)
+
+    start = time.perf_counter()
+    findings = detector.detect(text)
+    indexed = time.perf_counter() - start
+    print(f" indexed: {args.words} words in {indexed * 1e3:.0f} ms ({len(findings)} findings)")
+
+    start = time.perf_counter()
+    hits = _brute_force(text_words, keys, 2)
+    brute = time.perf_counter() - start
+    print(f"   brute: {args.words} words in {brute * 1e3:.0f} ms ({hits} matches)")
+
+
+if __name__ == "__main__":
+    main()
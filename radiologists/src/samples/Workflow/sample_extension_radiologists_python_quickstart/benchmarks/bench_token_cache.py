@@ -0,0 +1,71 @@
+"""Benchmark: bearer-token validation with and without the validated-token cache.
+
+Runs hermetically: a local RSA key signs one token and the test suite's
+``StaticKeyResolver`` is injected through ``set_signing_key_resolver_factory``,
+so no request reaches Entra ID. Run from the sample root::
+
+    python3.12 benchmarks/bench_token_cache.py --iterations 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Ensure the sample root (parent of the ``app`` package) is importable.
+SAMPLE_ROOT = Path(__file__).resolve().parents[1]
+if str(SAMPLE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SAMPLE_ROOT))
+
+from app import auth as auth_module  # noqa: E402
+from app.config import AuthenticationSettings, RequiredClaims  # noqa: E402
+from app.tests.test_auth import StaticKeyResolver, make_token  # noqa: E402
+
+_CALLER_ID = "33333333-3333-3333-3333-333333333333"
+
+
+def _auth_settings(token_cache_size: int) -> AuthenticationSettings:
+    return AuthenticationSettings(
+        enabled=True,
+        tenant_id="11111111-1111-1111-1111-111111111111",
+        client_id="22222222-2222-2222-2222-222222222222",
+        required_claims=RequiredClaims(idtyp=["app"], azp=[_CALLER_ID]),
+        token_cache_size=token_cache_size,
+    )
+
+
+def _run(auth: AuthenticationSettings, token: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        auth_module.validate_token(token, auth)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    resolver = StaticKeyResolver(private_key.public_key())
+
+    auth_module.set_signing_key_resolver_factory(lambda auth: resolver)
+    try:
+        for label, cache_size in (("uncached", 0), ("cached", 1024)):
+            auth = _auth_settings(cache_size)
+            token = make_token(private_key, auth)
+            elapsed = _run(auth, token, args.iterations)
+            print(
+                f"{label:>9}: {args.iterations} validations in {elapsed:.3f}s "
+                f"({elapsed / args.iterations * 1e6:.1f} us/validation)"
+            )
+    finally:
+        auth_module.reset_signing_key_resolver_factory()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: concurrent token verification inline vs. on the verification pool.
+
+Drives many concurrent ``validate_token_async`` calls (validated-token cache
+disabled, so every call does the RS256 check) and reports throughput plus the
+worst event-loop stall observed by a 1 ms ticker. Runs hermetically with the
+test suite's ``StaticKeyResolver``. Run from the sample root::
+
+    python3.12 benchmarks/bench_verification_offload.py --requests 4000 --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Ensure the sample root (parent of the ``app`` package) is importable.
+SAMPLE_ROOT = Path(__file__).resolve().parents[1]
+if str(SAMPLE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SAMPLE_ROOT))
+
+from app import auth as auth_module  # noqa: E402
+from app.config import AuthenticationSettings, RequiredClaims  # noqa: E402
+from app.tests.test_auth import StaticKeyResolver, make_token  # noqa: E402
+
+_CALLER_ID = "33333333-3333-3333-3333-333333333333"
+
+
+def _auth_settings(threads: int) -> AuthenticationSettings:
+    return AuthenticationSettings(
+        enabled=True,
+        tenant_id="11111111-1111-1111-1111-111111111111",
+        client_id="22222222-2222-2222-2222-222222222222",
+        required_claims=RequiredClaims(idtyp=["app"], azp=[_CALLER_ID]),
+        token_cache_size=0,
+        token_verification_threads=threads,
+    )
+
+
+async def _run(auth: AuthenticationSettings, token: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    max_stall = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal max_stall
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_stall = max(max_stall, time.perf_counter() - before - 0.001)
+
+    async def one() -> None:
+        async with semaphore:
+            await auth_module.validate_token_async(token, auth)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker_task
+    return elapsed, max_stall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    resolver = StaticKeyResolver(private_key.public_key())
+
+    auth_module.set_signing_key_resolver_factory(lambda auth: resolver)
+    try:
+        for label, threads in (("inline", 0), (f"pool({args.threads})", args.threads)):
+            auth = _auth_settings(threads)
+            token = make_token(private_key, auth)
+            elapsed, max_stall = asyncio.run(
+                _run(auth, token, args.requests, args.concurrency)
+            )
+            auth_module.shutdown_token_verification_executor()
+            print(
+                f"{label:>9}: {args.requests / elapsed:8.0f} validations/s, "
+                f"worst event-loop stall {max_stall * 1e3:.1f} ms"
+            )
+    finally:
+        auth_module.reset_signing_key_resolver_factory()
+
+
+if __name__ == "__main__":
+    main()
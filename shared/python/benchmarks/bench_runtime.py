@@ -0,0 +1,189 @@
+"""Benchmark: per-request overhead of the runtime's middleware and response encoding.
+
+Six minimal apps answer ``POST /v1/process`` with the same response model (a
+physician-style payload of entities plus an adaptive card). Requests go
+straight into the ASGI app (no server, no HTTP client), so the numbers isolate
+framework overhead:
+
+* ``baseline``: ``@app.middleware("http")`` logging middleware and FastAPI's
+  ``response_model`` serialization (the samples before the shared runtime);
+* ``pure-asgi``: the runtime's :class:`RequestLoggingMiddleware` instead;
+* ``model-response``: the above plus :class:`ModelResponse` encoding;
+* ``admission``: the above plus admission control (uncontended);
+* ``profiling-idle``: ``model-response`` with profiling enabled but not
+  triggered (no ``x-debug-profile`` header, sample rate 0);
+* ``contracts``: ``model-response`` submitting every response for a contract
+  check against the physician spec (the check itself runs in the background).
+
+Run from ``shared/python``::
+
+    python3.12 benchmarks/bench_runtime.py --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+RUNTIME_ROOT = Path(__file__).resolve().parents[1]
+PHYSICIAN_SPEC = RUNTIME_ROOT.parents[1] / "physician" / "physician-extensibility-api.yaml"
+sys.path.insert(0, str(RUNTIME_ROOT))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from dragon_extension_runtime import (  # noqa: E402
+    ExtensionService,
+    ExtensionSettings,
+    ModelResponse,
+    RequestContext,
+    create_app,
+    post_in_process,
+)
+
+logger = logging.getLogger("dragon.runtime.bench")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+class Entity(BaseModel):
+    id: str
+    type: str
+    value: float | None = None
+    valueUnit: str | None = None
+    priority: str | None = None
+    code: dict[str, Any] | None = None
+
+
+class Output(BaseModel):
+    schema_version: str = "0.1"
+    document: dict[str, Any] | None = None
+    resources: list[Any] = []
+
+
+class Reply(BaseModel):
+    success: bool = True
+    message: str | None = None
+    payload: dict[str, Output] = {}
+
+
+def _reply() -> Reply:
+    entities = [
+        Entity(
+            id=f"00000000-0000-0000-0000-{i:012d}",
+            type="MedicalCode",
+            priority="Medium",
+            code={"identifier": "E11.9", "system": "ICD-10-CM", "description": "Type 2 diabetes"},
+        )
+        for i in range(20)
+    ]
+    card = {
+        "type": "AdaptiveCard",
+        "body": [{"type": "TextBlock", "text": f"Entity {i}", "wrap": True} for i in range(20)],
+    }
+    return Reply(
+        message="Payload processed successfully",
+        payload={
+            "sample-entities": Output(document={"title": "Note"}, resources=entities),
+            "adaptive-card": Output(document={"title": "Note"}, resources=[card]),
+        },
+    )
+
+
+class _Service(ExtensionService):
+    def __init__(self) -> None:
+        self.reply = _reply()
+
+    async def process_async(self, payload: Any, context: RequestContext | None = None) -> Reply:
+        return self.reply
+
+
+def _baseline_app() -> FastAPI:
+    service = _Service()
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def header_logging_middleware(request: Request, call_next):
+        logger.info("Incoming %s %s", request.method, request.url.path)
+        return await call_next(request)
+
+    @app.post("/v1/process", response_model=Reply)
+    async def process(payload: dict):
+        return await service.process_async(payload)
+
+    return app
+
+
+def _runtime_app(model_response: bool, admission: bool, **options: Any) -> FastAPI:
+    service = _Service()
+    settings = ExtensionSettings(
+        warmup_enabled=False, max_in_flight_requests=64 if admission else 0, **options
+    )
+    app = create_app(settings, service, title="bench", logger=logger)
+
+    if model_response:
+
+        @app.post("/v1/process", response_model=Reply)
+        async def process(payload: dict) -> ModelResponse:
+            response = ModelResponse(await service.process_async(payload), exclude_none=False)
+            if app.state.contracts is not None:
+                app.state.contracts.submit(response.body)
+            return response
+
+    else:
+
+        @app.post("/v1/process", response_model=Reply)
+        async def process(payload: dict):
+            return await service.process_async(payload)
+
+    return app
+
+
+async def _time(app: FastAPI, requests: int) -> float:
+    body = json.dumps({"note": {"resources": [{"content": "BP 120/80"}]}}).encode("utf-8")
+    for _ in range(50):
+        assert await post_in_process(app, "/v1/process", body) == 200
+    start = time.perf_counter()
+    for _ in range(requests):
+        await post_in_process(app, "/v1/process", body)
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    apps = {
+        "baseline": _baseline_app(),
+        "pure-asgi": _runtime_app(model_response=False, admission=False),
+        "model-response": _runtime_app(model_response=True, admission=False),
+        "admission": _runtime_app(model_response=True, admission=True),
+        "profiling-idle": _runtime_app(
+            model_response=True, admission=False, profiling_enabled=True, debug_token="bench"
+        ),
+        "contracts": _runtime_app(
+            model_response=True,
+            admission=False,
+            contract_spec_path=str(PHYSICIAN_SPEC),
+            contract_sample_rate=1.0,
+        ),
+    }
+    baseline = None
+    for name, app in apps.items():
+        per_request = asyncio.run(_time(app, args.requests))
+        baseline = baseline or per_request
+        print(
+            f"{name:>15}: {per_request * 1e6:8.1f} us/request "
+            f"({baseline / per_request:4.2f}x baseline)"
+        )
+
+
+if __name__ == "__main__":
+    main()
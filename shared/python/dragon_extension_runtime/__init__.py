@@ -0,0 +1,121 @@
+"""Shared runtime for the Python Dragon Copilot extension samples.
+
+The physician and radiology samples build their FastAPI apps with
+:func:`create_app` and implement :class:`ExtensionService`; everything else a
+sample needs (settings, logging, middleware, health probes, fast response
+encoding, metrics hooks, admission control, the engine registry, offline bulk
+processing, asynchronous jobs, the audit log, sampled contract checks,
+UTF-16 offsets, tracing, profiling, memory diagnostics, the pre-fork launcher)
+lives here, so it is optimized and benchmarked once.
+
+The optional subsystems are imported on first use of their names (see
+``__getattr__``), so importing the package does not pay for ``sqlite3``,
+``cProfile``, ``tracemalloc`` or ``multiprocessing``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .admission import AdmissionController
+from .app import HealthRoutes, create_app
+from .encoding import FastJSONResponse, ModelResponse, dumps, encode_model, loads
+from .engines import EngineRegistry, estimate_size, safe_path_segment
+from .logs import configure_logging
+from .metrics import MetricsHooks, RequestCounters
+from .middleware import AdmissionControlMiddleware, RequestLoggingMiddleware
+from .offsets import OffsetIndex
+from .service import ExtensionService, RequestContext
+from .settings import ExtensionSettings
+from .tracing import Tracer, current_span, inject, span
+from .warmup import post_in_process
+
+if TYPE_CHECKING:
+    from .audit import AuditLog, redact
+    from .bulk import BulkStats, run_bulk
+    from .contracts import ContractValidator
+    from .jobs import (
+        InMemoryJobStore,
+        Job,
+        JobManager,
+        JobStore,
+        SqliteJobStore,
+        respond_async_requested,
+    )
+    from .memory import MemoryDiagnostics
+    from .prefork import PreforkServer
+    from .profiling import Profiler
+
+# Exported name -> the module that defines it, imported on first access.
+_LAZY = {
+    "AuditLog": "audit",
+    "redact": "audit",
+    "BulkStats": "bulk",
+    "run_bulk": "bulk",
+    "ContractValidator": "contracts",
+    "InMemoryJobStore": "jobs",
+    "Job": "jobs",
+    "JobManager": "jobs",
+    "JobStore": "jobs",
+    "SqliteJobStore": "jobs",
+    "respond_async_requested": "jobs",
+    "MemoryDiagnostics": "memory",
+    "PreforkServer": "prefork",
+    "Profiler": "profiling",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__, not importlib.import_module: -X importtime only reports the former
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "AdmissionController",
+    "AuditLog",
+    "BulkStats",
+    "ContractValidator",
+    "EngineRegistry",
+    "ExtensionService",
+    "ExtensionSettings",
+    "FastJSONResponse",
+    "HealthRoutes",
+    "InMemoryJobStore",
+    "Job",
+    "JobManager",
+    "JobStore",
+    "MemoryDiagnostics",
+    "MetricsHooks",
+    "ModelResponse",
+    "OffsetIndex",
+    "PreforkServer",
+    "Profiler",
+    "RequestContext",
+    "RequestCounters",
+    "RequestLoggingMiddleware",
+    "SqliteJobStore",
+    "Tracer",
+    "configure_logging",
+    "create_app",
+    "current_span",
+    "dumps",
+    "encode_model",
+    "estimate_size",
+    "inject",
+    "loads",
+    "post_in_process",
+    "redact",
+    "respond_async_requested",
+    "run_bulk",
+    "safe_path_segment",
+    "span",
+]
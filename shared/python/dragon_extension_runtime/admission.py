@@ -0,0 +1,50 @@
+"""Admission control: bound concurrent work and the queue in front of it.
+
+Under overload an unbounded server accepts every request and then answers all
+of them late. :class:`AdmissionController` lets a fixed number of requests run
+at once, lets a bounded number wait (each for a bounded time) and rejects the
+rest immediately, so callers can retry elsewhere while admitted requests keep
+their latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, time-limited wait queue."""
+
+    def __init__(
+        self, max_in_flight: int, max_queued: int = 0, queue_timeout_seconds: float = 5
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if there is room; ``False`` if rejected."""
+
+        if self._slots.locked():
+            if self.waiting >= self.max_queued:
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout_seconds)
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
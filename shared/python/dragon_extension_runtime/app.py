@@ -0,0 +1,346 @@
+"""FastAPI app factory shared by the samples.
+
+:func:`create_app` builds the scaffolding every extension needs, so a sample
+only declares its ``/v1/process`` route:
+
+* a lifespan that runs startup hooks, preloads the service and runs warm-up
+  before the readiness probe turns healthy, then shuts everything down;
+* liveness and readiness probes (paths and payloads per sample, see
+  :class:`HealthRoutes`) and the ``/`` → ``/docs`` redirect;
+* startup-optimized mode (no OpenAPI schema, Swagger UI or redirect);
+* pure-ASGI request logging / metrics and, when configured, admission control
+  for the processing endpoints;
+* the asynchronous job mode (:mod:`~dragon_extension_runtime.jobs`): a
+  :class:`~dragon_extension_runtime.jobs.JobManager` at ``app.state.jobs``
+  and ``GET /v1/jobs/{job_id}``;
+* when ``audit_enabled``, the batched audit log
+  (:class:`~dragon_extension_runtime.audit.AuditLog`) at ``app.state.audit``;
+* when ``contract_spec_path`` is set, sampled checks of responses against
+  the OpenAPI spec (:class:`~dragon_extension_runtime.contracts.ContractValidator`)
+  at ``app.state.contracts``;
+* when ``tracing_exporter`` is set, a span per request
+  (:class:`~dragon_extension_runtime.tracing.TracingMiddleware`) with
+  ``traceparent`` propagation;
+* when ``profiling_enabled``, on-demand request profiling
+  (:mod:`~dragon_extension_runtime.profiling`), and, when ``debug_token`` is
+  set, the guarded ``/debug`` routes (:mod:`~dragon_extension_runtime.debug`)
+  with memory diagnostics at ``app.state.memory``;
+* optionally open CORS for local testing.
+
+The optional subsystems (jobs, audit, contracts, tracing exporters,
+profiling, memory diagnostics and the ``/debug`` routes) are imported only
+when their setting enables them, so they, and the standard library modules
+they need (``sqlite3``, ``cProfile``, ``tracemalloc``...), stay off the cold
+start of an app that does not use them.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Sequence
+
+from fastapi import FastAPI
+from fastapi.responses import RedirectResponse, Response
+
+from .admission import AdmissionController
+from .encoding import FastJSONResponse
+from .metrics import MetricsHooks
+from .middleware import AdmissionControlMiddleware, RequestLoggingMiddleware
+from .service import ExtensionService
+from .settings import ExtensionSettings
+
+if TYPE_CHECKING:
+    from .audit import AuditLog
+    from .contracts import ContractValidator
+    from .jobs import JobManager
+    from .memory import MemoryDiagnostics
+    from .profiling import Profiler
+    from .tracing import Tracer
+
+Hook = Callable[[], Any]
+
+
+@dataclass(frozen=True)
+class HealthRoutes:
+    """Paths and bodies of the health probes."""
+
+    liveness_path: str = "/health/liveness"
+    readiness_path: str = "/health/readiness"
+    healthy: Callable[[], dict[str, Any]] = field(default=lambda: {"status": "Healthy"})
+    unhealthy: Callable[[], dict[str, Any]] = field(default=lambda: {"status": "Unhealthy"})
+
+
+async def _run_hook(hook: Hook) -> None:
+    result = hook()
+    if inspect.isawaitable(result):
+        await result
+
+
+def create_app(
+    settings: ExtensionSettings,
+    service: ExtensionService,
+    *,
+    title: str,
+    logger: logging.Logger,
+    description: str = "",
+    warm_up: Callable[[FastAPI], Awaitable[None]] | None = None,
+    on_startup: Iterable[Hook] = (),
+    on_shutdown: Iterable[Hook] = (),
+    health: HealthRoutes = HealthRoutes(),
+    cors: bool = False,
+    metrics: MetricsHooks | None = None,
+    admission_paths: Iterable[str] = ("/v1/process",),
+    dependencies: Sequence[Any] = (),
+) -> FastAPI:
+    """Create the FastAPI app for ``service``.
+
+    ``on_startup`` / ``on_shutdown`` hooks may be sync or async. ``warm_up``
+    runs after :meth:`ExtensionService.preload` when
+    ``settings.warmup_enabled``; a failing warm-up is logged and does not
+    block startup. ``dependencies`` (e.g. the sample's authentication) guard
+    the routes added here that expose processing results or diagnostics
+    (``/v1/jobs`` and ``/debug``).
+    """
+
+    on_startup = tuple(on_startup)
+    on_shutdown = tuple(on_shutdown)
+    metrics = metrics or MetricsHooks()
+    jobs = _job_manager(settings)
+    audit = _audit_log(settings)
+    contracts = _contract_validator(settings)
+    tracer = _tracer(settings)
+    admission_paths = tuple(admission_paths)
+    profiler = _profiler(settings)
+    memory = _memory_diagnostics(settings, service)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.ready = False
+        if audit is not None:
+            audit.start()
+        if contracts is not None:
+            contracts.start()
+        if jobs is not None:
+            await jobs.start()
+        for hook in on_startup:
+            await _run_hook(hook)
+        if settings.warmup_enabled:
+            try:
+                service.preload()
+                if warm_up is not None:
+                    await warm_up(app)
+            except Exception:  # noqa: BLE001 - a failed warm-up must not block startup
+                logger.exception("Warm-up failed; continuing startup.")
+        app.state.ready = True
+        try:
+            yield
+        finally:
+            for hook in on_shutdown:
+                await _run_hook(hook)
+            if jobs is not None:
+                await jobs.stop()
+            if audit is not None:
+                await audit.stop()
+            if contracts is not None:
+                await contracts.stop()
+            service.close()
+            if memory is not None:
+                memory.close()
+            if tracer is not None:
+                tracer.shutdown()
+
+    app = FastAPI(
+        title=title,
+        version=settings.version,
+        description=description,
+        lifespan=lifespan,
+        openapi_url=None if settings.startup_optimized else "/openapi.json",
+    )
+    app.state.ready = False
+    app.state.service = service
+    app.state.metrics = metrics
+    app.state.jobs = jobs
+    app.state.audit = audit
+    app.state.contracts = contracts
+    app.state.tracer = tracer
+    app.state.profiler = profiler
+    app.state.memory = memory
+
+    # Middleware added last runs first: logging sees rejected requests too, and
+    # only admitted requests are profiled.
+    if profiler is not None:
+        from .profiling import ProfilingMiddleware
+
+        app.add_middleware(ProfilingMiddleware, profiler=profiler, paths=admission_paths)
+    if settings.max_in_flight_requests:
+        app.state.admission = AdmissionController(
+            settings.max_in_flight_requests,
+            settings.max_queued_requests,
+            settings.queue_timeout_seconds,
+        )
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            controller=app.state.admission,
+            paths=admission_paths,
+            metrics=metrics,
+        )
+    app.add_middleware(RequestLoggingMiddleware, logger=logger, metrics=metrics)
+    if tracer is not None:
+        from .tracing import TracingMiddleware
+
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+    if cors:
+        from fastapi.middleware.cors import CORSMiddleware
+
+        # CORS is fully open here for easy local testing.
+        # WARNING: restrict allowed origins, methods, and headers for production.
+        app.add_middleware(
+            CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]
+        )
+
+    if not settings.startup_optimized:
+
+        @app.get("/", include_in_schema=False)
+        async def root_redirect() -> RedirectResponse:
+            """Redirect the root to the bundled Swagger UI (mirrors the C# samples)."""
+
+            return RedirectResponse(url="/docs")
+
+    @app.get(health.liveness_path, tags=["health"])
+    async def liveness() -> FastJSONResponse:
+        """Liveness probe."""
+
+        return FastJSONResponse(health.healthy())
+
+    @app.get(health.readiness_path, tags=["health"])
+    async def readiness() -> FastJSONResponse:
+        """Readiness probe. Healthy once warm-up has finished and the service is ready."""
+
+        if app.state.ready and service.is_ready():
+            return FastJSONResponse(health.healthy())
+        return FastJSONResponse(health.unhealthy(), status_code=503)
+
+    if jobs is not None:
+        from .jobs import JOBS_PATH
+
+        @app.get(JOBS_PATH + "/{job_id}", tags=["jobs"], dependencies=list(dependencies))
+        async def job_status(job_id: str) -> Response:
+            """Status of an asynchronous job, with its result once it has finished."""
+
+            job = await jobs.get(job_id)
+            if job is None:
+                return FastJSONResponse(
+                    {"success": False, "error": "Job not found or expired"}, status_code=404
+                )
+            return Response(job.document(), media_type="application/json")
+
+    if settings.debug_token:
+        from .debug import debug_router
+
+        app.include_router(
+            debug_router(
+                settings.debug_token,
+                profiler=profiler,
+                memory=memory,
+                contracts=contracts,
+                dependencies=dependencies,
+            )
+        )
+
+    return app
+
+
+def _job_manager(settings: ExtensionSettings) -> JobManager | None:
+    if not settings.job_workers:
+        return None
+    from .jobs import InMemoryJobStore, JobManager, JobStore, SqliteJobStore
+
+    store: JobStore = (
+        SqliteJobStore(settings.job_store_path)
+        if settings.job_store == "sqlite"
+        else InMemoryJobStore()
+    )
+    return JobManager(
+        store,
+        workers=settings.job_workers,
+        queue_size=settings.job_queue_size,
+        ttl_seconds=settings.job_ttl_seconds,
+        callback_hosts=settings.job_callback_hosts,
+        callback_timeout_seconds=settings.job_callback_timeout_seconds,
+    )
+
+
+def _audit_log(settings: ExtensionSettings) -> AuditLog | None:
+    if not settings.audit_enabled:
+        return None
+    from .audit import AuditLog
+
+    return AuditLog(
+        settings.audit_dir,
+        batch_size=settings.audit_batch_size,
+        flush_interval_seconds=settings.audit_flush_interval_seconds,
+        max_buffered_records=settings.audit_max_buffered_records,
+        max_file_bytes=settings.audit_max_file_mb * 1024 * 1024,
+        max_files=settings.audit_max_files,
+        include_outputs=settings.audit_include_outputs,
+        redact_fields=settings.audit_redact_fields,
+    )
+
+
+def _contract_validator(settings: ExtensionSettings) -> ContractValidator | None:
+    if not settings.contract_spec_path:
+        return None
+    from .contracts import ContractValidator
+
+    return ContractValidator(
+        settings.contract_spec_path,
+        schema=settings.contract_schema,
+        sample_rate=settings.contract_sample_rate,
+        max_buffered=settings.contract_max_buffered,
+    )
+
+
+def _tracer(settings: ExtensionSettings) -> Tracer | None:
+    if settings.tracing_exporter == "none":
+        return None
+    from .tracing import (
+        BatchSpanProcessor,
+        FileSpanExporter,
+        OtlpHttpSpanExporter,
+        SpanExporter,
+        Tracer,
+    )
+
+    exporter: SpanExporter = (
+        FileSpanExporter(settings.tracing_file_path)
+        if settings.tracing_exporter == "file"
+        else OtlpHttpSpanExporter(settings.tracing_otlp_endpoint)
+    )
+    processor = BatchSpanProcessor(exporter, settings.tracing_service_name or settings.app_name)
+    return Tracer(processor, settings.tracing_sample_ratio)
+
+
+def _profiler(settings: ExtensionSettings) -> Profiler | None:
+    if not settings.profiling_enabled:
+        return None
+    from .profiling import Profiler
+
+    return Profiler(
+        settings.profiling_dir,
+        sample_rate=settings.profiling_sample_rate,
+        max_profiles=settings.profiling_max_profiles,
+        debug_token=settings.debug_token,
+    )
+
+
+def _memory_diagnostics(
+    settings: ExtensionSettings, service: ExtensionService
+) -> MemoryDiagnostics | None:
+    if not settings.debug_token:
+        return None
+    from .memory import MemoryDiagnostics
+
+    return MemoryDiagnostics(service.cache_sizes)
@@ -0,0 +1,246 @@
+"""Audit log of processed requests: buffered, batched, gzip-compressed NDJSON.
+
+A request handler calls :meth:`AuditLog.record_exchange` (or
+:meth:`AuditLog.record`). That only appends to an in-memory buffer, so the
+request never waits on disk. A background task flushes the buffer when it
+holds ``batch_size`` records or every ``flush_interval_seconds``. Each flush
+encodes, redacts and compresses the whole batch on a worker thread, then appends
+it to the current file as one gzip member:
+
+* files are named ``audit-<UTC timestamp>-<pid>.ndjson.gz`` and hold one
+  JSON object per line. ``gzip.open`` / ``zcat`` read a file's members as one
+  stream;
+* a file is rotated once it reaches ``max_file_bytes`` (compressed), and each
+  process keeps only its newest ``max_files``, so pre-forked workers sharing
+  a directory never delete each other's files;
+* the buffer holds at most ``max_buffered_records``. If the disk falls behind,
+  further records are dropped and counted, rather than growing memory or
+  slowing requests down. The drop count is logged and written with the next
+  batch. A record that cannot be encoded as JSON is dropped and counted in
+  that line too.
+
+Records hold metadata (IDs, sizes, entity counts, timings). Outputs are added
+only with ``include_outputs``, after the values of keys in ``redact_fields``
+have been replaced.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from pydantic import BaseModel
+
+from .encoding import dumps
+from .service import RequestContext
+
+logger = logging.getLogger("dragon.extension.runtime")
+
+REDACTED = "[REDACTED]"
+
+
+def redact(data: Any, fields: frozenset[str]) -> Any:
+    """Copy of ``data`` with every value under a key in ``fields`` replaced."""
+
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in fields and value is not None else redact(value, fields)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(item, fields) for item in data]
+    return data
+
+
+class _Output(NamedTuple):
+    model: BaseModel
+    exclude_none: bool
+
+
+class AuditLog:
+    """Buffers audit records in memory and writes them in batches from a background task."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 1.0,
+        max_buffered_records: int = 10_000,
+        max_file_bytes: int = 64 * 1024 * 1024,
+        max_files: int = 20,
+        include_outputs: bool = False,
+        redact_fields: Iterable[str] = (),
+        compress_level: int = 6,
+    ) -> None:
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffered_records = max_buffered_records
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.include_outputs = include_outputs
+        self.redact_fields = frozenset(redact_fields)
+        self.compress_level = compress_level
+        self.dropped = 0
+        self.written = 0
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._dropped_unreported = 0
+        self._file: Path | None = None
+        # A write cancelled by stop() still finishes on its thread; serialize
+        # it with the final flush so gzip members never interleave.
+        self._write_lock = threading.Lock()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def record(self, entry: dict[str, Any]) -> bool:
+        """Buffer ``entry``; ``False`` if it was dropped because the buffer is full.
+
+        ``entry`` is encoded later, on the writer thread, and must not be
+        changed afterwards.
+        """
+
+        if len(self._buffer) >= self.max_buffered_records:
+            self.dropped += 1
+            self._dropped_unreported += 1
+            return False
+        self._buffer.append(entry)
+        if self._wakeup is not None and len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def record_exchange(
+        self,
+        context: RequestContext | None,
+        *,
+        status: int = 200,
+        request_bytes: int | None = None,
+        response_bytes: int | None = None,
+        seconds: float | None = None,
+        counts: Mapping[str, int] | None = None,
+        output: BaseModel | None = None,
+        exclude_none: bool = True,
+    ) -> bool:
+        """Buffer the record of one processed request (see :meth:`record`).
+
+        ``output`` is kept only with ``include_outputs``; it is serialized and
+        redacted on the writer thread, not here.
+        """
+
+        entry: dict[str, Any] = {
+            "timestamp": time.time(),
+            "requestId": context.request_id if context else None,
+            "correlationId": context.correlation_id if context else None,
+            "status": status,
+            "requestBytes": request_bytes,
+            "responseBytes": response_bytes,
+            "durationMs": round(seconds * 1000, 3) if seconds is not None else None,
+        }
+        if counts:
+            entry["counts"] = dict(counts)
+        if output is not None and self.include_outputs:
+            entry["output"] = _Output(output, exclude_none)
+        return self.record(entry)
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop (from the app's lifespan)."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the writer and flush whatever is still buffered."""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wakeup = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write the buffered records now; return how many were written."""
+
+        written = 0
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            dropped, self._dropped_unreported = self._dropped_unreported, 0
+            if dropped:
+                logger.warning("Audit buffer full: dropped %s records.", dropped)
+            try:
+                await asyncio.to_thread(self._write, batch, dropped)
+            except Exception:  # noqa: BLE001 - the batch is lost, later ones are not
+                logger.exception("Failed to write %s audit records.", len(batch))
+                continue
+            written += len(batch)
+        self.written += written
+        return written
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:  # noqa: BLE001 - a writer bug must not stop auditing
+                logger.exception("Audit flush failed.")
+
+    def _encode(self, entry: dict[str, Any]) -> bytes:
+        output = entry.get("output")
+        if isinstance(output, _Output):
+            data = output.model.model_dump(
+                mode="json", by_alias=True, exclude_none=output.exclude_none
+            )
+            entry = {**entry, "output": redact(data, self.redact_fields)}
+        return dumps(entry)
+
+    def _write(self, batch: list[dict[str, Any]], dropped: int) -> None:
+        lines = []
+        for entry in batch:
+            try:
+                lines.append(self._encode(entry))
+            except (TypeError, ValueError):
+                # One record with a value JSON cannot hold must not cost the batch.
+                logger.warning("Dropped an audit record that cannot be encoded.", exc_info=True)
+                dropped += 1
+        if dropped:
+            lines.append(dumps({"timestamp": time.time(), "droppedRecords": dropped}))
+        member = gzip.compress(b"\n".join(lines) + b"\n", self.compress_level)
+        with self._write_lock:
+            path = self._current_file(len(member))
+            with path.open("ab") as stream:
+                stream.write(member)
+
+    def _current_file(self, incoming: int) -> Path:
+        if self._file is not None:
+            try:
+                size = self._file.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size == 0 or size + incoming <= self.max_file_bytes:
+                return self._file
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        # The pid keeps pre-forked workers sharing a directory out of each other's files.
+        self._file = self.directory / f"audit-{stamp}-{os.getpid()}.ndjson.gz"
+        self._prune()
+        return self._file
+
+    def _prune(self) -> None:
+        # The new file does not exist yet, so keep max_files - 1 old ones. Only
+        # this process's files: a sibling worker's current file is not ours.
+        files = sorted(self.directory.glob(f"audit-*-{os.getpid()}.ndjson.gz"))
+        for old in files[: max(len(files) - self.max_files + 1, 0)]:
+            old.unlink(missing_ok=True)
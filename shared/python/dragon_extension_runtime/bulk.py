@@ -0,0 +1,375 @@
+"""Offline bulk processing: NDJSON in, NDJSON out, no HTTP layer.
+
+Backfills and analytics runs push millions of stored notes or reports through
+an :class:`~dragon_extension_runtime.ExtensionService`. :func:`run_bulk`:
+
+* streams JSON lines from files or stdin (blank lines are skipped) and never
+  holds more than a bounded number of batches in memory;
+* dispatches batches of ``chunk_size`` records to a pool of worker processes.
+  Each worker builds its own service once (``service_factory``), validates
+  each record with ``payload_model``, and serializes the response itself, so
+  the parent only moves bytes;
+* writes one output line per record, ``{"record": n, "response": {...}}`` or
+  ``{"record": n, "error": "..."}``, where ``n`` is the 1-based record number
+  across all inputs. Output is in input order by default; ``ordered=False``
+  writes each batch as soon as it finishes;
+* reports progress and throughput, and checkpoints the number of leading
+  records that are fully written together with the output's length once they
+  were flushed. A rerun with the same checkpoint truncates the output to that
+  length, which drops lines written after the checkpoint (including a torn
+  last line from a crash), skips the checkpointed records and appends. In
+  unordered mode the saved length can include records past the watermark,
+  and those are written again on resume; deduplicate on ``record``.
+
+Each sample exposes this as ``python -m app.bulk`` (see :func:`main`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Sequence, TextIO
+
+from pydantic import BaseModel
+
+from .encoding import dumps, encode_model
+from .logs import configure_logging
+from .service import ExtensionService, RequestContext
+
+ServiceFactory = Callable[[], ExtensionService]
+Batch = list[tuple[int, bytes]]
+BatchResult = tuple[int, int, list[bytes], int]
+
+STDIO = "-"
+
+
+@dataclass
+class BulkStats:
+    """Counters for one bulk run."""
+
+    records: int = 0
+    errors: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+class _Worker:
+    """Per-process service and event loop; processes one batch at a time."""
+
+    def __init__(
+        self, service_factory: ServiceFactory, payload_model: type[BaseModel], exclude_none: bool
+    ) -> None:
+        self.service = service_factory()
+        self.service.preload()
+        self.payload_model = payload_model
+        self.exclude_none = exclude_none
+        self.loop = asyncio.new_event_loop()
+
+    def process(self, batch: Batch) -> BatchResult:
+        lines: list[bytes] = []
+        errors = 0
+        for record, raw in batch:
+            try:
+                payload = self.payload_model.model_validate_json(raw)
+                response = self.loop.run_until_complete(
+                    self.service.process_async(payload, RequestContext(request_id=f"bulk-{record}"))
+                )
+                body = encode_model(response, exclude_none=self.exclude_none)
+                lines.append(b'{"record":%d,"response":%s}' % (record, body))
+            except Exception as exc:  # noqa: BLE001 - reported per record
+                errors += 1
+                lines.append(dumps({"record": record, "error": f"{type(exc).__name__}: {exc}"}))
+        return batch[0][0], batch[-1][0], lines, errors
+
+    def close(self) -> None:
+        self.service.close()
+        self.loop.close()
+
+
+_worker: _Worker | None = None
+
+
+def _init_worker(
+    service_factory: ServiceFactory,
+    payload_model: type[BaseModel],
+    exclude_none: bool,
+    log_level: int,
+) -> None:
+    global _worker
+    configure_logging(log_level)
+    _worker = _Worker(service_factory, payload_model, exclude_none)
+
+
+def _process_batch(batch: Batch) -> BatchResult:
+    assert _worker is not None, "worker not initialized"
+    return _worker.process(batch)
+
+
+def iter_records(inputs: Sequence[str]) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(record_number, line)`` for each non-blank line of ``inputs``."""
+
+    record = 0
+    for name in inputs:
+        stream = sys.stdin.buffer if name == STDIO else open(name, "rb")
+        try:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    record += 1
+                    yield record, line
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+
+def _batched(records: Iterable[tuple[int, bytes]], size: int) -> Iterator[Batch]:
+    batch: Batch = []
+    for item in records:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _ordered(
+    executor: ProcessPoolExecutor, batches: Iterable[Batch], max_pending: int
+) -> Iterator[BatchResult]:
+    pending: deque[Future[BatchResult]] = deque()
+    for batch in batches:
+        pending.append(executor.submit(_process_batch, batch))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _unordered(
+    executor: ProcessPoolExecutor, batches: Iterable[Batch], max_pending: int
+) -> Iterator[BatchResult]:
+    pending: set[Future[BatchResult]] = set()
+    for batch in batches:
+        pending.add(executor.submit(_process_batch, batch))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+class _Checkpoint:
+    """Watermark of fully written leading records and output length, persisted atomically."""
+
+    def __init__(self, path: Path | None, inputs: Sequence[str]) -> None:
+        self.path = path
+        self.inputs = list(inputs)
+        self.completed = 0
+        self.offset: int | None = None
+        self._finished: dict[int, int] = {}
+        if path is not None and path.exists():
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state.get("inputs") != self.inputs:
+                raise ValueError(
+                    f"Checkpoint {path} was written for inputs {state.get('inputs')}, "
+                    f"not {self.inputs}."
+                )
+            self.completed = int(state["completed"])
+            if state.get("offset") is not None:
+                self.offset = int(state["offset"])
+
+    def finished(self, first: int, last: int) -> None:
+        self._finished[first] = last
+        while self.completed + 1 in self._finished:
+            self.completed = self._finished.pop(self.completed + 1)
+
+    def save(self, offset: int) -> None:
+        if self.path is None:
+            return
+        self.offset = offset
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(
+            json.dumps({"inputs": self.inputs, "completed": self.completed, "offset": offset}),
+            encoding="utf-8",
+        )
+        os.replace(temporary, self.path)
+
+
+def run_bulk(
+    inputs: Sequence[str],
+    output: BinaryIO,
+    service_factory: ServiceFactory,
+    payload_model: type[BaseModel],
+    *,
+    workers: int = 0,
+    chunk_size: int = 64,
+    ordered: bool = True,
+    checkpoint: Path | None = None,
+    progress: TextIO | None = None,
+    progress_interval: float = 5.0,
+    exclude_none: bool = True,
+    log_level: int = logging.WARNING,
+) -> BulkStats:
+    """Process every record of ``inputs`` and write NDJSON results to ``output``.
+
+    ``workers=0`` processes records in this process (useful for debugging);
+    otherwise a pool of that many worker processes is used. ``service_factory``
+    and ``payload_model`` must be importable module-level objects so they can
+    be sent to the workers.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    state = _Checkpoint(checkpoint, inputs)
+    position = _resume_output(output, state.offset)
+    stats = BulkStats(skipped=state.completed)
+    records = (item for item in iter_records(inputs) if item[0] > state.completed)
+    batches = _batched(records, chunk_size)
+
+    started = last_report = time.perf_counter()
+    executor: ProcessPoolExecutor | None = None
+    inline: _Worker | None = None
+    if workers:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(service_factory, payload_model, exclude_none, log_level),
+        )
+        dispatch = _ordered if ordered else _unordered
+        results = dispatch(executor, batches, max_pending=workers * 2)
+    else:
+        inline = _Worker(service_factory, payload_model, exclude_none)
+        results = (inline.process(batch) for batch in batches)
+
+    try:
+        for first, last, lines, errors in results:
+            position += output.write(b"\n".join(lines) + b"\n")
+            stats.records += len(lines)
+            stats.errors += errors
+            state.finished(first, last)
+            now = time.perf_counter()
+            if now - last_report >= progress_interval:
+                last_report = now
+                output.flush()
+                state.save(position)
+                stats.seconds = now - started
+                _report(progress, stats)
+    finally:
+        output.flush()
+        state.save(position)
+        stats.seconds = time.perf_counter() - started
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if inline is not None:
+            inline.close()
+    _report(progress, stats, final=True)
+    return stats
+
+
+def _resume_output(output: BinaryIO, offset: int | None) -> int:
+    """Cut ``output`` back to the checkpointed length; return where writing continues."""
+
+    if not output.seekable():
+        return offset or 0
+    if offset is None:
+        return output.tell()
+    end = output.seek(0, os.SEEK_END)
+    if end > offset:
+        # Lines written after the last checkpoint (one torn by a crash, too)
+        # are produced again by the records the checkpoint does not cover.
+        output.truncate(offset)
+        end = output.seek(offset)
+    return end
+
+
+def _report(progress: TextIO | None, stats: BulkStats, final: bool = False) -> None:
+    if progress is None:
+        return
+    prefix = "Done:" if final else "Progress:"
+    skipped = f", {stats.skipped} skipped from checkpoint" if stats.skipped else ""
+    progress.write(
+        f"{prefix} {stats.records} records ({stats.errors} errors{skipped}) in "
+        f"{stats.seconds:.1f} s, {stats.records_per_second:.0f} records/s\n"
+    )
+    progress.flush()
+
+
+def main(
+    argv: Sequence[str] | None,
+    *,
+    service_factory: ServiceFactory,
+    payload_model: type[BaseModel],
+    description: str,
+    exclude_none: bool = True,
+) -> int:
+    """Command-line front end for :func:`run_bulk`; returns the exit status."""
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "inputs", nargs="*", default=[STDIO], help="NDJSON input files ('-' or none: stdin)"
+    )
+    parser.add_argument("-o", "--output", default=STDIO, help="NDJSON output file (default stdout)")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: one per core; 0 processes inline)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=64, help="records per dispatched batch")
+    parser.add_argument(
+        "--unordered", action="store_true", help="write results as batches finish"
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, help="resume from / record progress in this file"
+    )
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="seconds")
+    parser.add_argument("--quiet", action="store_true", help="no progress on stderr")
+    parser.add_argument("--log-level", default="WARNING", help="service log level")
+    args = parser.parse_args(argv)
+
+    log_level = logging.getLevelName(args.log_level.upper())
+    configure_logging(log_level)
+    resuming = args.checkpoint is not None and args.checkpoint.exists()
+    output = (
+        sys.stdout.buffer if args.output == STDIO else open(args.output, "ab" if resuming else "wb")
+    )
+    try:
+        stats = run_bulk(
+            args.inputs,
+            output,
+            service_factory,
+            payload_model,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=not args.unordered,
+            checkpoint=args.checkpoint,
+            progress=None if args.quiet else sys.stderr,
+            progress_interval=args.progress_interval,
+            exclude_none=exclude_none,
+            log_level=log_level,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+    return 1 if stats.errors else 0
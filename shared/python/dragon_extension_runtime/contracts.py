@@ -0,0 +1,434 @@
+"""Sampled checks of live responses against the OpenAPI spec.
+
+:class:`ContractValidator` loads an OpenAPI document (the repository's
+``physician-extensibility-api.yaml`` or ``radiologists-extensibility-api.yaml``)
+once, at startup, and compiles every schema under ``components/schemas`` into
+a tree of plain Python closures: ``$ref`` targets are resolved once, property
+tables, ``required`` lists and enums become dicts and frozensets, and nothing
+walks the spec again per document. A check appends the *rule* it broke, the
+named schema, the path below it and the keyword, for example
+``VisualizationResource.references[].type: enum``.
+
+A route hands the encoded response body to :meth:`ContractValidator.submit`.
+That costs a random draw (``sample_rate``) and, for a sampled response, an
+append to a bounded buffer: the body is not copied, decoded or walked on the
+request path. A background task decodes and checks the buffered bodies in
+batches on a worker thread and counts violations per rule; a rule seen for the
+first time is logged. When the checker falls behind, further samples are
+dropped and counted. :meth:`ContractValidator.report` (``GET /debug/contracts``)
+returns the counts.
+
+The compiled validators cover the OpenAPI 3.0 keywords the specs use:
+``type`` (with ``nullable``), ``enum``, ``required``, ``properties``,
+``additionalProperties``, ``items``, ``minItems`` / ``maxItems``,
+``minimum`` / ``maximum``, ``minLength`` / ``maxLength``, ``pattern``,
+``allOf``, ``anyOf`` and ``oneOf``. ``format`` and references to external
+documents (such as the Adaptive Card schema) are not checked. ``oneOf`` is
+checked like ``anyOf``, because the specs' branches overlap. A branch of
+``anyOf`` / ``oneOf`` is picked by the object's ``type`` when it equals the
+branch's schema name or one of the branch's ``type`` enum values (the implicit
+OpenAPI discriminator); otherwise the value must satisfy any branch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import re
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from .encoding import loads
+
+logger = logging.getLogger("dragon.extension.runtime")
+
+Check = Callable[[Any, list], None]
+"""A compiled schema: ``check(value, violations)`` appends the rules ``value`` breaks."""
+
+_SCHEMA_REF = "#/components/schemas/"
+
+_TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: type(v) is dict,
+    "array": lambda v: type(v) is list,
+    "string": lambda v: type(v) is str,
+    "integer": lambda v: type(v) is int or (type(v) is float and v.is_integer()),
+    "number": lambda v: type(v) in (int, float),
+    "boolean": lambda v: type(v) is bool,
+}
+
+
+def load_spec(path: str | os.PathLike[str]) -> dict[str, Any]:
+    """Read an OpenAPI document (YAML or JSON)."""
+
+    import yaml  # only needed at startup
+
+    spec = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(spec, dict):
+        raise ValueError(f"{path}: not an OpenAPI document")
+    return spec
+
+
+def compile_schemas(spec: Mapping[str, Any]) -> dict[str, Check]:
+    """Compile every schema under ``components/schemas`` of ``spec``."""
+
+    compiler = _Compiler((spec.get("components") or {}).get("schemas") or {})
+    return {name: compiler.named(name) for name in compiler.schemas}
+
+
+class _Compiler:
+    def __init__(self, schemas: Mapping[str, Any]) -> None:
+        self.schemas = schemas
+        self._named: dict[str, Check] = {}
+
+    def named(self, name: str) -> Check:
+        check = self._named.get(name)
+        if check is None:
+            if name not in self.schemas:
+                raise ValueError(f"Unknown schema {name!r}")
+            # Recursive schemas reach themselves through this cell while compiling.
+            cell: list[Check] = []
+            self._named[name] = lambda value, out: cell[0](value, out)
+            cell.append(self.compile(self.schemas[name], name) or _accept)
+            check = self._named[name] = cell[0]
+        return check
+
+    def resolve(self, schema: Mapping[str, Any]) -> tuple[str | None, Mapping[str, Any]]:
+        ref = schema.get("$ref")
+        if isinstance(ref, str) and ref.startswith(_SCHEMA_REF):
+            name = ref[len(_SCHEMA_REF):]
+            return name, self.resolve(self.schemas.get(name) or {})[1]
+        return None, schema
+
+    def compile(self, schema: Any, where: str) -> Check | None:
+        # None: the schema accepts anything, so there is nothing to call
+        if not isinstance(schema, Mapping):
+            return None
+        ref = schema.get("$ref")
+        if ref is not None:
+            if isinstance(ref, str) and ref.startswith(_SCHEMA_REF):
+                return self.named(ref[len(_SCHEMA_REF):])
+            return None  # external document (e.g. the Adaptive Card schema): not checked
+
+        checks: list[Check] = []
+        kind = schema.get("type")
+        if kind in _TYPES:
+            checks.append(_type_check(kind, bool(schema.get("nullable")), where))
+        if "enum" in schema:
+            checks.append(_enum_check(schema["enum"], where))
+        if kind == "object" or "properties" in schema or "required" in schema:
+            checks.append(self._object(schema, where))
+        if kind == "array" or "items" in schema:
+            checks.append(self._array(schema, where))
+        bounds = _bounds_check(schema, where)
+        if bounds is not None:
+            checks.append(bounds)
+        for part in schema.get("allOf") or ():
+            check = self.compile(part, where)
+            if check is not None:
+                checks.append(check)
+        for keyword in ("anyOf", "oneOf"):
+            if schema.get(keyword):
+                checks.append(self._any(schema[keyword], where, keyword))
+
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        if kind in _TYPES:
+            # Later keywords assume the type: stop at a type violation.
+            first, rest = checks[0], tuple(checks[1:])
+
+            def check_all(value: Any, out: list) -> None:
+                before = len(out)
+                first(value, out)
+                if len(out) == before and value is not None:
+                    for check in rest:
+                        check(value, out)
+
+            return check_all
+        parts = tuple(checks)
+
+        def check_each(value: Any, out: list) -> None:
+            for check in parts:
+                check(value, out)
+
+        return check_each
+
+    def _object(self, schema: Mapping[str, Any], where: str) -> Check:
+        properties = {
+            name: check
+            for name, check in (
+                (name, self.compile(sub, f"{where}.{name}"))
+                for name, sub in (schema.get("properties") or {}).items()
+            )
+            if check is not None
+        }
+        declared = frozenset(schema.get("properties") or ())
+        required = tuple((name, f"{where}.{name}: required") for name in schema.get("required") or ())
+        extra = schema.get("additionalProperties", True)
+        closed = extra is False
+        extra_check = self.compile(extra, f"{where}.*") if isinstance(extra, Mapping) else None
+        closed_rule = f"{where}: additionalProperties"
+
+        def check_object(value: Any, out: list) -> None:
+            if type(value) is not dict:
+                return
+            for name, rule in required:
+                if name not in value:
+                    out.append(rule)
+            for name, item in value.items():
+                check = properties.get(name)
+                if check is not None:
+                    check(item, out)
+                elif name not in declared:
+                    if closed:
+                        out.append(closed_rule)
+                    elif extra_check is not None:
+                        extra_check(item, out)
+
+        return check_object
+
+    def _array(self, schema: Mapping[str, Any], where: str) -> Check:
+        item_check = self.compile(schema.get("items"), f"{where}[]")
+        low, high = schema.get("minItems"), schema.get("maxItems")
+        low_rule, high_rule = f"{where}: minItems", f"{where}: maxItems"
+
+        def check_array(value: Any, out: list) -> None:
+            if type(value) is not list:
+                return
+            if low is not None and len(value) < low:
+                out.append(low_rule)
+            if high is not None and len(value) > high:
+                out.append(high_rule)
+            if item_check is not None:
+                for item in value:
+                    item_check(item, out)
+
+        return check_array
+
+    def _any(self, branches: Iterable[Any], where: str, keyword: str) -> Check:
+        compiled: list[Check] = []
+        by_type: dict[Any, Check] = {}
+        for branch in branches:
+            name, resolved = self.resolve(branch) if isinstance(branch, Mapping) else (None, {})
+            check = self.compile(branch, where) or _accept
+            compiled.append(check)
+            type_schema = (resolved.get("properties") or {}).get("type") or {}
+            for value in [name, *(type_schema.get("enum") or ())]:
+                if value is not None:
+                    by_type.setdefault(value, check)
+        options = tuple(compiled)
+        rule = f"{where}: {keyword}"
+
+        def check_any(value: Any, out: list) -> None:
+            if type(value) is dict:
+                chosen = by_type.get(value.get("type"))
+                if chosen is not None:
+                    chosen(value, out)
+                    return
+            for check in options:
+                trial: list = []
+                check(value, trial)
+                if not trial:
+                    return
+            out.append(rule)
+
+        return check_any
+
+
+def _accept(value: Any, out: list) -> None:
+    return None
+
+
+def _type_check(kind: str, nullable: bool, where: str) -> Check:
+    test = _TYPES[kind]
+    rule = f"{where}: type"
+
+    def check_type(value: Any, out: list) -> None:
+        if value is None:
+            if not nullable:
+                out.append(rule)
+        elif not test(value):
+            out.append(rule)
+
+    return check_type
+
+
+def _enum_check(values: Iterable[Any], where: str) -> Check:
+    # frozenset lookups; unhashable enum members are compared one by one
+    allowed = frozenset(v for v in values if not isinstance(v, (dict, list)))
+    rest = [v for v in values if isinstance(v, (dict, list))]
+    rule = f"{where}: enum"
+
+    def check_enum(value: Any, out: list) -> None:
+        if value is None:
+            return
+        if isinstance(value, (dict, list)):
+            if value not in rest:
+                out.append(rule)
+        elif value not in allowed:
+            out.append(rule)
+
+    return check_enum
+
+
+def _bounds_check(schema: Mapping[str, Any], where: str) -> Check | None:
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    if minimum is None and maximum is None and min_length is None and max_length is None and pattern is None:
+        return None
+
+    def check_bounds(value: Any, out: list) -> None:
+        if type(value) in (int, float):
+            if minimum is not None and value < minimum:
+                out.append(f"{where}: minimum")
+            if maximum is not None and value > maximum:
+                out.append(f"{where}: maximum")
+        elif type(value) is str:
+            if min_length is not None and len(value) < min_length:
+                out.append(f"{where}: minLength")
+            if max_length is not None and len(value) > max_length:
+                out.append(f"{where}: maxLength")
+            if pattern is not None and not pattern.search(value):
+                out.append(f"{where}: pattern")
+
+    return check_bounds
+
+
+class ContractValidator:
+    """Checks a sample of encoded responses against one schema of an OpenAPI spec, off the request path."""
+
+    def __init__(
+        self,
+        spec: str | os.PathLike[str] | Mapping[str, Any],
+        *,
+        schema: str = "ProcessResponse",
+        sample_rate: float = 0.01,
+        max_buffered: int = 1000,
+        batch_size: int = 64,
+    ) -> None:
+        document = spec if isinstance(spec, Mapping) else load_spec(spec)
+        self.validators = compile_schemas(document)
+        if schema not in self.validators:
+            raise ValueError(f"The spec has no schema {schema!r}")
+        self.schema = schema
+        self.sample_rate = sample_rate
+        self.max_buffered = max_buffered
+        self.batch_size = batch_size
+        self.sampled = 0
+        self.checked = 0
+        self.nonconforming = 0
+        self.undecodable = 0
+        self.dropped = 0
+        self.violations: Counter[str] = Counter()
+        self._check = self.validators[schema]
+        self._buffer: deque[bytes] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def validate(self, document: Any, schema: str | None = None) -> list[str]:
+        """The rules ``document`` breaks, one entry per violation (synchronous, uncounted)."""
+
+        out: list[str] = []
+        (self.validators[schema] if schema else self._check)(document, out)
+        return out
+
+    def submit(self, body: bytes) -> bool:
+        """Queue an encoded response for checking if it is sampled; ``True`` if it was queued.
+
+        ``body`` is kept as is and must not be changed afterwards.
+        """
+
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return False
+        self.sampled += 1
+        if len(self._buffer) >= self.max_buffered:
+            self.dropped += 1
+            return False
+        self._buffer.append(body)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        """Start the checking task on the running event loop (from the app's lifespan)."""
+
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the checking task; buffered samples are dropped."""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wakeup = None
+        self._buffer.clear()
+
+    async def drain(self) -> int:
+        """Check everything buffered now; return how many bodies were checked."""
+
+        checked = 0
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            results = await asyncio.to_thread(self._check_batch, batch)
+            checked += len(batch)
+            self._count(results)
+        return checked
+
+    def report(self) -> dict[str, Any]:
+        """Counters and violations per rule, most frequent first."""
+
+        return {
+            "schema": self.schema,
+            "sampleRate": self.sample_rate,
+            "sampled": self.sampled,
+            "checked": self.checked,
+            "nonConforming": self.nonconforming,
+            "undecodable": self.undecodable,
+            "dropped": self.dropped,
+            "violations": dict(self.violations.most_common()),
+        }
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except Exception:  # noqa: BLE001 - a checker bug must not stop sampling
+                logger.exception("Contract check failed.")
+
+    def _check_batch(self, batch: list[bytes]) -> list[list[str] | None]:
+        results: list[list[str] | None] = []
+        for body in batch:
+            try:
+                document = loads(body)
+            except ValueError:
+                results.append(None)
+                continue
+            out: list[str] = []
+            self._check(document, out)
+            results.append(out)
+        return results
+
+    def _count(self, results: list[list[str] | None]) -> None:
+        # on the event loop, so the counters need no lock
+        for out in results:
+            self.checked += 1
+            if out is None:
+                self.undecodable += 1
+                continue
+            if not out:
+                continue
+            self.nonconforming += 1
+            for rule in out:
+                if rule not in self.violations:
+                    logger.warning("Response violates the %s contract: %s", self.schema, rule)
+                self.violations[rule] += 1
@@ -0,0 +1,164 @@
+"""Guarded ``/debug`` routes for diagnosing a running instance.
+
+The routes exist only when ``debug_token`` is set, and every call must send it
+in the ``x-debug-token`` header; a missing or wrong token gets ``404`` so the
+surface is not discoverable. :func:`~dragon_extension_runtime.create_app`
+adds the sample's own ``dependencies`` (e.g. its authentication) as well.
+Never expose them without both in production.
+
+* ``GET /debug/profiles`` and ``GET /debug/profiles/{name}``: request
+  profiles (see :mod:`~dragon_extension_runtime.profiling`).
+* ``/debug/memory``: GC state, cache sizes and ``tracemalloc`` snapshots and
+  diffs (see :mod:`~dragon_extension_runtime.memory`).
+* ``GET /debug/contracts``: violations of the OpenAPI spec found in sampled
+  responses (see :mod:`~dragon_extension_runtime.contracts`).
+"""
+
+from __future__ import annotations
+
+import hmac
+from typing import Any, Sequence
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from .contracts import ContractValidator
+from .encoding import FastJSONResponse
+from .memory import GROUP_BY, MemoryDiagnostics
+from .profiling import Profiler
+
+DEBUG_PATH = "/debug"
+
+
+def debug_token_guard(token: str):
+    """FastAPI dependency that checks ``x-debug-token`` against ``token``."""
+
+    expected = token.encode()
+
+    async def require_debug_token(
+        x_debug_token: str | None = Header(default=None, alias="x-debug-token"),
+    ) -> None:
+        if not x_debug_token or not hmac.compare_digest(x_debug_token.encode(), expected):
+            raise HTTPException(status_code=404, detail="Not Found")
+
+    return require_debug_token
+
+
+def debug_router(
+    token: str,
+    *,
+    profiler: Profiler | None = None,
+    memory: MemoryDiagnostics | None = None,
+    contracts: ContractValidator | None = None,
+    dependencies: Sequence[Any] = (),
+) -> APIRouter:
+    """The ``/debug`` routes for the diagnostics that are enabled."""
+
+    router = APIRouter(
+        prefix=DEBUG_PATH,
+        tags=["debug"],
+        include_in_schema=False,
+        dependencies=[Depends(debug_token_guard(token)), *dependencies],
+    )
+
+    if profiler is not None:
+
+        @router.get("/profiles")
+        async def list_profiles() -> FastJSONResponse:
+            """Stored request profiles, newest first."""
+
+            return FastJSONResponse(
+                {
+                    "profiles": [
+                        {
+                            "name": info.name,
+                            "createdAt": info.created_at,
+                            "sizeBytes": info.size_bytes,
+                            "summary": info.summary,
+                            "url": f"{DEBUG_PATH}/profiles/{info.name}",
+                        }
+                        for info in profiler.list()
+                    ]
+                }
+            )
+
+        @router.get("/profiles/{name}")
+        async def get_profile(name: str, format: str = "prof") -> FileResponse:
+            """Download a profile: ``prof`` (pstats data) or ``txt`` (report)."""
+
+            path = profiler.path(name, format)
+            if path is None:
+                raise HTTPException(status_code=404, detail="Profile not found")
+            if format == "txt":
+                return FileResponse(path, media_type="text/plain; charset=utf-8")
+            return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+    if memory is not None:
+        group_by_pattern = "^(" + "|".join(GROUP_BY) + ")$"
+
+        @router.get("/memory")
+        async def memory_report() -> FastJSONResponse:
+            """RSS, GC generation counts, tracemalloc status and the service's cache sizes."""
+
+            return FastJSONResponse(memory.report())
+
+        @router.post("/memory/tracemalloc/start")
+        async def start_tracemalloc(frames: int = Query(default=1, ge=1, le=64)) -> FastJSONResponse:
+            """Start tracing allocations, keeping ``frames`` frames per allocation."""
+
+            return FastJSONResponse(memory.start(frames))
+
+        @router.post("/memory/tracemalloc/stop")
+        async def stop_tracemalloc() -> FastJSONResponse:
+            """Stop tracing allocations and drop the stored snapshots."""
+
+            return FastJSONResponse(memory.stop())
+
+        @router.post("/memory/snapshots")
+        async def take_snapshot(
+            limit: int = Query(default=25, ge=1, le=500),
+            group_by: str = Query(default="lineno", pattern=group_by_pattern),
+        ) -> FastJSONResponse:
+            """Take a snapshot and return its id and top allocation sites."""
+
+            try:
+                return FastJSONResponse(memory.take_snapshot(limit, group_by))
+            except RuntimeError as error:
+                return FastJSONResponse({"success": False, "error": str(error)}, status_code=409)
+
+        @router.get("/memory/snapshots/{snapshot_id}")
+        async def snapshot_top(
+            snapshot_id: int,
+            limit: int = Query(default=25, ge=1, le=500),
+            group_by: str = Query(default="lineno", pattern=group_by_pattern),
+        ) -> FastJSONResponse:
+            """Top allocation sites of a stored snapshot."""
+
+            try:
+                return FastJSONResponse(memory.top(snapshot_id, limit, group_by))
+            except KeyError:
+                raise HTTPException(status_code=404, detail="Snapshot not found") from None
+
+        @router.get("/memory/diff")
+        async def snapshot_diff(
+            base: int,
+            current: int,
+            limit: int = Query(default=25, ge=1, le=500),
+            group_by: str = Query(default="lineno", pattern=group_by_pattern),
+        ) -> FastJSONResponse:
+            """Allocation sites that grew most between two stored snapshots."""
+
+            try:
+                return FastJSONResponse(memory.diff(base, current, limit, group_by))
+            except KeyError:
+                raise HTTPException(status_code=404, detail="Snapshot not found") from None
+
+    if contracts is not None:
+
+        @router.get("/contracts")
+        async def contract_report() -> FastJSONResponse:
+            """Sampled responses checked against the spec and their violations per rule."""
+
+            return FastJSONResponse(contracts.report())
+
+    return router
@@ -0,0 +1,75 @@
+"""Fast JSON response encoding.
+
+FastAPI's default path for a returned model is ``jsonable_encoder`` (a
+pure-Python walk of the whole object tree) followed by ``json.dumps``.
+:class:`ModelResponse` instead serializes the model in one call to pydantic's
+Rust serializer, with the ``by_alias`` / ``exclude_none`` wire conventions of
+the samples. :func:`dumps` encodes plain data and :func:`loads` decodes a raw
+request body, using ``orjson`` when it is installed and the standard library
+otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Mapping
+
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, Response
+
+try:  # Optional: ``pip install orjson`` for faster encoding of plain data.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """Encode JSON-compatible ``data`` to compact UTF-8 bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON ``data``; raises ``ValueError`` if it is not valid JSON."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_model(model: BaseModel, *, exclude_none: bool = True) -> bytes:
+    """Serialize ``model`` to wire JSON (camelCase aliases, ``None`` omitted)."""
+
+    return model.model_dump_json(by_alias=True, exclude_none=exclude_none).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """JSON response rendered straight from a pydantic model."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: BaseModel,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+        *,
+        exclude_none: bool = True,
+    ) -> None:
+        super().__init__(
+            encode_model(model, exclude_none=exclude_none),
+            status_code=status_code,
+            headers=headers,
+            background=background,
+        )
@@ -0,0 +1,217 @@
+"""Per-environment / per-language engine registry with lazy loading and LRU eviction.
+
+A multi-tenant deployment serves many Dragon environments and languages, each
+of which may bring its own correction dictionary, lexicon or rule set.
+:class:`EngineRegistry` builds an engine the first time a
+``(environment_id, language)`` pair is seen and keeps compiled engines in a
+least-recently-used cache bounded by a memory budget, so memory is only spent
+on tenants that are actually active:
+
+* ``resolve(environment_id, language)`` maps the routing context to a *source*
+  (for example the dictionary file that applies). Tenants without overrides
+  resolve to the same source and share one engine.
+* ``load(source)`` builds the engine. Concurrent first requests for the same
+  source trigger a single load.
+* Each engine's footprint is estimated once when it is loaded. Least recently
+  used engines are evicted when the total exceeds the budget, and engines
+  unused for ``max_idle_seconds`` are evicted as cold.
+* ``resolve`` results are memoized per ``(environment_id, language)``, so a
+  warm request does not touch the file system. A pair is resolved again once
+  its source's engine is evicted or the registry is cleared, which is when a
+  newly added override file is picked up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+E = TypeVar("E")
+
+# Environment and language identifiers are used to build file paths, so only
+# plain identifiers (GUIDs, BCP-47 tags) are honoured.
+_SAFE_SEGMENT_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+# Routing contexts come from requests, so the memo of resolved sources is
+# bounded; it is simply emptied when it grows past this many pairs.
+MAX_RESOLVED = 10_000
+
+
+def safe_path_segment(value: str | None) -> str | None:
+    """Return ``value`` if it is safe to use as a single path segment."""
+
+    if value and _SAFE_SEGMENT_RE.match(value) and ".." not in value:
+        return value
+    return None
+
+
+def estimate_size(obj: object) -> int:
+    """Approximate deep size in bytes of ``obj`` (containers, slots and ``__dict__``)."""
+
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, type):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+@dataclass
+class _Entry(Generic[E]):
+    engine: E
+    size: int
+    last_used: float
+
+
+class EngineRegistry(Generic[E]):
+    """Lazily built engines keyed by routing context, in a memory-bounded LRU."""
+
+    def __init__(
+        self,
+        resolve: Callable[[str | None, str | None], Hashable],
+        load: Callable[[Hashable], E],
+        memory_budget_bytes: int,
+        max_idle_seconds: float = 0,
+        size_of: Callable[[E], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._resolve = resolve
+        self._load = load
+        self._budget = memory_budget_bytes
+        self._max_idle = max_idle_seconds
+        self._size_of = size_of
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry[E]] = OrderedDict()
+        self._sources: dict[tuple[str | None, str | None], Hashable] = {}
+        self._lock = threading.Lock()
+        self._load_locks: dict[Hashable, threading.Lock] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, source: Hashable) -> bool:
+        return source in self._entries
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+    def stats(self) -> dict[str, int]:
+        """Entry count, estimated bytes against the budget, and hit/miss/eviction counters."""
+
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "budgetBytes": self._budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def get(self, environment_id: str | None, language: str | None = None) -> E:
+        """Return the engine for the routing context, loading it on first use."""
+
+        source = self._source(environment_id, language)
+        engine = self._lookup(source)
+        if engine is not None:
+            return engine
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(source, threading.Lock())
+        with load_lock:
+            # Another thread may have finished loading while we waited.
+            engine = self._lookup(source, count=False)
+            if engine is not None:
+                return engine
+            engine = self._load(source)
+            size = self._size_of(engine)
+            with self._lock:
+                self.misses += 1
+                self._entries[source] = _Entry(engine, size, self._clock())
+                self._bytes += size
+                self._evict(keep=source)
+                self._load_locks.pop(source, None)
+            return engine
+
+    async def get_async(self, environment_id: str | None, language: str | None = None) -> E:
+        """Like :meth:`get`, but loads off the event loop on a cache miss."""
+
+        engine = self._lookup(self._source(environment_id, language))
+        if engine is not None:
+            return engine
+        return await asyncio.to_thread(self.get, environment_id, language)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sources.clear()
+            self._bytes = 0
+
+    def _source(self, environment_id: str | None, language: str | None) -> Hashable:
+        key = (environment_id, language)
+        source = self._sources.get(key)
+        if source is None:
+            source = self._resolve(environment_id, language)
+            with self._lock:
+                if len(self._sources) >= MAX_RESOLVED:
+                    self._sources.clear()
+                self._sources[key] = source
+        return source
+
+    def _lookup(self, source: Hashable, count: bool = True) -> E | None:
+        with self._lock:
+            entry = self._entries.get(source)
+            if entry is None:
+                return None
+            if count:
+                self.hits += 1
+            entry.last_used = self._clock()
+            self._entries.move_to_end(source)
+            self._evict(keep=source)
+            return entry.engine
+
+    def _evict(self, keep: Hashable) -> None:
+        # Caller holds ``self._lock``. The engine just used is never evicted,
+        # even if it alone exceeds the budget.
+        now = self._clock()
+        while self._entries:
+            source, entry = next(iter(self._entries.items()))
+            if source == keep:
+                # ``keep`` is the most recently used entry, so it is the only one left.
+                break
+            over_budget = self._bytes > self._budget
+            cold = self._max_idle > 0 and now - entry.last_used > self._max_idle
+            if not (over_budget or cold):
+                # Entries are in recency order: the rest are warmer still.
+                break
+            del self._entries[source]
+            self._bytes -= entry.size
+            self.evictions += 1
+            # Pairs that resolved to the evicted source are resolved afresh.
+            for key in [key for key, value in self._sources.items() if value == source]:
+                del self._sources[key]
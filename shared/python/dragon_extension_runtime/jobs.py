@@ -0,0 +1,490 @@
+"""Asynchronous job mode: ``202 Accepted`` now, result later.
+
+Long transcripts or model-backed checks can outlast the caller's HTTP timeout.
+A caller that sends ``Prefer: respond-async`` (RFC 7240) gets
+``202 Accepted`` with a job ID, a ``Location: /v1/jobs/{id}`` header and
+``Retry-After``. The work is queued for a bounded pool of worker tasks:
+
+* ``GET /v1/jobs/{id}`` returns ``{"jobId", "status", "createdAt",
+  "updatedAt"}``. ``status`` is ``queued``, ``running``, ``succeeded`` or
+  ``failed``. It adds ``result`` (the same body ``/v1/process`` would have
+  returned) or ``error``;
+* with an ``X-Callback-Url`` header, that document is also POSTed to the URL
+  when the job finishes. Callback hosts must be listed in
+  ``job_callback_hosts``, so a request cannot make the service call arbitrary
+  addresses;
+* finished jobs are kept for ``job_ttl_seconds`` in a :class:`JobStore`:
+  :class:`InMemoryJobStore` by default, or :class:`SqliteJobStore`, which
+  survives restarts and is shared by pre-forked workers. Jobs that were
+  unfinished when the process that owned them stopped are reported as failed.
+
+When the queue is full, the request is rejected with ``503`` rather than
+waiting. Polling and callbacks no longer tie up request slots. Calls to a
+store that does disk I/O (``JobStore.blocking``, e.g. SQLite) run on one
+dedicated thread, in order, so a busy database never stalls the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, TypeVar
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+
+from .encoding import FastJSONResponse, dumps, encode_model
+
+if TYPE_CHECKING:
+    import sqlite3
+    import urllib.request
+
+logger = logging.getLogger("dragon.extension.runtime")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+_UNFINISHED = (QUEUED, RUNNING)
+
+JOBS_PATH = "/v1/jobs"
+
+
+def respond_async_requested(prefer: str | None) -> bool:
+    """Whether a ``Prefer`` header asks for asynchronous processing."""
+
+    if not prefer:
+        return False
+    return any(
+        token.split(";", 1)[0].strip().lower() == "respond-async" for token in prefer.split(",")
+    )
+
+
+@dataclass(frozen=True)
+class Job:
+    """A unit of queued work and, once finished, its result."""
+
+    id: str
+    status: str
+    created_at: float
+    updated_at: float
+    expires_at: float
+    callback_url: str | None = None
+    result: bytes | None = None
+    error: str | None = None
+
+    def document(self) -> bytes:
+        """The ``GET /v1/jobs/{id}`` (and callback) body."""
+
+        meta: dict[str, str] = {
+            "jobId": self.id,
+            "status": self.status,
+            "createdAt": _iso(self.created_at),
+            "updatedAt": _iso(self.updated_at),
+        }
+        if self.error is not None:
+            meta["error"] = self.error
+        body = dumps(meta)
+        if self.result is None:
+            return body
+        # The result is stored already encoded; splice it in without re-parsing.
+        return body[:-1] + b',"result":' + self.result + b"}"
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class JobStore(ABC):
+    """Persistence for jobs. Implementations must be safe to call from one event loop."""
+
+    blocking = True
+    """Whether calls may wait on I/O; :class:`JobManager` then makes them on its store thread."""
+
+    @abstractmethod
+    def put(self, job: Job) -> None:
+        """Insert or replace ``job``."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Job | None:
+        """Return the job, or ``None`` if unknown or expired."""
+
+    @abstractmethod
+    def purge_expired(self, now: float) -> int:
+        """Delete jobs whose ``expires_at`` has passed; return how many."""
+
+    @abstractmethod
+    def fail_unfinished(self, error: str, now: float) -> int:
+        """Mark jobs left queued or running by a process that has stopped as failed."""
+
+    def close(self) -> None:
+        """Release the store's resources."""
+
+
+class InMemoryJobStore(JobStore):
+    """Jobs in a dict; lost on restart."""
+
+    blocking = False
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def put(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.expires_at <= time.time():
+            return None
+        return job
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job.expires_at <= now]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def fail_unfinished(self, error: str, now: float) -> int:
+        return 0  # nothing survives a restart
+
+
+_inherited_connections: list[sqlite3.Connection] = []
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return False  # an earlier process with our pid; this one has just started
+    if os.name == "nt":
+        return False  # no pre-forked workers, and os.kill would terminate the process
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SqliteJobStore(JobStore):
+    """Jobs in a SQLite database (WAL mode), so results survive restarts.
+
+    Each process opens its own connection on first use: a SQLite connection
+    must not be carried across :func:`os.fork`, so pre-forked workers never
+    share the parent's. Every row records the pid of the process that wrote
+    it, and :meth:`fail_unfinished` only fails jobs whose process is gone, so
+    a worker that starts does not fail the jobs its live siblings are running.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            callback_url TEXT,
+            result BLOB,
+            error TEXT,
+            owner INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at);
+    """
+
+    def __init__(self, path: str, busy_timeout_seconds: float = 1.0) -> None:
+        self.path = path
+        # Short: a worker waiting on a sibling's write lock holds up its store thread.
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        # Called with the lock held.
+        if self._connection is None or self._pid != os.getpid():
+            import sqlite3  # only when the sqlite store is used
+
+            if self._connection is not None:
+                # Opened before a fork: closing it here could release the parent's locks.
+                _inherited_connections.append(self._connection)
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_seconds,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self._SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:  # a database written before jobs had owners
+                try:
+                    connection.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+                except sqlite3.OperationalError:
+                    pass  # a sibling worker added it first
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def put(self, job: Job) -> None:
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO jobs (id, status, created_at, updated_at, expires_at,"
+                " callback_url, result, error, owner) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.status,
+                    job.created_at,
+                    job.updated_at,
+                    job.expires_at,
+                    job.callback_url,
+                    job.result,
+                    job.error,
+                    os.getpid(),
+                ),
+            )
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT id, status, created_at, updated_at, expires_at, callback_url, result, error"
+                " FROM jobs WHERE id = ? AND expires_at > ?",
+                (job_id, time.time()),
+            ).fetchone()
+        return Job(*row) if row else None
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            return self._db().execute(
+                "DELETE FROM jobs WHERE expires_at <= ?", (now,)
+            ).rowcount
+
+    def fail_unfinished(self, error: str, now: float) -> int:
+        with self._lock:
+            connection = self._db()
+            owners = [
+                owner
+                for (owner,) in connection.execute(
+                    "SELECT DISTINCT owner FROM jobs WHERE status IN (?, ?)", _UNFINISHED
+                )
+            ]
+            stopped = [owner for owner in owners if owner is None or not _process_alive(owner)]
+            failed = 0
+            for owner in stopped:
+                failed += connection.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ?"
+                    " WHERE status IN (?, ?) AND owner IS ?",
+                    (FAILED, error, now, *_UNFINISHED, owner),
+                ).rowcount
+            return failed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+class JobQueueFull(Exception):
+    """The job queue has no room; the caller should retry later."""
+
+
+@lru_cache(maxsize=1)
+def _callback_opener() -> urllib.request.OpenerDirector:
+    import urllib.request  # only when a callback is sent
+
+    class NoRedirects(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):  # type: ignore[override]
+            return None  # a redirect must not lead a callback to a host that is not allowed
+
+    return urllib.request.build_opener(NoRedirects)
+
+Work = Callable[[], Awaitable[BaseModel]]
+T = TypeVar("T")
+
+
+class JobManager:
+    """Bounded queue and worker pool for asynchronous jobs."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int,
+        queue_size: int,
+        ttl_seconds: float,
+        callback_hosts: Iterable[str] = (),
+        callback_timeout_seconds: float = 10,
+        cleanup_interval_seconds: float = 60,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.store = store
+        self.workers = workers
+        self.ttl_seconds = ttl_seconds
+        self.callback_hosts = frozenset(host.lower() for host in callback_hosts)
+        self.callback_timeout_seconds = callback_timeout_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self.queue_size = queue_size
+        self._queue: asyncio.Queue[tuple[Job, Work, bool]] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._store_thread: ThreadPoolExecutor | None = None
+
+    def check_callback_url(self, url: str) -> None:
+        """Raise ``ValueError`` unless ``url`` is an http(s) URL on an allowed host."""
+
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("Callback URL must be an absolute http(s) URL.")
+        if parts.hostname.lower() not in self.callback_hosts:
+            raise ValueError(f"Callback host '{parts.hostname}' is not allowed.")
+
+    async def _store(self, method: Callable[..., T], *args: object) -> T:
+        # One thread, so store calls keep the order they were made in (a job's
+        # "queued" row is written before its "running" row).
+        if self._store_thread is None:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._store_thread, method, *args)
+
+    async def start(self) -> None:
+        """Start the workers on the running event loop (from the app's lifespan)."""
+
+        # Created here, not in __init__, so the queue belongs to the serving loop.
+        self._queue = asyncio.Queue(self.queue_size)
+        if self.store.blocking:
+            self._store_thread = ThreadPoolExecutor(1, thread_name_prefix="job-store")
+        now = time.time()
+        recovered = await self._store(
+            self.store.fail_unfinished, "Interrupted by a service restart.", now
+        )
+        if recovered:
+            logger.warning("Marked %s unfinished jobs of stopped processes as failed.", recovered)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._clean_up()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        await self._store(self.store.close)
+        if self._store_thread is not None:
+            self._store_thread.shutdown()
+            self._store_thread = None
+
+    async def submit(
+        self, work: Work, *, callback_url: str | None = None, exclude_none: bool = True
+    ) -> Job:
+        """Queue ``work``; raises :class:`JobQueueFull` if there is no room."""
+
+        if self._queue is None:
+            raise RuntimeError("JobManager.start() has not been called.")
+        if callback_url is not None:
+            self.check_callback_url(callback_url)
+        now = time.time()
+        job = Job(
+            id=str(uuid.uuid4()),
+            status=QUEUED,
+            created_at=now,
+            updated_at=now,
+            expires_at=now + self.ttl_seconds,
+            callback_url=callback_url,
+        )
+        try:
+            self._queue.put_nowait((job, work, exclude_none))
+        except asyncio.QueueFull:
+            raise JobQueueFull() from None
+        await self._store(self.store.put, job)
+        return job
+
+    async def accept(
+        self, work: Work, *, callback_url: str | None = None, exclude_none: bool = True
+    ) -> FastJSONResponse:
+        """Submit ``work`` and answer ``202``, or ``400`` / ``503`` if it cannot be queued."""
+
+        try:
+            job = await self.submit(work, callback_url=callback_url, exclude_none=exclude_none)
+        except ValueError as exc:
+            return FastJSONResponse({"success": False, "error": str(exc)}, status_code=400)
+        except JobQueueFull:
+            return FastJSONResponse(
+                {"success": False, "error": "Job queue is full, retry later"},
+                status_code=503,
+                headers={"Retry-After": "5"},
+            )
+        location = f"{JOBS_PATH}/{job.id}"
+        return FastJSONResponse(
+            {"jobId": job.id, "status": job.status, "statusUrl": location},
+            status_code=202,
+            headers={"Location": location, "Retry-After": "1"},
+        )
+
+    async def get(self, job_id: str) -> Job | None:
+        return await self._store(self.store.get, job_id)
+
+    async def _work(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            job, work, exclude_none = await queue.get()
+            try:
+                await self._run(job, work, exclude_none)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: Job, work: Work, exclude_none: bool) -> None:
+        job = replace(job, status=RUNNING, updated_at=time.time())
+        await self._store(self.store.put, job)
+        try:
+            response = await work()
+            result = encode_model(response, exclude_none=exclude_none)
+            job = replace(job, status=SUCCEEDED, result=result)
+        except Exception:  # noqa: BLE001 - reported through the job
+            logger.exception("Job %s failed.", job.id)
+            job = replace(job, status=FAILED, error="Processing failed.")
+        now = time.time()
+        job = replace(job, updated_at=now, expires_at=now + self.ttl_seconds)
+        await self._store(self.store.put, job)
+        if job.callback_url:
+            await self._call_back(job)
+
+    async def _call_back(self, job: Job) -> None:
+        import urllib.request
+
+        request = urllib.request.Request(
+            job.callback_url,
+            data=job.document(),
+            headers={"content-type": "application/json"},
+            method="POST",
+        )
+        try:
+            await asyncio.to_thread(self._post, request)
+        except Exception:  # noqa: BLE001 - the result can still be polled
+            logger.warning(
+                "Callback for job %s to %s failed.", job.id, job.callback_url, exc_info=True
+            )
+
+    def _post(self, request: urllib.request.Request) -> None:
+        with _callback_opener().open(request, timeout=self.callback_timeout_seconds):
+            pass
+
+    async def _clean_up(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval_seconds)
+            purged = await self._store(self.store.purge_expired, time.time())
+            if purged:
+                logger.info("Purged %s expired jobs.", purged)
+
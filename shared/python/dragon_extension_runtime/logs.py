@@ -0,0 +1,13 @@
+"""Logging setup shared by the samples."""
+
+from __future__ import annotations
+
+import logging
+
+LOG_FORMAT = "[%(asctime)s] %(levelname)s %(name)s - %(message)s"
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configure root logging once (a no-op if the host already configured it)."""
+
+    logging.basicConfig(level=level, format=LOG_FORMAT)
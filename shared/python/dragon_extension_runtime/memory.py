@@ -0,0 +1,201 @@
+"""Memory diagnostics: tracemalloc snapshots and diffs, GC state and cache sizes.
+
+Served under ``/debug/memory`` (see :mod:`~dragon_extension_runtime.debug`)
+so a slow leak can be traced to a subsystem on a running pod:
+
+1. ``POST /debug/memory/tracemalloc/start`` (``tracemalloc`` slows every
+   allocation down, so it is off until asked for);
+2. ``POST /debug/memory/snapshots`` now and again later; each returns the top
+   allocation sites;
+3. ``GET /debug/memory/diff?base=1&current=2`` shows the sites that grew most;
+4. ``POST /debug/memory/tracemalloc/stop`` frees the tracing overhead again.
+
+``GET /debug/memory`` reports process and GC state plus
+:meth:`~dragon_extension_runtime.ExtensionService.cache_sizes`, and works
+without ``tracemalloc``. Snapshots are held in memory, at most
+``max_snapshots`` of them, oldest dropped first.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Mapping
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+
+def _rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as stream:
+            pages = int(stream.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    # ru_maxrss is the peak, in KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _stat(stat: tracemalloc.Statistic | tracemalloc.StatisticDiff) -> dict[str, Any]:
+    frame = stat.traceback[0]
+    item: dict[str, Any] = {
+        "site": f"{frame.filename}:{frame.lineno}",
+        "sizeBytes": stat.size,
+        "count": stat.count,
+    }
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        item["sizeDiffBytes"] = stat.size_diff
+        item["countDiff"] = stat.count_diff
+    if len(stat.traceback) > 1:
+        item["traceback"] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+    return item
+
+
+class MemoryDiagnostics:
+    """tracemalloc control and a bounded set of numbered snapshots."""
+
+    def __init__(
+        self,
+        cache_sizes: Callable[[], Mapping[str, Any]] = dict,
+        max_snapshots: int = 5,
+    ) -> None:
+        self.cache_sizes = cache_sizes
+        self.max_snapshots = max_snapshots
+        self._snapshots: OrderedDict[int, tuple[float, tracemalloc.Snapshot]] = OrderedDict()
+        self._next_id = 1
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 1) -> dict[str, Any]:
+        """Start tracing with ``frames`` frames per allocation (no-op if running)."""
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started = True
+        return self.tracemalloc_status()
+
+    def stop(self) -> dict[str, Any]:
+        """Stop tracing; also drops the snapshots, whose traces it frees."""
+
+        tracemalloc.stop()
+        self._started = False
+        with self._lock:
+            self._snapshots.clear()
+        return self.tracemalloc_status()
+
+    def close(self) -> None:
+        """On shutdown: stop tracing if it was started here, drop the snapshots."""
+
+        if self._started:
+            self.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def tracemalloc_status(self) -> dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        status: dict[str, Any] = {"tracing": tracing}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            status.update(
+                frames=tracemalloc.get_traceback_limit(),
+                tracedBytes=current,
+                peakTracedBytes=peak,
+                overheadBytes=tracemalloc.get_tracemalloc_memory(),
+            )
+        with self._lock:
+            status["snapshots"] = [
+                {"id": snapshot_id, "takenAt": taken_at}
+                for snapshot_id, (taken_at, _) in self._snapshots.items()
+            ]
+        return status
+
+    def report(self) -> dict[str, Any]:
+        """Process, GC and cache state (cheap; does not need tracemalloc)."""
+
+        return {
+            "rssBytes": _rss_bytes(),
+            "gc": {
+                "enabled": gc.isenabled(),
+                "counts": list(gc.get_count()),
+                "thresholds": list(gc.get_threshold()),
+                "frozen": gc.get_freeze_count(),
+                "generations": gc.get_stats(),
+                "uncollectable": len(gc.garbage),
+            },
+            "tracemalloc": self.tracemalloc_status(),
+            "caches": dict(self.cache_sizes()),
+        }
+
+    def take_snapshot(self, limit: int = 25, group_by: str = "lineno") -> dict[str, Any]:
+        """Snapshot the traced allocations and return the top ``limit`` sites.
+
+        Raises ``RuntimeError`` if tracemalloc is not running.
+        """
+
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running; start it first.")
+        snapshot = self._filtered(tracemalloc.take_snapshot())
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = (time.time(), snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return {"id": snapshot_id, **self.top(snapshot_id, limit, group_by)}
+
+    def top(self, snapshot_id: int, limit: int = 25, group_by: str = "lineno") -> dict[str, Any]:
+        """Top allocation sites of a stored snapshot; ``KeyError`` if unknown."""
+
+        _, snapshot = self._get(snapshot_id)
+        stats = snapshot.statistics(_group_by(group_by))
+        return {
+            "totalBytes": sum(stat.size for stat in stats),
+            "top": [_stat(stat) for stat in stats[:limit]],
+        }
+
+    def diff(
+        self, base_id: int, current_id: int, limit: int = 25, group_by: str = "lineno"
+    ) -> dict[str, Any]:
+        """Sites whose allocations grew most from ``base_id`` to ``current_id``."""
+
+        _, base = self._get(base_id)
+        _, current = self._get(current_id)
+        stats = current.compare_to(base, _group_by(group_by))
+        return {
+            "base": base_id,
+            "current": current_id,
+            "totalDiffBytes": sum(stat.size_diff for stat in stats),
+            "top": [_stat(stat) for stat in stats[:limit]],
+        }
+
+    def _get(self, snapshot_id: int) -> tuple[float, tracemalloc.Snapshot]:
+        with self._lock:
+            return self._snapshots[snapshot_id]
+
+    @staticmethod
+    def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        # Hide tracemalloc's own and the import machinery's allocations.
+        return snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+
+
+def _group_by(value: str) -> str:
+    if value not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}.")
+    return value
@@ -0,0 +1,66 @@
+"""Request metrics hooks.
+
+The runtime's middleware reports every HTTP request to a :class:`MetricsHooks`
+instance. The base class does nothing; subclass it to forward the events to
+Prometheus, OpenTelemetry or Azure Monitor, or use :class:`RequestCounters`
+for simple in-process counters. Hooks run on the event loop for every
+request, so implementations must not block.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, MutableMapping
+
+Scope = MutableMapping[str, Any]
+
+
+class MetricsHooks:
+    """No-op metrics hooks; override the events you need."""
+
+    def request_started(self, scope: Scope) -> None:
+        """A request has been admitted and is about to be handled."""
+
+    def request_finished(self, scope: Scope, status: int, duration_seconds: float) -> None:
+        """A request has completed (``status`` 500 if it raised)."""
+
+    def request_rejected(self, scope: Scope, reason: str) -> None:
+        """A request was turned away before reaching the application."""
+
+
+class RequestCounters(MetricsHooks):
+    """In-process request counters and latency totals, keyed by path."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self.rejected: Counter[str] = Counter()
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def request_started(self, scope: Scope) -> None:
+        self.in_flight += 1
+        self.requests[scope["path"]] += 1
+
+    def request_finished(self, scope: Scope, status: int, duration_seconds: float) -> None:
+        self.in_flight -= 1
+        self.statuses[status] += 1
+        self.total_seconds += duration_seconds
+        self.max_seconds = max(self.max_seconds, duration_seconds)
+
+    def request_rejected(self, scope: Scope, reason: str) -> None:
+        self.rejected[reason] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """A JSON-serializable copy of the current counters."""
+
+        completed = sum(self.statuses.values())
+        return {
+            "inFlight": self.in_flight,
+            "requests": dict(self.requests),
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+            "rejected": dict(self.rejected),
+            "meanSeconds": self.total_seconds / completed if completed else 0.0,
+            "maxSeconds": self.max_seconds,
+        }
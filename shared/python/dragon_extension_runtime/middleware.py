@@ -0,0 +1,154 @@
+"""Pure-ASGI middleware.
+
+Starlette's ``@app.middleware("http")`` / ``BaseHTTPMiddleware`` wraps every
+request and response in extra objects and runs the endpoint in a separate
+task, which costs latency on each call and buffers streaming bodies through a
+memory channel. These classes work on the raw ASGI ``scope`` / ``receive`` /
+``send`` instead and pass messages straight through.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Iterable, MutableMapping
+
+from .admission import AdmissionController
+from .encoding import dumps
+from .metrics import MetricsHooks
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+REQUEST_ID_HEADER = b"x-ms-request-id"
+CORRELATION_ID_HEADER = b"x-ms-correlation-id"
+
+
+def header(scope: Scope, name: bytes) -> str | None:
+    """Return the first value of header ``name`` (lower-case bytes), if present."""
+
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def send_json(
+    send: Send,
+    status: int,
+    content: Any,
+    headers: Iterable[tuple[bytes, bytes]] = (),
+) -> None:
+    """Send a complete JSON response on a raw ASGI ``send``."""
+
+    body = dumps(content)
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class RequestLoggingMiddleware:
+    """Log and time each request and report it to the metrics hooks.
+
+    The log line carries the Dragon tracing headers (``x-ms-request-id`` and
+    ``x-ms-correlation-id``). An unhandled exception is logged and answered
+    with a JSON 500, unless the response has already started.
+    """
+
+    def __init__(
+        self, app: ASGIApp, logger: logging.Logger, metrics: MetricsHooks | None = None
+    ) -> None:
+        self.app = app
+        self.logger = logger
+        self.metrics = metrics or MetricsHooks()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_started
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_started = True
+            await send(message)
+
+        self.metrics.request_started(scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            self.logger.exception("Unhandled exception processing request")
+            if response_started:
+                raise
+            status = 500
+            await send_json(send, 500, {"success": False, "error": "Internal server error"})
+        finally:
+            elapsed = time.perf_counter() - started
+            self.metrics.request_finished(scope, status, elapsed)
+            self.logger.info(
+                "%s %s -> %s in %.1f ms req_id=%s corr_id=%s",
+                scope["method"],
+                scope["path"],
+                status,
+                elapsed * 1000,
+                header(scope, REQUEST_ID_HEADER),
+                header(scope, CORRELATION_ID_HEADER),
+            )
+
+
+class AdmissionControlMiddleware:
+    """Apply an :class:`AdmissionController` to requests for ``paths``.
+
+    Rejected requests get ``503`` with ``Retry-After`` and never reach the
+    application. Health probes and other paths are not limited.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        paths: Iterable[str],
+        metrics: MetricsHooks | None = None,
+        retry_after_seconds: int = 1,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.paths = frozenset(paths)
+        self.metrics = metrics or MetricsHooks()
+        self.retry_after = str(retry_after_seconds).encode("ascii")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire():
+            self.metrics.request_rejected(scope, "overloaded")
+            await send_json(
+                send,
+                503,
+                {"success": False, "error": "Server busy, retry later"},
+                headers=[(b"retry-after", self.retry_after)],
+            )
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
@@ -0,0 +1,130 @@
+"""Conversions between code point, UTF-16 and UTF-8 offsets of one text.
+
+Python indexes strings by code point. The Dragon Copilot consumers are .NET
+services and index by UTF-16 code unit, so an offset reported after an emoji or
+any other character outside the Basic Multilingual Plane would be off by one
+per such character. Logs, byte-oriented stores and other tools count UTF-8
+bytes instead.
+
+:class:`OffsetIndex` is built once per text. It scans the text in one pass
+(a C-level regex scan that stops only at non-ASCII characters) and records the
+position and cumulative extra width of those characters. Each conversion is
+then a binary search, O(log n) in the number of non-ASCII characters, whereas
+re-encoding the prefix would be O(n) per offset. ASCII text (the common case
+for reports) is detected with ``str.isascii`` and every conversion is the
+identity.
+
+Offsets are boundaries, from 0 to the length of the text. An offset that falls
+inside a character (between the two halves of a surrogate pair, or inside a
+multi-byte UTF-8 sequence) maps back to the start of that character.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+class OffsetIndex:
+    """Offsets of one text in code points, UTF-16 code units and UTF-8 bytes."""
+
+    __slots__ = (
+        "length",
+        "utf16_length",
+        "utf8_length",
+        "_astral",
+        "_astral_utf16",
+        "_wide",
+        "_wide_utf8",
+        "_extra",
+    )
+
+    def __init__(self, text: str) -> None:
+        self.length = len(text)
+        # Characters above U+FFFF: code point index, and UTF-16 offset.
+        self._astral: list[int] = []
+        self._astral_utf16: list[int] = []
+        # Characters above U+007F: code point index, UTF-8 offset, and the
+        # extra bytes (beyond one per character) up to and including them.
+        self._wide: list[int] = []
+        self._wide_utf8: list[int] = []
+        self._extra: list[int] = []
+        if not text.isascii():
+            extra = 0
+            for match in _NON_ASCII.finditer(text):
+                index = match.start()
+                point = ord(match.group())
+                self._wide.append(index)
+                self._wide_utf8.append(index + extra)
+                if point < 0x800:
+                    extra += 1
+                elif point < 0x10000:
+                    extra += 2
+                else:
+                    extra += 3
+                    self._astral_utf16.append(index + len(self._astral))
+                    self._astral.append(index)
+                self._extra.append(extra)
+        self.utf16_length = self.length + len(self._astral)
+        self.utf8_length = self.length + (self._extra[-1] if self._extra else 0)
+
+    @property
+    def is_ascii(self) -> bool:
+        return not self._wide
+
+    def utf16(self, index: int) -> int:
+        """UTF-16 offset of code point offset ``index``."""
+
+        if not self._astral:
+            return index
+        return index + bisect_left(self._astral, index)
+
+    def utf8(self, index: int) -> int:
+        """UTF-8 byte offset of code point offset ``index``."""
+
+        if not self._wide:
+            return index
+        before = bisect_left(self._wide, index)
+        return index + (self._extra[before - 1] if before else 0)
+
+    def from_utf16(self, offset: int) -> int:
+        """Code point offset of UTF-16 offset ``offset``."""
+
+        if not self._astral:
+            return offset
+        # The last astral character starting at or before the offset.
+        k = bisect_right(self._astral_utf16, offset) - 1
+        if k < 0:
+            return offset
+        start = self._astral_utf16[k]
+        if offset < start + 2:
+            return self._astral[k]
+        return offset - (k + 1)
+
+    def from_utf8(self, offset: int) -> int:
+        """Code point offset of UTF-8 byte offset ``offset``."""
+
+        if not self._wide:
+            return offset
+        # The last non-ASCII character starting at or before the offset.
+        k = bisect_right(self._wide_utf8, offset) - 1
+        if k < 0:
+            return offset
+        start = self._wide_utf8[k]
+        width = 1 + self._extra[k] - (self._extra[k - 1] if k else 0)
+        if offset < start + width:
+            return self._wide[k]
+        return offset - self._extra[k]
+
+    def utf16_span(self, start: int, end: int) -> tuple[int, int]:
+        """UTF-16 offsets of the code point range ``[start, end)``."""
+
+        return self.utf16(start), self.utf16(end)
+
+    def __repr__(self) -> str:
+        return (
+            f"OffsetIndex(length={self.length}, utf16_length={self.utf16_length}, "
+            f"utf8_length={self.utf8_length})"
+        )
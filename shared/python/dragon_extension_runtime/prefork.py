@@ -0,0 +1,373 @@
+"""Pre-fork multi-worker launcher with copy-on-write friendly shared state.
+
+``uvicorn --workers N`` starts N fresh interpreters, and each one imports the
+app, builds its service and loads the same data files again. :func:`serve`
+loads them once instead:
+
+1. The parent disables the cyclic GC, imports the app, and calls
+   :meth:`~dragon_extension_runtime.ExtensionService.load_shared` on
+   ``app.state.service``. That loads the read-only data (lexicons, correction
+   dictionaries, canned responses) before any worker exists.
+2. It binds the listening socket, collects garbage once and calls
+   :func:`gc.freeze`. The loaded objects move to the permanent generation, so
+   the workers' collections never write to their pages and the pages stay
+   shared.
+3. It forks ``workers`` processes that serve the inherited socket with
+   uvicorn. Each worker still runs the app's lifespan, so thread and process
+   pools, connections and warm-up stay per worker; ``preload`` finds the
+   shared data already loaded.
+4. It supervises the workers:
+
+   * A worker that exits is replaced. If workers keep failing before they
+     become ready, the launcher stops.
+   * ``SIGHUP`` replaces the workers one at a time. Each replacement must be
+     ready before the worker it replaces is asked to stop.
+   * ``SIGTERM`` or ``SIGINT`` stops all workers gracefully. Workers still
+     running after ``graceful_timeout_seconds`` are killed.
+
+``SIGHUP`` does not reload code: the replacements fork from the same parent,
+which makes it a cheap way to recycle workers (for example, to return memory).
+State kept in process memory is per worker: use the ``sqlite`` job store so
+any worker can answer ``GET /v1/jobs/{id}`` (each worker opens its own
+connection, and a replaced worker only fails the jobs of workers that have
+exited), and note that admission limits apply per worker. Where
+:func:`os.fork` is unavailable (Windows) a single uvicorn server is run
+instead.
+
+Each sample exposes this as ``python -m app.serve`` (see :func:`main`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+logger = logging.getLogger("dragon.extension.runtime")
+
+# A worker that exits before it is ready counts as a boot failure; this many
+# in a row stop the launcher instead of forking in a tight loop.
+_MAX_BOOT_FAILURES = 5
+_POLL_SECONDS = 0.1
+_STARTUP_FAILURE = 3  # uvicorn's exit status for a failed startup
+
+
+@dataclass
+class _Worker:
+    pid: int
+    ready_fd: int
+    started_at: float
+    ready: bool = False
+
+
+class PreforkServer:
+    """Load the app once, then fork and supervise uvicorn workers."""
+
+    def __init__(
+        self,
+        app: str,
+        *,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        workers: int = 1,
+        graceful_timeout_seconds: float = 30,
+        ready_timeout_seconds: float = 60,
+        log_level: str = "info",
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.graceful_timeout_seconds = graceful_timeout_seconds
+        self.ready_timeout_seconds = ready_timeout_seconds
+        self.log_level = log_level
+        self._workers: dict[int, _Worker] = {}
+        self._signals: list[int] = []
+        self._boot_failures = 0
+        self._config: Any = None
+        self._socket: socket.socket | None = None
+
+    def run(self) -> int:
+        """Serve until stopped; returns the exit status."""
+
+        import uvicorn
+        from uvicorn.importer import import_from_string
+
+        # Keep the parent's heap compact while it loads: no collections
+        # leaving freed holes between the objects the workers will share.
+        gc.disable()
+        started = time.perf_counter()
+        app = import_from_string(self.app)
+        service = getattr(getattr(app, "state", None), "service", None)
+        if service is not None:
+            service.load_shared()
+        self._config = uvicorn.Config(
+            app,
+            host=self.host,
+            port=self.port,
+            log_level=self.log_level,
+            lifespan="on",
+            timeout_graceful_shutdown=int(self.graceful_timeout_seconds),
+        )
+        if not hasattr(os, "fork"):
+            gc.enable()
+            logger.warning("os.fork is not available; running a single server process.")
+            uvicorn.Server(self._config).run()
+            return 0
+
+        self._socket = self._config.bind_socket()
+        gc.collect()
+        gc.freeze()
+        gc.enable()
+        logger.info(
+            "Loaded %s in %.0f ms (%s objects shared); starting %s workers.",
+            self.app,
+            (time.perf_counter() - started) * 1000,
+            gc.get_freeze_count(),
+            self.workers,
+        )
+
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._on_signal)
+        try:
+            for _ in range(self.workers):
+                self._spawn()
+            return self._supervise()
+        finally:
+            self._stop(list(self._workers.values()))
+            self._socket.close()
+
+    def _on_signal(self, signum: int, frame: Any) -> None:
+        self._signals.append(signum)
+
+    def _supervise(self) -> int:
+        while True:
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum == signal.SIGHUP:
+                    logger.info("SIGHUP: replacing %s workers.", len(self._workers))
+                    self._replace_all()
+                else:
+                    logger.info("%s: stopping workers.", signal.Signals(signum).name)
+                    return 0
+            self._poll_ready(_POLL_SECONDS)
+            if not self._reap():
+                return 1
+
+    def _spawn(self) -> _Worker:
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # worker
+            os.close(ready_read)
+            self._run_worker(ready_write)  # never returns
+        os.close(ready_write)
+        worker = _Worker(pid, ready_read, time.monotonic())
+        self._workers[pid] = worker
+        return worker
+
+    def _run_worker(self, ready_fd: int) -> None:
+        status = 1
+        try:
+            for worker in self._workers.values():
+                os.close(worker.ready_fd)
+            self._workers.clear()
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+
+            import uvicorn
+
+            server = uvicorn.Server(self._config)
+
+            async def serve() -> None:
+                task = asyncio.create_task(server.serve(sockets=[self._socket]))
+                while not server.started and not task.done():
+                    await asyncio.sleep(0.01)
+                if server.started:
+                    os.write(ready_fd, b"1")
+                await task
+
+            asyncio.run(serve())
+            status = 0 if server.started else _STARTUP_FAILURE
+        except BaseException:  # noqa: BLE001 - report, then leave without the parent's cleanup
+            logger.exception("Worker %s failed.", os.getpid())
+        finally:
+            os._exit(status)
+
+    def _poll_ready(self, timeout: float) -> None:
+        waiting = {w.ready_fd: w for w in self._workers.values() if not w.ready}
+        if not waiting:
+            time.sleep(timeout)
+            return
+        readable, _, _ = select.select(list(waiting), [], [], timeout)
+        for fd in readable:
+            if os.read(fd, 1):
+                self._mark_ready(waiting[fd])
+
+    def _mark_ready(self, worker: _Worker) -> None:
+        worker.ready = True
+        self._boot_failures = 0
+        logger.info(
+            "Worker %s ready in %.0f ms.", worker.pid, (time.monotonic() - worker.started_at) * 1000
+        )
+
+    def _reap(self) -> bool:
+        """Replace workers that exited; ``False`` if they keep failing to boot."""
+
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return True
+            if pid == 0:
+                return True
+            worker = self._workers.pop(pid, None)
+            if worker is None:
+                continue
+            os.close(worker.ready_fd)
+            code = os.waitstatus_to_exitcode(status)
+            if not worker.ready:
+                self._boot_failures += 1
+                if self._boot_failures >= _MAX_BOOT_FAILURES:
+                    logger.error(
+                        "Workers failed to start %s times in a row (last exit status %s); "
+                        "giving up.",
+                        self._boot_failures,
+                        code,
+                    )
+                    return False
+            logger.warning("Worker %s exited with status %s; starting a replacement.", pid, code)
+            self._spawn()
+
+    def _replace_all(self) -> None:
+        for old in list(self._workers.values()):
+            if old.pid not in self._workers:
+                continue  # exited and replaced meanwhile
+            new = self._spawn()
+            if not self._wait_ready(new):
+                logger.error(
+                    "Replacement worker %s did not become ready; keeping %s.", new.pid, old.pid
+                )
+                self._stop([new])
+                return
+            self._stop([old])
+
+    def _wait_ready(self, worker: _Worker) -> bool:
+        deadline = time.monotonic() + self.ready_timeout_seconds
+        while not worker.ready:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([worker.ready_fd], [], [], remaining)
+            if readable:
+                if not os.read(worker.ready_fd, 1):
+                    return False  # exited before it was ready
+                self._mark_ready(worker)
+        return True
+
+    def _stop(self, workers: list[_Worker]) -> None:
+        """SIGTERM ``workers``, wait for them to drain, SIGKILL stragglers."""
+
+        pending = {}
+        for worker in workers:
+            self._workers.pop(worker.pid, None)
+            os.close(worker.ready_fd)
+            try:
+                os.kill(worker.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            pending[worker.pid] = worker
+        deadline = time.monotonic() + self.graceful_timeout_seconds
+        while pending:
+            for pid in list(pending):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    del pending[pid]
+            if not pending:
+                return
+            if time.monotonic() >= deadline:
+                for pid in pending:
+                    logger.warning("Worker %s did not stop in time; killing it.", pid)
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                        os.waitpid(pid, 0)
+                    except (ProcessLookupError, ChildProcessError):
+                        pass
+                return
+            time.sleep(_POLL_SECONDS)
+
+
+def serve(
+    app: str,
+    *,
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 1,
+    graceful_timeout_seconds: float = 30,
+    log_level: str = "info",
+) -> int:
+    """Serve the ASGI app at ``app`` (``"module:attribute"``) with pre-forked workers."""
+
+    return PreforkServer(
+        app,
+        host=host,
+        port=port,
+        workers=workers,
+        graceful_timeout_seconds=graceful_timeout_seconds,
+        log_level=log_level,
+    ).run()
+
+
+def main(
+    argv: Sequence[str] | None,
+    *,
+    app: str,
+    default_port: int,
+    description: str,
+) -> int:
+    """Command-line front end for :func:`serve`; returns the exit status."""
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--host", default="0.0.0.0", help="bind address (default 0.0.0.0)")
+    parser.add_argument(
+        "--port", type=int, default=default_port, help=f"bind port (default {default_port})"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: one per core)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=30,
+        help="seconds a stopping worker may take to finish its requests",
+    )
+    parser.add_argument("--log-level", default="info", help="uvicorn log level")
+    args = parser.parse_args(argv)
+    try:
+        return serve(
+            app,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            graceful_timeout_seconds=args.graceful_timeout,
+            log_level=args.log_level,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
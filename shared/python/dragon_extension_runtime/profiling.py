@@ -0,0 +1,185 @@
+"""On-demand profiling of single requests.
+
+With ``profiling_enabled``, :class:`ProfilingMiddleware` profiles a processing
+request with :mod:`cProfile` when either:
+
+* the request carries an ``x-debug-profile`` header and a valid ``x-debug-token``
+  (see :mod:`~dragon_extension_runtime.debug`), or
+* it is picked by ``profiling_sample_rate`` (0 by default).
+
+Each profile is written to ``profiling_dir`` as ``<name>.prof`` (raw
+:mod:`pstats` data for ``snakeviz`` or ``python -m pstats``) and
+``<name>.txt`` (the top functions by cumulative time). Only the newest
+``profiling_max_profiles`` are kept. ``GET /debug/profiles`` lists them and
+``GET /debug/profiles/{name}`` downloads one.
+
+When profiling is disabled the middleware is not installed. An untriggered
+request costs one random draw and, when the header is present, one header
+scan. Only one request is profiled at a time. :mod:`cProfile` hooks the whole
+thread, so other requests that interleave on the event loop while a profile
+runs also appear in it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import random
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .middleware import REQUEST_ID_HEADER, ASGIApp, Message, Receive, Scope, Send, header
+
+logger = logging.getLogger("dragon.extension.runtime")
+
+PROFILE_HEADER = b"x-debug-profile"
+DEBUG_TOKEN_HEADER = b"x-debug-token"
+_NAME = re.compile(r"^profile-[0-9TZ]+-[0-9a-f]{8}$")
+_REPORT_LINES = 60
+
+
+@dataclass(frozen=True)
+class ProfileInfo:
+    """A stored profile, as listed by ``GET /debug/profiles``."""
+
+    name: str
+    created_at: str
+    size_bytes: int
+    summary: str
+
+
+class Profiler:
+    """Decides which requests to profile and keeps a bounded ring of profiles on disk."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        sample_rate: float = 0.0,
+        max_profiles: int = 20,
+        debug_token: str | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.max_profiles = max_profiles
+        self.debug_token = debug_token
+        self._active = False
+
+    def should_profile(self, scope: Scope) -> bool:
+        """Whether this request is profiled (never while another profile runs)."""
+
+        if self._active:
+            return False
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if not self.debug_token or header(scope, PROFILE_HEADER) is None:
+            return False
+        token = header(scope, DEBUG_TOKEN_HEADER) or ""
+        return hmac.compare_digest(token.encode(), self.debug_token.encode())
+
+    def list(self) -> list[ProfileInfo]:
+        """Stored profiles, newest first."""
+
+        profiles = []
+        for raw in sorted(self.directory.glob("profile-*.prof"), reverse=True):
+            report = raw.with_suffix(".txt")
+            try:
+                with report.open(encoding="utf-8") as stream:
+                    summary = stream.readline().strip()
+                size = raw.stat().st_size
+            except OSError:
+                continue  # pruned meanwhile
+            stamp = datetime.strptime(raw.stem.split("-")[1], "%Y%m%dT%H%M%S%fZ")
+            profiles.append(
+                ProfileInfo(
+                    name=raw.stem,
+                    created_at=stamp.replace(tzinfo=timezone.utc).isoformat(),
+                    size_bytes=size,
+                    summary=summary,
+                )
+            )
+        return profiles
+
+    def path(self, name: str, kind: str = "prof") -> Path | None:
+        """The file of profile ``name`` (``prof`` or ``txt``), if it exists."""
+
+        if not _NAME.match(name) or kind not in ("prof", "txt"):
+            return None
+        path = self.directory / f"{name}.{kind}"
+        return path if path.is_file() else None
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the request under :mod:`cProfile`, then save the profile off the loop."""
+
+        self._active = True
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            await app(scope, receive, send_wrapper)
+        finally:
+            profile.disable()
+            duration = time.perf_counter() - started
+            self._active = False
+            summary = (
+                f"{scope['method']} {scope['path']} -> {status} in {duration * 1000:.1f} ms"
+                f" req_id={header(scope, REQUEST_ID_HEADER)}"
+            )
+            try:
+                name = await asyncio.to_thread(self._save, profile, summary)
+                logger.info("Saved request profile %s: %s", name, summary)
+            except OSError:
+                logger.exception("Saving the request profile failed.")
+
+    def _save(self, profile: cProfile.Profile, summary: str) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = f"profile-{stamp}-{random.getrandbits(32):08x}"
+        profile.dump_stats(self.directory / f"{name}.prof")
+
+        report = io.StringIO()
+        report.write(summary + "\n\n")
+        pstats.Stats(profile, stream=report).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            _REPORT_LINES
+        )
+        (self.directory / f"{name}.txt").write_text(report.getvalue(), encoding="utf-8")
+
+        stored = sorted(path.stem for path in self.directory.glob("profile-*.prof"))
+        for old in stored[: max(len(stored) - self.max_profiles, 0)]:
+            for kind in ("prof", "txt"):
+                (self.directory / f"{old}.{kind}").unlink(missing_ok=True)
+        return name
+
+
+class ProfilingMiddleware:
+    """Profile the requests to ``paths`` that :meth:`Profiler.should_profile` picks."""
+
+    def __init__(self, app: ASGIApp, profiler: Profiler, paths: tuple[str, ...]) -> None:
+        self.app = app
+        self.profiler = profiler
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"] not in self.paths
+            or not self.profiler.should_profile(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+        await self.profiler.run(self.app, scope, receive, send)
@@ -0,0 +1,69 @@
+"""The interface between the runtime and an extension's business logic."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Per-request metadata passed to :meth:`ExtensionService.process_async`."""
+
+    request_id: str | None = None
+    correlation_id: str | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "RequestContext":
+        return cls(
+            request_id=headers.get("x-ms-request-id"),
+            correlation_id=headers.get("x-ms-correlation-id"),
+        )
+
+
+class ExtensionService(ABC):
+    """Business logic behind ``POST /v1/process``.
+
+    The app factory calls :meth:`preload` during warm-up, reports
+    :meth:`is_ready` from the readiness probe and calls :meth:`close` on
+    shutdown; the sample's route calls :meth:`process_async`.
+    ``GET /debug/memory`` reports :meth:`cache_sizes`.
+    """
+
+    def load_shared(self) -> None:
+        """Load read-only data that forked workers can share.
+
+        The pre-fork launcher (:mod:`~dragon_extension_runtime.prefork`) calls
+        this once in the parent, before forking. Only build plain data here:
+        threads, pools, sockets and event-loop objects do not survive a fork
+        and belong in :meth:`preload`, which every worker still runs.
+        """
+
+    def preload(self) -> None:
+        """Load data files and build caches before the app reports ready."""
+
+    def is_ready(self) -> bool:
+        """Whether the service can take traffic (checked by the readiness probe)."""
+
+        return True
+
+    @abstractmethod
+    async def process_async(
+        self, payload: Any, context: RequestContext | None = None
+    ) -> BaseModel:
+        """Process one request payload and return the response model."""
+
+    def cache_sizes(self) -> dict[str, Any]:
+        """Sizes of the service's caches and other long-lived state, by name.
+
+        Used to tell which subsystem is growing when memory creeps; values
+        should be cheap to compute (entry counts, byte totals), never copies.
+        """
+
+        return {}
+
+    def close(self) -> None:
+        """Release pools, files and other resources on shutdown."""
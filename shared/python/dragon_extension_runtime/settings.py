@@ -0,0 +1,97 @@
+"""Settings shared by every extension built on the runtime.
+
+Each sample subclasses :class:`ExtensionSettings` and sets its own
+``model_config`` (environment prefix, ``.env`` file), so a field declared here
+is read from ``DCR_RAD_MAX_IN_FLIGHT_REQUESTS`` in the radiology sample and
+``DGEXT_MAX_IN_FLIGHT_REQUESTS`` in the physician sample.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class ExtensionSettings(BaseSettings):
+    """Settings consumed by :func:`~dragon_extension_runtime.create_app`."""
+
+    app_name: str = "Dragon Copilot Extension (Python)"
+    version: str = "0.0.1"
+    # Startup-optimized mode for scale-to-zero hosting: skips OpenAPI/Swagger
+    # (schema generation and the ``/docs`` + ``/`` routes) to cut cold start.
+    startup_optimized: bool = False
+    # Prime validators, data files and caches with a synthetic request during
+    # startup; the readiness probe stays unhealthy until this has finished.
+    warmup_enabled: bool = True
+    # Admission control for the processing endpoints: at most this many
+    # requests run at once (0 disables the limit), up to
+    # ``max_queued_requests`` more wait for a slot for at most
+    # ``queue_timeout_seconds``, and the rest are rejected with 503 and
+    # ``Retry-After`` instead of piling up behind a saturated worker.
+    max_in_flight_requests: int = Field(default=0, ge=0)
+    max_queued_requests: int = Field(default=0, ge=0)
+    queue_timeout_seconds: float = Field(default=5, gt=0)
+    # Asynchronous job mode (``Prefer: respond-async``): this many worker tasks
+    # (0 turns the mode off and processes every request synchronously), a queue
+    # of at most ``job_queue_size`` jobs, and results kept for
+    # ``job_ttl_seconds``. ``job_store`` is ``memory`` or ``sqlite`` (at
+    # ``job_store_path``, survives restarts). Callbacks (``X-Callback-Url``)
+    # are only made to hosts listed in ``job_callback_hosts``.
+    job_workers: int = Field(default=4, ge=0, le=256)
+    job_queue_size: int = Field(default=100, ge=1)
+    job_ttl_seconds: float = Field(default=3600, gt=0)
+    job_store: Literal["memory", "sqlite"] = "memory"
+    job_store_path: str = "jobs.sqlite3"
+    job_callback_hosts: list[str] = Field(default_factory=list)
+    job_callback_timeout_seconds: float = Field(default=10, gt=0)
+    # Audit log of processed requests (see ``audit.py``): IDs, sizes, entity
+    # counts and timings, buffered in memory and written in batches of
+    # ``audit_batch_size`` (or every ``audit_flush_interval_seconds``) to
+    # gzip-compressed NDJSON under ``audit_dir``. Files rotate at
+    # ``audit_max_file_mb`` and the newest ``audit_max_files`` are kept. At most
+    # ``audit_max_buffered_records`` wait for the disk; more are dropped.
+    # Outputs are included only with ``audit_include_outputs``, with the values
+    # of ``audit_redact_fields`` keys replaced.
+    audit_enabled: bool = False
+    audit_dir: str = "audit"
+    audit_batch_size: int = Field(default=256, ge=1)
+    audit_flush_interval_seconds: float = Field(default=1.0, gt=0)
+    audit_max_buffered_records: int = Field(default=10_000, ge=1)
+    audit_max_file_mb: int = Field(default=64, ge=1)
+    audit_max_files: int = Field(default=20, ge=1)
+    audit_include_outputs: bool = False
+    audit_redact_fields: list[str] = Field(default_factory=lambda: ["text", "content"])
+    # Distributed tracing (see ``tracing.py``): a span per request that
+    # continues the caller's W3C ``traceparent``, exported in batches to
+    # ``tracing_file_path`` (``file``) or an OTLP/HTTP collector at
+    # ``tracing_otlp_endpoint`` (``otlp``). ``none`` turns tracing off. New
+    # traces are sampled with probability ``tracing_sample_ratio``; a sampled
+    # caller is always followed.
+    tracing_exporter: Literal["none", "file", "otlp"] = "none"
+    tracing_sample_ratio: float = Field(default=1.0, ge=0, le=1)
+    tracing_file_path: str = "traces.ndjson"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_service_name: str | None = None
+    # Diagnostics under ``/debug`` (see ``debug.py``) are only served when
+    # ``debug_token`` is set, to callers that send it in ``x-debug-token``.
+    debug_token: str | None = None
+    # On-demand profiling (see ``profiling.py``): a request with
+    # ``x-debug-profile`` and the debug token, or a ``profiling_sample_rate``
+    # fraction of requests, is run under cProfile. The newest
+    # ``profiling_max_profiles`` reports are kept in ``profiling_dir``.
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = Field(default=0.0, ge=0, le=1)
+    profiling_dir: str = "profiles"
+    profiling_max_profiles: int = Field(default=20, ge=1)
+    # Contract checks (see ``contracts.py``): with ``contract_spec_path`` set
+    # to an OpenAPI spec, a ``contract_sample_rate`` fraction of successful
+    # ``/v1/process`` responses is checked against its ``contract_schema`` by a
+    # background task, and violations are counted per rule (``GET
+    # /debug/contracts``). At most ``contract_max_buffered`` responses wait to
+    # be checked; more are dropped.
+    contract_spec_path: str | None = None
+    contract_schema: str = "ProcessResponse"
+    contract_sample_rate: float = Field(default=0.01, ge=0, le=1)
+    contract_max_buffered: int = Field(default=1000, ge=1)
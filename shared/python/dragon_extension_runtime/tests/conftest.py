@@ -0,0 +1,11 @@
+"""Shared pytest fixtures for the extension runtime tests."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure ``shared/python`` (parent of the runtime package) is importable.
+RUNTIME_ROOT = Path(__file__).resolve().parents[2]
+if str(RUNTIME_ROOT) not in sys.path:
+    sys.path.insert(0, str(RUNTIME_ROOT))
@@ -0,0 +1,42 @@
+"""A tiny app for the pre-fork launcher tests, served in a subprocess."""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+
+from dragon_extension_runtime import ExtensionService, ExtensionSettings, create_app
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+
+class _Service(ExtensionService):
+    def __init__(self) -> None:
+        self.loaded_by: int | None = None
+
+    def load_shared(self) -> None:
+        self.loaded_by = os.getpid()
+
+    async def process_async(self, payload, context=None):
+        raise NotImplementedError
+
+
+async def _fail_if_asked() -> None:
+    if os.environ.get("PREFORK_TEST_FAIL_STARTUP"):
+        raise RuntimeError("startup failed on purpose")
+
+
+service = _Service()
+app = create_app(
+    ExtensionSettings(warmup_enabled=False),
+    service,
+    title="t",
+    logger=logger,
+    on_startup=[_fail_if_asked],
+)
+
+
+@app.get("/who")
+async def who() -> dict:
+    return {"pid": os.getpid(), "loadedBy": service.loaded_by, "frozen": gc.get_freeze_count()}
@@ -0,0 +1,172 @@
+"""App factory tests: lifespan, probes, middleware, encoding and admission control."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+
+from dragon_extension_runtime import (
+    AdmissionController,
+    ExtensionService,
+    ExtensionSettings,
+    HealthRoutes,
+    ModelResponse,
+    RequestContext,
+    RequestCounters,
+    create_app,
+    dumps,
+    loads,
+)
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+
+class _Reply(BaseModel):
+    success: bool = True
+    request_id: str | None = Field(default=None, alias="requestId")
+    note: str | None = None
+
+
+class _Service(ExtensionService):
+    def __init__(self) -> None:
+        self.events: list[str] = []
+        self.ready = True
+
+    def preload(self) -> None:
+        self.events.append("preload")
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+    async def process_async(self, payload, context: RequestContext | None = None) -> _Reply:
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+        return _Reply(requestId=context.request_id if context else None)
+
+    def close(self) -> None:
+        self.events.append("close")
+
+
+def _build(settings: ExtensionSettings | None = None, **kwargs) -> tuple[FastAPI, _Service]:
+    service = _Service()
+
+    async def warm_up(app: FastAPI) -> None:
+        service.events.append("warm_up")
+
+    app = create_app(
+        settings or ExtensionSettings(),
+        service,
+        title="Test extension",
+        logger=logger,
+        warm_up=warm_up,
+        on_startup=[lambda: service.events.append("startup")],
+        on_shutdown=[lambda: service.events.append("shutdown")],
+        **kwargs,
+    )
+
+    @app.post("/v1/process")
+    async def process(payload: dict) -> ModelResponse:
+        return ModelResponse(await service.process_async(payload, RequestContext(request_id="r")))
+
+    return app, service
+
+
+def test_lifespan_runs_hooks_preload_and_warm_up_in_order():
+    app, service = _build()
+
+    with TestClient(app) as client:
+        assert client.get("/health/readiness").json() == {"status": "Healthy"}
+
+    assert service.events == ["startup", "preload", "warm_up", "shutdown", "close"]
+
+
+def test_readiness_waits_for_warm_up_and_the_service():
+    app, service = _build(
+        health=HealthRoutes(
+            liveness_path="/health",
+            healthy=lambda: {"status": "healthy"},
+            unhealthy=lambda: {"status": "starting"},
+        )
+    )
+
+    assert TestClient(app).get("/health/readiness").status_code == 503
+    with TestClient(app) as client:
+        assert client.get("/health").json() == {"status": "healthy"}
+        assert client.get("/health/readiness").status_code == 200
+        service.ready = False
+        response = client.get("/health/readiness")
+        assert (response.status_code, response.json()) == (503, {"status": "starting"})
+
+
+def test_startup_optimized_mode_drops_openapi_and_redirect():
+    app, _ = _build(ExtensionSettings(startup_optimized=True, warmup_enabled=False))
+    client = TestClient(app, follow_redirects=False)
+
+    assert client.get("/openapi.json").status_code == 404
+    assert client.get("/").status_code == 404
+    app, _ = _build()
+    assert TestClient(app, follow_redirects=False).get("/").headers["location"] == "/docs"
+
+
+def test_model_response_uses_aliases_and_omits_none():
+    app, _ = _build()
+
+    response = TestClient(app).post("/v1/process", json={})
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == b'{"success":true,"requestId":"r"}'
+    assert dumps({"a": "é"}) == '{"a":"é"}'.encode("utf-8")
+    assert loads(dumps({"a": "é"})) == {"a": "é"}
+
+
+def test_unhandled_errors_become_json_500_and_reach_metrics(caplog):
+    metrics = RequestCounters()
+    app, _ = _build(metrics=metrics)
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        response = TestClient(app).post(
+            "/v1/process", json={"fail": True}, headers={"x-ms-correlation-id": "c-1"}
+        )
+
+    assert response.status_code == 500
+    assert response.json() == {"success": False, "error": "Internal server error"}
+    assert metrics.snapshot()["statuses"] == {"500": 1}
+    assert metrics.in_flight == 0
+    assert any("corr_id=c-1" in record.getMessage() for record in caplog.records)
+
+
+def test_admission_controller_queues_then_times_out():
+    async def scenario() -> list[bool]:
+        controller = AdmissionController(1, max_queued=1, queue_timeout_seconds=0.05)
+        assert await controller.acquire()
+        waiting = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        rejected = await controller.acquire()  # queue is full
+        timed_out = await waiting  # nobody released in time
+        controller.release()
+        admitted = await controller.acquire()
+        return [rejected, timed_out, admitted, controller.in_flight == 1]
+
+    assert asyncio.run(scenario()) == [False, False, True, True]
+
+
+def test_admission_middleware_answers_503_with_retry_after():
+    metrics = RequestCounters()
+    app, _ = _build(
+        ExtensionSettings(max_in_flight_requests=1, warmup_enabled=False), metrics=metrics
+    )
+    client = TestClient(app)
+    asyncio.run(app.state.admission.acquire())  # occupy the only slot
+
+    response = client.post("/v1/process", json={})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert response.json()["success"] is False
+    assert metrics.rejected == {"overloaded": 1}
+    # Health probes are never limited.
+    assert client.get("/health/liveness").status_code == 200
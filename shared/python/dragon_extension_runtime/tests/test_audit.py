@@ -0,0 +1,189 @@
+"""Audit log tests: batching, gzip NDJSON output, redaction, back-pressure and rotation."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+
+from fastapi import Header
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+
+from dragon_extension_runtime import (
+    AuditLog,
+    ExtensionService,
+    ExtensionSettings,
+    ModelResponse,
+    RequestContext,
+    create_app,
+    redact,
+)
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+
+class _Finding(BaseModel):
+    code: str
+    text: str
+    note: str | None = None
+
+
+class _Reply(BaseModel):
+    success: bool = True
+    findings: list[_Finding] = Field(default_factory=list)
+
+
+def _read(directory) -> list[dict]:
+    records = []
+    for path in sorted(directory.glob("audit-*.ndjson.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as stream:
+            records.extend(json.loads(line) for line in stream)
+    return records
+
+
+def test_redact_replaces_values_of_listed_keys_at_any_depth():
+    data = {"text": "secret", "items": [{"text": "x", "code": "E11.9"}], "value": None}
+
+    assert redact(data, frozenset({"text", "value"})) == {
+        "text": "[REDACTED]",
+        "items": [{"text": "[REDACTED]", "code": "E11.9"}],
+        "value": None,
+    }
+
+
+def test_records_are_flushed_in_batches_to_gzip_ndjson(tmp_path):
+    audit = AuditLog(tmp_path, batch_size=2, flush_interval_seconds=60)
+
+    async def run() -> None:
+        audit.start()
+        for i in range(5):
+            audit.record_exchange(
+                RequestContext(f"r-{i}", "c-1"),
+                request_bytes=10,
+                response_bytes=20,
+                seconds=0.0015,
+                counts={"entities": i},
+            )
+        # A full batch wakes the writer without waiting for the interval.
+        for _ in range(100):
+            if audit.written >= 4:
+                break
+            await asyncio.sleep(0.01)
+        assert audit.written >= 4
+        await audit.stop()
+
+    asyncio.run(run())
+    records = _read(tmp_path)
+
+    assert [record["requestId"] for record in records] == [f"r-{i}" for i in range(5)]
+    assert records[0]["correlationId"] == "c-1"
+    assert records[0]["durationMs"] == 1.5
+    assert records[4]["counts"] == {"entities": 4}
+    assert "output" not in records[0]
+
+
+def test_outputs_are_included_only_on_request_and_redacted(tmp_path):
+    reply = _Reply(findings=[_Finding(code="E11.9", text="patient is diabetic")])
+    audit = AuditLog(tmp_path, include_outputs=True, redact_fields=["text"])
+
+    async def run() -> None:
+        audit.start()
+        audit.record_exchange(None, output=reply)
+        audit.record_exchange(None, output=reply, exclude_none=False)
+        await audit.stop()
+
+    asyncio.run(run())
+    records = _read(tmp_path)
+
+    assert records[0]["output"] == {
+        "success": True,
+        "findings": [{"code": "E11.9", "text": "[REDACTED]"}],
+    }
+    assert records[1]["output"]["findings"][0]["note"] is None
+
+
+def test_full_buffer_drops_records_and_reports_the_count(tmp_path):
+    audit = AuditLog(tmp_path, max_buffered_records=3)
+
+    accepted = [audit.record({"n": i}) for i in range(5)]
+    asyncio.run(audit.flush())
+
+    assert accepted == [True, True, True, False, False]
+    assert audit.dropped == 2
+    records = _read(tmp_path)
+    assert records[:3] == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert records[3]["droppedRecords"] == 2
+
+
+def test_files_rotate_by_size_and_only_the_newest_are_kept(tmp_path):
+    audit = AuditLog(tmp_path, batch_size=1, max_file_bytes=1, max_files=2)
+    for i in range(4):
+        audit.record({"n": i, "padding": "x" * 200})
+        asyncio.run(audit.flush())
+
+    files = sorted(tmp_path.glob("audit-*.ndjson.gz"))
+    assert len(files) == 2
+    assert [record["n"] for record in _read(tmp_path)] == [2, 3]
+
+
+def test_unencodable_record_is_dropped_and_the_writer_keeps_running(tmp_path):
+    audit = AuditLog(tmp_path, batch_size=2, flush_interval_seconds=0.01)
+
+    async def run() -> None:
+        audit.start()
+        audit.record({"n": 0})
+        audit.record({"n": object()})
+        for _ in range(100):
+            if audit.written:
+                break
+            await asyncio.sleep(0.01)
+        audit.record({"n": 2})
+        await asyncio.sleep(0.05)
+        assert not audit._task.done()
+        await audit.stop()
+
+    asyncio.run(run())
+
+    records = _read(tmp_path)
+    assert [record.get("n") for record in records] == [0, None, 2]
+    assert records[1]["droppedRecords"] == 1
+
+
+def test_pruning_leaves_other_workers_files_alone(tmp_path):
+    sibling = tmp_path / "audit-20000101T000000000000Z-999999999.ndjson.gz"
+    sibling.write_bytes(gzip.compress(b'{"n": -1}\n'))
+    audit = AuditLog(tmp_path, batch_size=1, max_file_bytes=1, max_files=1)
+    for i in range(3):
+        audit.record({"n": i})
+        asyncio.run(audit.flush())
+
+    assert sibling.exists()
+    assert len(list(tmp_path.glob(f"audit-*-{os.getpid()}.ndjson.gz"))) == 1
+
+
+def test_create_app_starts_and_flushes_the_audit_log(tmp_path):
+    class Service(ExtensionService):
+        async def process_async(self, payload, context=None) -> _Reply:
+            return _Reply()
+
+    settings = ExtensionSettings(warmup_enabled=False, audit_enabled=True, audit_dir=str(tmp_path))
+    app = create_app(settings, Service(), title="t", logger=logger)
+
+    @app.post("/v1/process")
+    async def process(x_ms_request_id: str | None = Header(default=None, alias="x-ms-request-id")):
+        context = RequestContext(request_id=x_ms_request_id)
+        result = await app.state.service.process_async({}, context)
+        response = ModelResponse(result)
+        app.state.audit.record_exchange(context, response_bytes=len(response.body))
+        return response
+
+    with TestClient(app) as client:
+        client.post("/v1/process", json={}, headers={"x-ms-request-id": "r-9"})
+
+    records = _read(tmp_path)
+    assert [record["requestId"] for record in records] == ["r-9"]
+    assert records[0]["responseBytes"] == len(b'{"success":true,"findings":[]}')
+    assert ExtensionSettings().audit_enabled is False
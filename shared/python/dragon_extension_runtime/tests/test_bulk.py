@@ -0,0 +1,115 @@
+"""Bulk processing tests: pool dispatch, ordering, errors and checkpoint resume."""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+from dragon_extension_runtime import BulkStats, ExtensionService, RequestContext, run_bulk
+
+
+class _Payload(BaseModel):
+    text: str
+
+
+class _Reply(BaseModel):
+    upper: str
+    note: str | None = None
+
+
+class _UpperService(ExtensionService):
+    async def process_async(self, payload: _Payload, context: RequestContext | None = None):
+        if payload.text == "boom":
+            raise RuntimeError("cannot process")
+        return _Reply(upper=payload.text.upper())
+
+
+def create_service() -> _UpperService:
+    return _UpperService()
+
+
+def _write_input(path: Path, texts: list[str]) -> None:
+    with path.open("a", encoding="utf-8") as stream:
+        for text in texts:
+            stream.write(json.dumps({"text": text}) + "\n\n")  # blank lines are skipped
+
+
+def _run(inputs: list[Path], **kwargs) -> tuple[list[dict], BulkStats]:
+    output = io.BytesIO()
+    stats = run_bulk(
+        [str(path) for path in inputs], output, create_service, _Payload, **kwargs
+    )
+    return [json.loads(line) for line in output.getvalue().splitlines()], stats
+
+
+def test_pool_output_matches_inline_and_keeps_input_order(tmp_path):
+    first, second = tmp_path / "a.ndjson", tmp_path / "b.ndjson"
+    _write_input(first, [f"note {i}" for i in range(50)])
+    _write_input(second, ["boom", "last"])
+
+    inline, _ = _run([first, second], workers=0, chunk_size=7)
+    pooled, stats = _run([first, second], workers=2, chunk_size=7)
+
+    assert pooled == inline
+    assert [record["record"] for record in pooled] == list(range(1, 53))
+    assert pooled[0] == {"record": 1, "response": {"upper": "NOTE 0"}}
+    assert pooled[50]["error"] == "RuntimeError: cannot process"
+    assert (stats.records, stats.errors) == (52, 1)
+
+
+def test_unordered_mode_writes_every_record_once(tmp_path):
+    path = tmp_path / "in.ndjson"
+    _write_input(path, [f"note {i}" for i in range(40)])
+
+    records, _ = _run([path], workers=2, chunk_size=3, ordered=False)
+
+    assert sorted(record["record"] for record in records) == list(range(1, 41))
+
+
+def test_checkpoint_resumes_after_the_last_written_record(tmp_path):
+    path, checkpoint = tmp_path / "in.ndjson", tmp_path / "run.ckpt"
+    _write_input(path, ["a", "b", "c"])
+    _run([path], checkpoint=checkpoint, chunk_size=2)
+    assert json.loads(checkpoint.read_text())["completed"] == 3
+
+    _write_input(path, ["d", "e"])
+    records, stats = _run([path], checkpoint=checkpoint)
+
+    assert [record["record"] for record in records] == [4, 5]
+    assert stats.skipped == 3
+    with pytest.raises(ValueError):
+        _run([path, path], checkpoint=checkpoint)
+
+
+def test_resume_truncates_output_written_after_the_checkpoint(tmp_path):
+    path, checkpoint, out = tmp_path / "in.ndjson", tmp_path / "run.ckpt", tmp_path / "out.ndjson"
+    _write_input(path, ["a", "b", "c"])
+    with out.open("wb") as output:
+        run_bulk([str(path)], output, create_service, _Payload, checkpoint=checkpoint)
+    assert json.loads(checkpoint.read_text())["offset"] == out.stat().st_size
+
+    # a crash after more lines were written but before they were checkpointed
+    _write_input(path, ["d", "e"])
+    with out.open("ab") as output:
+        output.write(b'{"record":4,"response":{"upper":"D"}}\n{"record":5,"resp')
+    with out.open("ab") as output:
+        stats = run_bulk([str(path)], output, create_service, _Payload, checkpoint=checkpoint)
+
+    records = [json.loads(line) for line in out.read_bytes().splitlines()]
+    assert [record["record"] for record in records] == [1, 2, 3, 4, 5]
+    assert (stats.skipped, stats.records) == (3, 2)
+
+
+def test_invalid_records_are_reported_not_fatal(tmp_path):
+    path = tmp_path / "in.ndjson"
+    path.write_text('{"text": "ok"}\nnot json\n{"other": 1}\n', encoding="utf-8")
+
+    records, stats = _run([path])
+
+    assert "response" in records[0]
+    assert records[1]["error"].startswith("ValidationError")
+    assert stats.errors == 2
@@ -0,0 +1,209 @@
+"""Contract validator tests: compiled rules, discriminated branches and sampled background checks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from dragon_extension_runtime import (
+    ContractValidator,
+    ExtensionService,
+    ExtensionSettings,
+    ModelResponse,
+    create_app,
+)
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+TOKEN = "s3cret-debug-token"
+
+SPEC = {
+    "openapi": "3.0.0",
+    "components": {
+        "schemas": {
+            "Response": {
+                "type": "object",
+                "required": ["success"],
+                "properties": {
+                    "success": {"type": "boolean"},
+                    "message": {"type": "string", "nullable": True},
+                    "payload": {"type": "object", "additionalProperties": {"$ref": "#/components/schemas/Result"}},
+                },
+            },
+            "Result": {
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {"anyOf": [{"$ref": "#/components/schemas/Card"}, {"$ref": "#/components/schemas/Code"}]},
+                    }
+                },
+            },
+            "Card": {
+                "type": "object",
+                "required": ["id", "type"],
+                "properties": {
+                    "id": {"type": "string"},
+                    "type": {"type": "string", "enum": ["AdaptiveCard"]},
+                    "references": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["id"],
+                            "properties": {"id": {"type": "string"}, "type": {"type": "string", "enum": ["Note", "Web"]}},
+                            "additionalProperties": False,
+                        },
+                    },
+                },
+            },
+            "Code": {
+                "type": "object",
+                "required": ["code"],
+                "properties": {
+                    "code": {"type": "string", "minLength": 1},
+                    "score": {"type": "number", "minimum": 0, "maximum": 100},
+                    "tree": {"$ref": "#/components/schemas/Code"},
+                },
+            },
+        }
+    },
+}
+
+
+def test_violations_are_reported_per_rule():
+    validator = ContractValidator(SPEC, schema="Response")
+    document = {
+        "success": "yes",
+        "message": None,
+        "payload": {
+            "out": {
+                "items": [
+                    {"id": "c-1", "type": "AdaptiveCard", "references": [{"id": 1, "type": "Pdf", "page": 2}]},
+                    {"type": "Code", "code": "", "score": 120, "tree": {"tree": {}}},
+                    {"id": 5},
+                ]
+            }
+        },
+    }
+
+    assert validator.validate(document) == [
+        "Response.success: type",
+        "Card.references[].id: type",
+        "Card.references[].type: enum",
+        "Card.references[]: additionalProperties",
+        "Code.code: minLength",
+        "Code.score: maximum",
+        "Code.code: required",
+        "Code.code: required",
+        "Result.items[]: anyOf",
+    ]
+    assert validator.validate({"success": True, "payload": {"out": {"items": [{"code": "E11.9"}]}}}) == []
+    assert validator.validate({"code": "x", "score": -1}, schema="Code") == ["Code.score: minimum"]
+
+
+def test_a_branch_is_picked_by_type_so_a_broken_card_is_not_accepted_as_another_schema():
+    validator = ContractValidator(SPEC, schema="Result")
+
+    # Without a type the card would satisfy neither branch; with it only Card's rules apply.
+    assert validator.validate({"items": [{"type": "AdaptiveCard", "code": "x"}]}) == ["Card.id: required"]
+    assert validator.validate({"items": [{"type": "Code"}]}) == ["Code.code: required"]
+
+
+def test_unknown_schema_fails_at_startup():
+    with pytest.raises(ValueError, match="no schema 'Missing'"):
+        ContractValidator(SPEC, schema="Missing")
+
+
+@pytest.mark.parametrize(
+    "spec",
+    ["physician/physician-extensibility-api.yaml", "radiologists/radiologists-extensibility-api.yaml"],
+)
+def test_the_repository_specs_compile(spec):
+    validator = ContractValidator(REPO_ROOT / spec)
+
+    assert validator.validate({"success": True, "message": "ok", "payload": {}}) == []
+    assert validator.validate({"success": 1}) == ["ProcessResponse.success: type"]
+
+
+def test_sampled_bodies_are_checked_in_the_background(caplog):
+    validator = ContractValidator(SPEC, schema="Response", sample_rate=1.0, max_buffered=2)
+    bad = json.dumps({"success": True, "payload": {"out": {"items": [{"type": "AdaptiveCard"}]}}}).encode()
+
+    async def run() -> None:
+        validator.start()
+        assert validator.submit(bad)
+        assert validator.submit(b"not json")
+        assert not validator.submit(bad)  # buffer full
+        for _ in range(100):
+            if validator.checked == 2:
+                break
+            await asyncio.sleep(0.01)
+        validator.submit(bad)
+        await validator.drain()
+        await validator.stop()
+
+    with caplog.at_level(logging.WARNING, logger="dragon.extension.runtime"):
+        asyncio.run(run())
+
+    report = validator.report()
+    assert report["sampled"] == 4
+    assert report["checked"] == 3
+    assert report["dropped"] == 1
+    assert report["undecodable"] == 1
+    assert report["nonConforming"] == 2
+    assert report["violations"] == {"Card.id: required": 2}
+    assert sum("Card.id: required" in record.message for record in caplog.records) == 1
+
+
+def test_unsampled_responses_are_not_queued():
+    validator = ContractValidator(SPEC, schema="Response", sample_rate=0.0)
+
+    assert not any(validator.submit(b"{}") for _ in range(100))
+    assert validator.report()["sampled"] == 0
+
+
+class _Reply(BaseModel):
+    success: bool = True
+    payload: dict = {}
+
+
+def test_app_checks_sampled_responses_and_serves_the_report(tmp_path):
+    class Service(ExtensionService):
+        async def process_async(self, payload, context=None) -> _Reply:
+            return _Reply(payload={"out": {"items": [{"id": "c", "type": "AdaptiveCard", "references": [{}]}]}})
+
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC), encoding="utf-8")
+    settings = ExtensionSettings(
+        warmup_enabled=False,
+        debug_token=TOKEN,
+        contract_spec_path=str(spec),
+        contract_schema="Response",
+        contract_sample_rate=1.0,
+    )
+    app = create_app(settings, Service(), title="t", logger=logger)
+
+    @app.post("/v1/process")
+    async def process() -> ModelResponse:
+        response = ModelResponse(await app.state.service.process_async({}))
+        app.state.contracts.submit(response.body)
+        return response
+
+    with TestClient(app) as client:
+        assert client.post("/v1/process").status_code == 200
+        for _ in range(100):
+            report = client.get("/debug/contracts", headers={"x-debug-token": TOKEN}).json()
+            if report["checked"]:
+                break
+            time.sleep(0.01)
+        assert client.get("/debug/contracts").status_code == 404
+
+    assert report["violations"] == {"Card.references[].id: required": 1}
@@ -0,0 +1,143 @@
+"""Engine registry tests: lazy loading, sharing, LRU budget and idle eviction."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from dragon_extension_runtime import EngineRegistry, estimate_size, safe_path_segment
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _registry(budget: int = 1000, max_idle: float = 0, clock=time.monotonic, loads=None):
+    loads = [] if loads is None else loads
+
+    def load(source):
+        loads.append(source)
+        return {"source": source}
+
+    return EngineRegistry(
+        resolve=lambda environment, language: (environment or "default", language or "en-US"),
+        load=load,
+        memory_budget_bytes=budget,
+        max_idle_seconds=max_idle,
+        size_of=lambda engine: 100,
+        clock=clock,
+    )
+
+
+def test_engines_load_lazily_once_per_source():
+    loads = []
+    registry = _registry(loads=loads)
+
+    first = registry.get("env-a", "en-US")
+    again = registry.get("env-a", "en-US")
+    registry.get("env-a", "de-DE")
+
+    assert first is again
+    assert loads == [("env-a", "en-US"), ("env-a", "de-DE")]
+    assert (registry.hits, registry.misses) == (1, 2)
+
+
+def test_concurrent_first_requests_share_one_load():
+    loads = []
+    gate = threading.Event()
+
+    def slow_load(source):
+        gate.wait(1)
+        loads.append(source)
+        return object()
+
+    registry = EngineRegistry(
+        resolve=lambda environment, language: environment,
+        load=slow_load,
+        memory_budget_bytes=10**6,
+    )
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("env"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ["env"]
+    assert len({id(engine) for engine in results}) == 1
+
+
+def test_least_recently_used_engine_is_evicted_over_budget():
+    registry = _registry(budget=250)
+
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # "b" is now the least recently used
+    registry.get("c")
+
+    assert ("a", "en-US") in registry and ("c", "en-US") in registry
+    assert ("b", "en-US") not in registry
+    assert registry.bytes_used == 200
+    assert registry.evictions == 1
+
+
+def test_cold_engines_are_evicted_after_the_idle_timeout():
+    clock = _FakeClock()
+    registry = _registry(max_idle=60, clock=clock)
+
+    registry.get("a")
+    clock.now = 30
+    registry.get("b")
+    clock.now = 75
+    registry.get("b")
+
+    assert ("a", "en-US") not in registry
+    assert ("b", "en-US") in registry
+
+
+def test_resolved_sources_are_memoized_until_eviction_or_clear():
+    resolved = []
+
+    def resolve(environment, language):
+        resolved.append(environment)
+        return environment
+
+    registry = EngineRegistry(
+        resolve=resolve,
+        load=lambda source: {"source": source},
+        memory_budget_bytes=150,
+        size_of=lambda engine: 100,
+    )
+
+    registry.get("env-a")
+    registry.get("env-a")
+    assert resolved == ["env-a"]
+
+    registry.get("env-b")  # over budget: env-a's engine and its resolution are dropped
+    registry.get("env-b")
+    registry.get("env-a")
+    assert resolved == ["env-a", "env-b", "env-a"]
+
+    registry.clear()
+    registry.get("env-a")
+    assert resolved == ["env-a", "env-b", "env-a", "env-a"]
+
+
+def test_estimate_size_counts_nested_containers():
+    small = estimate_size({"k": [1, 2]})
+    large = estimate_size({"k": [str(i) * 10 for i in range(1000)]})
+
+    assert large > small * 10
+
+
+def test_safe_path_segment_rejects_traversal():
+    assert safe_path_segment("01bd0d47-1621-4a29-941d-00e9a9420f20") is not None
+    assert safe_path_segment("en-US") == "en-US"
+    for value in (None, "", "..", "../etc", "a/b", "a\\b", ".hidden", "a..b"):
+        assert safe_path_segment(value) is None
+
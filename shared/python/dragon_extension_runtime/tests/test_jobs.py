@@ -0,0 +1,337 @@
+"""Asynchronous job mode tests: 202 + polling, failures, back-pressure, stores and callbacks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from fastapi import FastAPI, Header, Request
+from fastapi.testclient import TestClient
+import pytest
+from pydantic import BaseModel, Field
+
+from dragon_extension_runtime import (
+    ExtensionService,
+    ExtensionSettings,
+    InMemoryJobStore,
+    Job,
+    JobManager,
+    ModelResponse,
+    RequestContext,
+    SqliteJobStore,
+    create_app,
+    respond_async_requested,
+)
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+
+class _Reply(BaseModel):
+    success: bool = True
+    note: str | None = None
+    request_id: str | None = Field(default=None, alias="requestId")
+
+
+class _Service(ExtensionService):
+    def __init__(self) -> None:
+        self.gate: asyncio.Event | None = None
+
+    async def process_async(self, payload, context: RequestContext | None = None) -> _Reply:
+        if self.gate is not None:
+            await self.gate.wait()
+        if payload.get("fail"):
+            raise RuntimeError("secret detail")
+        return _Reply(note=payload.get("note"), requestId=context.request_id if context else None)
+
+
+def _build(**settings) -> tuple[FastAPI, _Service]:
+    service = _Service()
+    app = create_app(
+        ExtensionSettings(warmup_enabled=False, **settings), service, title="t", logger=logger
+    )
+
+    @app.post("/v1/process")
+    async def process(
+        request: Request,
+        prefer: str | None = Header(default=None),
+        x_callback_url: str | None = Header(default=None, alias="x-callback-url"),
+    ):
+        payload = await request.json()
+        context = RequestContext(request_id="r-1")
+        if app.state.jobs is not None and respond_async_requested(prefer):
+            return await app.state.jobs.accept(
+                lambda: service.process_async(payload, context), callback_url=x_callback_url
+            )
+        return ModelResponse(await service.process_async(payload, context))
+
+    return app, service
+
+
+def _poll(client: TestClient, url: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        body = client.get(url).json()
+        if body["status"] in ("succeeded", "failed"):
+            return body
+        time.sleep(0.01)
+    raise AssertionError(f"job at {url} did not finish")
+
+
+def test_respond_async_requested_parses_prefer_header():
+    assert respond_async_requested("respond-async")
+    assert respond_async_requested("return=minimal, Respond-Async; wait=10")
+    assert not respond_async_requested(None)
+    assert not respond_async_requested("return=representation")
+
+
+def test_accepted_job_is_polled_to_the_synchronous_result():
+    app, _ = _build()
+    with TestClient(app) as client:
+        sync = client.post("/v1/process", json={"note": "hi"})
+        accepted = client.post("/v1/process", json={"note": "hi"}, headers={"Prefer": "respond-async"})
+
+        assert accepted.status_code == 202
+        body = accepted.json()
+        assert body["status"] == "queued"
+        assert accepted.headers["location"] == body["statusUrl"] == f"/v1/jobs/{body['jobId']}"
+        assert accepted.headers["retry-after"] == "1"
+
+        job = _poll(client, accepted.headers["location"])
+        assert job["status"] == "succeeded"
+        assert job["result"] == sync.json()
+        assert client.get("/v1/jobs/unknown").status_code == 404
+
+
+def test_failed_job_reports_a_generic_error():
+    app, _ = _build()
+    with TestClient(app) as client:
+        accepted = client.post("/v1/process", json={"fail": True}, headers={"Prefer": "respond-async"})
+        job = _poll(client, accepted.headers["location"])
+
+    assert job["status"] == "failed"
+    assert job["error"] == "Processing failed."
+    assert "result" not in job
+
+
+def test_full_queue_is_rejected_with_503():
+    app, service = _build(job_workers=1, job_queue_size=1)
+    with TestClient(app) as client:
+        service.gate = client.portal.call(asyncio.Event)
+        headers = {"Prefer": "respond-async"}
+        first = client.post("/v1/process", json={}, headers=headers)
+        _wait_for(lambda: client.get(first.headers["location"]).json()["status"] == "running")
+        assert client.post("/v1/process", json={}, headers=headers).status_code == 202
+
+        rejected = client.post("/v1/process", json={}, headers=headers)
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "5"
+
+        client.portal.call(service.gate.set)
+        assert _poll(client, first.headers["location"])["status"] == "succeeded"
+
+
+def test_jobs_are_off_when_no_workers_are_configured():
+    app, _ = _build(job_workers=0)
+    with TestClient(app) as client:
+        response = client.post("/v1/process", json={"note": "x"}, headers={"Prefer": "respond-async"})
+
+    assert response.status_code == 200
+    assert app.state.jobs is None
+
+
+def test_callback_host_must_be_allowed():
+    app, _ = _build(job_callback_hosts=["callbacks.example.com"])
+    with TestClient(app) as client:
+        for url in ("http://169.254.169.254/latest", "file:///etc/passwd", "callbacks.example.com"):
+            response = client.post(
+                "/v1/process",
+                json={},
+                headers={"Prefer": "respond-async", "X-Callback-Url": url},
+            )
+            assert response.status_code == 400
+
+        allowed = client.post(
+            "/v1/process",
+            json={},
+            headers={"Prefer": "respond-async", "X-Callback-Url": "https://callbacks.example.com/done"},
+        )
+        assert allowed.status_code == 202
+
+
+def test_callback_receives_the_job_document():
+    received: list[dict] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 - http.server API
+            received.append(json.loads(self.rfile.read(int(self.headers["content-length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        app, _ = _build(job_callback_hosts=["127.0.0.1"])
+        with TestClient(app) as client:
+            accepted = client.post(
+                "/v1/process",
+                json={"note": "cb"},
+                headers={
+                    "Prefer": "respond-async",
+                    "X-Callback-Url": f"http://127.0.0.1:{server.server_port}/done",
+                },
+            )
+            _wait_for(lambda: received)
+    finally:
+        server.shutdown()
+
+    assert received[0]["jobId"] == accepted.json()["jobId"]
+    assert received[0]["status"] == "succeeded"
+    assert received[0]["result"]["note"] == "cb"
+
+
+def test_expired_jobs_are_hidden_and_purged():
+    store = InMemoryJobStore()
+    now = time.time()
+    store.put(Job("old", "succeeded", now - 20, now - 20, now - 10, result=b"{}"))
+    store.put(Job("new", "succeeded", now, now, now + 60, result=b"{}"))
+
+    assert store.get("old") is None
+    assert store.purge_expired(now) == 1
+    assert len(store) == 1
+    assert store.get("new") is not None
+
+
+def test_sqlite_store_survives_restarts_and_fails_unfinished_jobs(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    now = time.time()
+    store = SqliteJobStore(path)
+    store.put(Job("done", "succeeded", now, now, now + 60, result=b'{"success":true}'))
+    store.put(Job("busy", "running", now, now, now + 60))
+    store.close()
+
+    manager = JobManager(SqliteJobStore(path), workers=1, queue_size=1, ttl_seconds=60)
+
+    async def restart() -> None:
+        await manager.start()
+        await manager.stop()
+
+    asyncio.run(restart())
+    reopened = SqliteJobStore(path)
+    try:
+        assert json.loads(reopened.get("done").document())["result"] == {"success": True}
+        busy = json.loads(reopened.get("busy").document())
+        assert busy["status"] == "failed"
+        assert busy["error"] == "Interrupted by a service restart."
+    finally:
+        reopened.close()
+
+
+def test_sqlite_store_only_fails_jobs_of_stopped_processes(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    now = time.time()
+    sibling = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    store = SqliteJobStore(path)
+    try:
+        for job_id in ("sibling", "exited", "legacy"):
+            store.put(Job(job_id, "running", now, now, now + 60))
+        with sqlite3.connect(path) as db:
+            db.execute("UPDATE jobs SET owner = ? WHERE id = 'sibling'", (sibling.pid,))
+            db.execute("UPDATE jobs SET owner = ? WHERE id = 'exited'", (exited.pid,))
+            db.execute("UPDATE jobs SET owner = NULL WHERE id = 'legacy'")
+
+        assert store.fail_unfinished("gone", now) == 2
+        assert store.get("sibling").status == "running"
+        assert store.get("exited").status == "failed"
+        assert store.get("legacy").status == "failed"
+    finally:
+        store.close()
+        sibling.kill()
+        sibling.wait()
+
+
+def test_sqlite_store_is_called_off_the_event_loop(tmp_path):
+    calls = []
+
+    class Store(SqliteJobStore):
+        def put(self, job):
+            calls.append(threading.get_ident())
+            super().put(job)
+
+        def get(self, job_id):
+            calls.append(threading.get_ident())
+            return super().get(job_id)
+
+    manager = JobManager(
+        Store(str(tmp_path / "jobs.sqlite3")), workers=1, queue_size=2, ttl_seconds=60
+    )
+
+    async def run() -> str:
+        await manager.start()
+        try:
+            job = await manager.submit(lambda: asyncio.sleep(0, _Reply(note="x")))
+            for _ in range(100):
+                if (await manager.get(job.id)).status == "succeeded":
+                    break
+                await asyncio.sleep(0.01)
+            return (await manager.get(job.id)).status
+        finally:
+            await manager.stop()
+
+    assert asyncio.run(run()) == "succeeded"
+    assert calls and threading.get_ident() not in calls
+    assert len(set(calls)) == 1  # one store thread keeps the writes in order
+    with sqlite3.connect(str(tmp_path / "jobs.sqlite3")) as db:
+        statuses = db.execute("SELECT status FROM jobs").fetchall()
+    assert statuses == [("succeeded",)]
+
+
+def test_sqlite_store_has_a_short_busy_timeout(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+    try:
+        assert store.get("none") is None
+        assert store._connection.execute("PRAGMA busy_timeout").fetchone() == (1000,)
+    finally:
+        store.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_sqlite_store_opens_a_connection_per_process(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+    now = time.time()
+    store.put(Job("parent", "succeeded", now, now, now + 60, result=b"{}"))
+    inherited = store._connection
+
+    pid = os.fork()
+    if pid == 0:  # the child writes through its own connection, then exits at once
+        store.put(Job("child", "succeeded", now, now, now + 60, result=b"{}"))
+        os._exit(0 if store._connection is not inherited else 1)
+    _, status = os.waitpid(pid, 0)
+
+    try:
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert store._connection is inherited
+        assert store.get("child") is not None
+    finally:
+        store.close()
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
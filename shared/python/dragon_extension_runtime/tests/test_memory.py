@@ -0,0 +1,116 @@
+"""Memory diagnostics tests: the GC/cache report and tracemalloc snapshots and diffs."""
+
+from __future__ import annotations
+
+import logging
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from dragon_extension_runtime import ExtensionService, ExtensionSettings, ModelResponse, create_app
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+TOKEN = "s3cret-debug-token"
+DEBUG = {"x-debug-token": TOKEN}
+
+
+class _Reply(BaseModel):
+    kept: int
+
+
+class _LeakyService(ExtensionService):
+    def __init__(self) -> None:
+        self.kept: list[bytes] = []
+
+    async def process_async(self, payload, context=None) -> _Reply:
+        self.kept.append(bytes(64 * 1024))
+        return _Reply(kept=len(self.kept))
+
+    def cache_sizes(self) -> dict:
+        return {"kept": len(self.kept)}
+
+
+@pytest.fixture(autouse=True)
+def _no_tracing_left_behind():
+    was_tracing = tracemalloc.is_tracing()
+    yield
+    if tracemalloc.is_tracing() and not was_tracing:
+        tracemalloc.stop()
+
+
+def _build(**settings):
+    service = _LeakyService()
+    options = {"warmup_enabled": False, "debug_token": TOKEN, **settings}
+    app = create_app(ExtensionSettings(**options), service, title="t", logger=logger)
+
+    @app.post("/v1/process")
+    async def process() -> ModelResponse:
+        return ModelResponse(await service.process_async({}))
+
+    return app
+
+
+def test_report_includes_gc_state_and_the_service_caches():
+    with TestClient(_build()) as client:
+        client.post("/v1/process")
+        report = client.get("/debug/memory", headers=DEBUG).json()
+
+    assert report["caches"] == {"kept": 1}
+    assert len(report["gc"]["counts"]) == 3
+    assert len(report["gc"]["generations"]) == 3
+    assert report["rssBytes"] > 0
+
+
+def test_snapshot_diff_points_at_the_growing_site():
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc already running (e.g. python -X tracemalloc)")
+    with TestClient(_build()) as client:
+        status = client.post("/debug/memory/tracemalloc/start", params={"frames": 2}, headers=DEBUG).json()
+        assert status["tracing"] is True and status["frames"] == 2
+
+        base = client.post("/debug/memory/snapshots", headers=DEBUG).json()
+        for _ in range(20):
+            client.post("/v1/process")
+        current = client.post("/debug/memory/snapshots", params={"limit": 5}, headers=DEBUG).json()
+        diff = client.get(
+            "/debug/memory/diff", params={"base": base["id"], "current": current["id"]}, headers=DEBUG
+        ).json()
+        again = client.get(f"/debug/memory/snapshots/{current['id']}", headers=DEBUG).json()
+
+        stopped = client.post("/debug/memory/tracemalloc/stop", headers=DEBUG).json()
+
+    assert len(current["top"]) == 5
+    assert again["top"][0] == current["top"][0]
+    growth = diff["top"][0]
+    assert "test_memory.py" in growth["site"]
+    assert growth["sizeDiffBytes"] >= 20 * 64 * 1024
+    assert growth["countDiff"] >= 20
+    assert stopped == {"tracing": False, "snapshots": []}
+
+
+def test_snapshots_need_tracemalloc_and_are_bounded():
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc already running (e.g. python -X tracemalloc)")
+    app = _build()
+    with TestClient(app) as client:
+        assert client.post("/debug/memory/snapshots", headers=DEBUG).status_code == 409
+        client.post("/debug/memory/tracemalloc/start", headers=DEBUG)
+        ids = [client.post("/debug/memory/snapshots", params={"limit": 1}, headers=DEBUG).json()["id"] for _ in range(7)]
+        listed = [s["id"] for s in client.get("/debug/memory", headers=DEBUG).json()["tracemalloc"]["snapshots"]]
+        assert client.get(f"/debug/memory/snapshots/{ids[0]}", headers=DEBUG).status_code == 404
+        assert client.get("/debug/memory/diff", params={"base": ids[0], "current": ids[-1]}, headers=DEBUG).status_code == 404
+        assert client.post("/debug/memory/snapshots", params={"group_by": "nope"}, headers=DEBUG).status_code == 422
+
+    assert listed == ids[-5:]
+    assert not tracemalloc.is_tracing()  # stopped on shutdown, since the app started it
+
+
+def test_memory_routes_are_guarded():
+    with TestClient(_build()) as client:
+        assert client.get("/debug/memory").status_code == 404
+        assert client.post("/debug/memory/tracemalloc/start", headers={"x-debug-token": "nope"}).status_code == 404
+
+    assert _build(debug_token=None).state.memory is None
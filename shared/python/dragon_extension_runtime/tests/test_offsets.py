@@ -0,0 +1,67 @@
+"""Offset index tests: conversions against the encoded text, boundaries inside characters."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from dragon_extension_runtime import OffsetIndex
+
+TEXTS = [
+    "",
+    "No acute cardiopulmonary abnormality.",
+    "Hépatique 😀 steatosis",
+    "中文报告 ß \U0001F9E0\U0001F9E0 end",
+    "😀",
+]
+
+
+def _utf16(text: str, index: int) -> int:
+    return len(text[:index].encode("utf-16-le")) // 2
+
+
+def _utf8(text: str, index: int) -> int:
+    return len(text[:index].encode("utf-8"))
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_conversions_match_the_encoded_text(text):
+    offsets = OffsetIndex(text)
+
+    assert offsets.utf16_length == _utf16(text, len(text))
+    assert offsets.utf8_length == _utf8(text, len(text))
+    for index in range(len(text) + 1):
+        assert offsets.utf16(index) == _utf16(text, index)
+        assert offsets.utf8(index) == _utf8(text, index)
+        assert offsets.from_utf16(offsets.utf16(index)) == index
+        assert offsets.from_utf8(offsets.utf8(index)) == index
+
+
+def test_random_texts_round_trip():
+    rng = random.Random(7)
+    alphabet = "ab .é中😀\U0001F9E0ß\n"
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        offsets = OffsetIndex(text)
+        for index in range(len(text) + 1):
+            assert offsets.utf16(index) == _utf16(text, index)
+            assert offsets.from_utf8(_utf8(text, index)) == index
+
+
+def test_offsets_inside_a_character_map_to_its_start():
+    text = "a😀b"
+    offsets = OffsetIndex(text)
+
+    # UTF-16: a=0, 😀=1..2, b=3; UTF-8: a=0, 😀=1..4, b=5
+    assert [offsets.from_utf16(u) for u in range(5)] == [0, 1, 1, 2, 3]
+    assert [offsets.from_utf8(b) for b in range(7)] == [0, 1, 1, 1, 1, 2, 3]
+    assert offsets.utf16_span(1, 3) == (1, 4)
+
+
+def test_ascii_text_converts_to_itself():
+    offsets = OffsetIndex("Chest X-ray performed with for views.")
+
+    assert offsets.is_ascii
+    assert (offsets.utf16(10), offsets.utf8(10), offsets.from_utf16(10), offsets.from_utf8(10)) == (10, 10, 10, 10)
+    assert not OffsetIndex("é").is_ascii
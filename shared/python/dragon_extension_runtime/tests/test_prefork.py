@@ -0,0 +1,100 @@
+"""Pre-fork launcher tests: shared state, worker replacement, rolling restart and shutdown."""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+RUNTIME_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _launch(port: int, workers: int, **env) -> subprocess.Popen:
+    code = (
+        "from dragon_extension_runtime.prefork import serve; raise SystemExit(serve("
+        f"'dragon_extension_runtime.tests.prefork_app:app', host='127.0.0.1', port={port},"
+        f" workers={workers}, graceful_timeout_seconds=5, log_level='warning'))"
+    )
+    return subprocess.Popen(
+        [sys.executable, "-c", code],
+        cwd=RUNTIME_ROOT,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _workers(parent: int) -> set[int]:
+    children = Path(f"/proc/{parent}/task/{parent}/children")
+    return {int(pid) for pid in children.read_text().split()} if children.exists() else set()
+
+
+def _wait_for(condition, timeout: float = 20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = condition()
+        if value:
+            return value
+        time.sleep(0.05)
+    raise AssertionError("timed out")
+
+
+def _who(port: int) -> dict | None:
+    try:
+        return httpx.get(f"http://127.0.0.1:{port}/who", timeout=2).json()
+    except httpx.HTTPError:
+        return None
+
+
+@pytest.mark.skipif(not Path("/proc/self/task").exists(), reason="lists workers via /proc")
+def test_workers_share_parent_state_and_are_replaced():
+    port = _free_port()
+    server = _launch(port, workers=2)
+    try:
+        who = _wait_for(lambda: _who(port))
+        first = _wait_for(lambda: len(_workers(server.pid)) == 2 and _workers(server.pid))
+        assert who["loadedBy"] == server.pid  # loaded once, before forking
+        assert who["pid"] in first
+        assert who["frozen"] > 0
+
+        crashed = min(first)
+        os.kill(crashed, signal.SIGKILL)
+        after_crash = _wait_for(
+            lambda: (w := _workers(server.pid)) and len(w) == 2 and crashed not in w and w
+        )
+
+        server.send_signal(signal.SIGHUP)
+        _wait_for(lambda: (w := _workers(server.pid)) and len(w) == 2 and not w & after_crash)
+        assert _wait_for(lambda: _who(port))["loadedBy"] == server.pid
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=20) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+
+
+def test_launcher_gives_up_when_workers_cannot_start():
+    server = _launch(_free_port(), workers=1, PREFORK_TEST_FAIL_STARTUP="1")
+    try:
+        assert server.wait(timeout=30) == 1
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
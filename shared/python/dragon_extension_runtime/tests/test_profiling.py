@@ -0,0 +1,114 @@
+"""On-demand profiling tests: triggers, the profile ring and the guarded /debug routes."""
+
+from __future__ import annotations
+
+import logging
+import pstats
+
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from dragon_extension_runtime import ExtensionService, ExtensionSettings, ModelResponse, create_app
+from dragon_extension_runtime.profiling import ProfilingMiddleware
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+TOKEN = "s3cret-debug-token"
+PROFILE = {"x-debug-profile": "true", "x-debug-token": TOKEN}
+
+
+class _Reply(BaseModel):
+    total: int
+
+
+def _busy_work() -> int:
+    return sum(i * i for i in range(2000))
+
+
+class _Service(ExtensionService):
+    async def process_async(self, payload, context=None) -> _Reply:
+        return _Reply(total=_busy_work())
+
+
+def _build(tmp_path, **settings):
+    service = _Service()
+    options = {
+        "warmup_enabled": False,
+        "profiling_enabled": True,
+        "profiling_dir": str(tmp_path),
+        "debug_token": TOKEN,
+        **settings,
+    }
+    app = create_app(ExtensionSettings(**options), service, title="t", logger=logger)
+
+    @app.post("/v1/process")
+    async def process() -> ModelResponse:
+        return ModelResponse(await service.process_async({}))
+
+    return app
+
+
+def test_triggered_request_is_profiled_and_listed(tmp_path):
+    app = _build(tmp_path)
+    with TestClient(app) as client:
+        assert client.post("/v1/process", headers={**PROFILE, "x-ms-request-id": "req-7"}).status_code == 200
+        listing = client.get("/debug/profiles", headers={"x-debug-token": TOKEN}).json()["profiles"]
+        [profile] = listing
+        report = client.get(profile["url"], params={"format": "txt"}, headers={"x-debug-token": TOKEN})
+        raw = client.get(profile["url"], headers={"x-debug-token": TOKEN})
+
+    assert profile["summary"].startswith("POST /v1/process -> 200 in ")
+    assert profile["summary"].endswith("req_id=req-7")
+    assert "_busy_work" in report.text
+    assert raw.headers["content-type"] == "application/octet-stream"
+    stats = pstats.Stats(str(tmp_path / f"{profile['name']}.prof"))
+    assert any(func[2] == "_busy_work" for func in stats.stats)
+
+
+def test_requests_without_a_valid_token_are_not_profiled(tmp_path):
+    app = _build(tmp_path)
+    with TestClient(app) as client:
+        client.post("/v1/process")
+        client.post("/v1/process", headers={"x-debug-profile": "true", "x-debug-token": "wrong"})
+        client.post("/v1/process", headers={"x-debug-profile": "true"})
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_only_the_newest_profiles_are_kept(tmp_path):
+    app = _build(tmp_path, profiling_max_profiles=2)
+    with TestClient(app) as client:
+        for _ in range(4):
+            client.post("/v1/process", headers=PROFILE)
+        names = [p["name"] for p in client.get("/debug/profiles", headers={"x-debug-token": TOKEN}).json()["profiles"]]
+
+    assert len(names) == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f"{name}.{kind}" for name in names for kind in ("prof", "txt")
+    )
+
+
+def test_sample_rate_profiles_without_a_header(tmp_path):
+    app = _build(tmp_path, profiling_sample_rate=1.0, debug_token=None)
+    with TestClient(app) as client:
+        client.post("/v1/process")
+        client.get("/health/liveness")  # only processing paths are profiled
+        assert client.get("/debug/profiles").status_code == 404  # no token, no debug routes
+
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+
+
+def test_debug_routes_are_hidden_without_the_token(tmp_path):
+    app = _build(tmp_path)
+    with TestClient(app) as client:
+        assert client.get("/debug/profiles").status_code == 404
+        assert client.get("/debug/profiles", headers={"x-debug-token": "nope"}).status_code == 404
+        bad_name = client.get("/debug/profiles/..%2Fsecrets", headers={"x-debug-token": TOKEN})
+        assert bad_name.status_code == 404
+
+
+def test_profiling_is_not_installed_when_disabled(tmp_path):
+    app = _build(tmp_path, profiling_enabled=False)
+
+    assert app.state.profiler is None
+    assert all(m.cls is not ProfilingMiddleware for m in app.user_middleware)
@@ -0,0 +1,203 @@
+"""Tracing tests: traceparent propagation, sampling, child spans and the exporters."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from dragon_extension_runtime import (
+    ExtensionService,
+    ExtensionSettings,
+    ModelResponse,
+    create_app,
+    inject,
+    span,
+)
+from dragon_extension_runtime.tracing import (
+    BatchSpanProcessor,
+    OtlpHttpSpanExporter,
+    Tracer,
+    parse_traceparent,
+)
+
+logger = logging.getLogger("dragon.runtime.tests")
+
+CALLER_TRACE = "4bf92f3577b34da6a3ce929d0e0e4736"
+CALLER_SPAN = "00f067aa0ba902b7"
+
+
+class _Reply(BaseModel):
+    success: bool = True
+    downstream: str | None = None
+
+
+class _Service(ExtensionService):
+    async def process_async(self, payload, context=None) -> _Reply:
+        with span("extraction", resources=2):
+            with span("model.call") as call:
+                headers = inject({})
+                if call is not None:
+                    call.set_attribute("model", "demo")
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+        return _Reply(downstream=headers.get("traceparent"))
+
+
+def _build(tmp_path, **settings):
+    path = tmp_path / "traces.ndjson"
+    service = _Service()
+    app = create_app(
+        ExtensionSettings(
+            warmup_enabled=False,
+            tracing_exporter="file",
+            tracing_file_path=str(path),
+            tracing_service_name="test-extension",
+            **settings,
+        ),
+        service,
+        title="t",
+        logger=logger,
+    )
+
+    @app.post("/v1/process")
+    async def process(payload: dict) -> ModelResponse:
+        return ModelResponse(await service.process_async(payload))
+
+    return app, path
+
+
+def _spans(path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    spans = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                for item in scope["spans"]:
+                    spans[item["name"]] = item
+    return spans
+
+
+def _attributes(item: dict) -> dict:
+    return {a["key"]: next(iter(a["value"].values())) for a in item["attributes"]}
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(f"00-{CALLER_TRACE}-{CALLER_SPAN}-01") == (CALLER_TRACE, CALLER_SPAN, True)
+    assert parse_traceparent(f"00-{CALLER_TRACE}-{CALLER_SPAN}-00")[2] is False
+    for invalid in (None, "", "garbage", f"00-{'0' * 32}-{CALLER_SPAN}-01", f"01-{CALLER_TRACE}-{CALLER_SPAN}"):
+        assert parse_traceparent(invalid) is None
+
+
+def test_request_continues_the_callers_trace_with_child_spans(tmp_path):
+    app, path = _build(tmp_path)
+    with TestClient(app) as client:
+        response = client.post(
+            "/v1/process",
+            json={},
+            headers={
+                "traceparent": f"00-{CALLER_TRACE}-{CALLER_SPAN}-01",
+                "x-ms-request-id": "req-1",
+                "x-ms-correlation-id": "corr-1",
+            },
+        )
+
+    spans = _spans(path)
+    root, extraction, call = spans["POST /v1/process"], spans["extraction"], spans["model.call"]
+    assert {root["traceId"], extraction["traceId"], call["traceId"]} == {CALLER_TRACE}
+    assert root["parentSpanId"] == CALLER_SPAN
+    assert extraction["parentSpanId"] == root["spanId"]
+    assert call["parentSpanId"] == extraction["spanId"]
+    assert _attributes(root)["dragon.request_id"] == "req-1"
+    assert _attributes(root)["dragon.correlation_id"] == "corr-1"
+    assert _attributes(root)["http.response.status_code"] == "200"
+    assert _attributes(call) == {"model": "demo"}
+
+    assert response.headers["traceparent"] == f"00-{CALLER_TRACE}-{root['spanId']}-01"
+    assert response.json()["downstream"] == f"00-{CALLER_TRACE}-{call['spanId']}-01"
+    resource = json.loads(path.read_text().splitlines()[0])["resourceSpans"][0]["resource"]
+    assert _attributes(resource) == {"service.name": "test-extension"}
+
+
+def test_unsampled_requests_propagate_context_but_export_nothing(tmp_path):
+    app, path = _build(tmp_path, tracing_sample_ratio=0)
+    with TestClient(app) as client:
+        new_trace = client.post("/v1/process", json={})
+        # A caller's sampling decision wins over the local ratio.
+        unsampled_caller = client.post(
+            "/v1/process", json={}, headers={"traceparent": f"00-{CALLER_TRACE}-{CALLER_SPAN}-00"}
+        )
+        sampled_caller = client.post(
+            "/v1/process", json={}, headers={"traceparent": f"00-{CALLER_TRACE}-{CALLER_SPAN}-01"}
+        )
+
+    assert new_trace.headers["traceparent"].endswith("-00")
+    assert parse_traceparent(unsampled_caller.json()["downstream"])[:1] == (CALLER_TRACE,)
+    assert sampled_caller.headers["traceparent"].endswith("-01")
+    assert set(_spans(path)) == {"POST /v1/process", "extraction", "model.call"}
+
+
+def test_failures_are_recorded_on_the_spans(tmp_path):
+    app, path = _build(tmp_path)
+    with TestClient(app) as client:
+        assert client.post("/v1/process", json={"fail": True}).status_code == 500
+
+    spans = _spans(path)
+    assert spans["POST /v1/process"]["status"]["code"] == 2
+    assert spans["extraction"]["status"] == {"code": 1}
+
+
+def test_span_outside_a_trace_is_a_no_op():
+    with span("orphan") as orphan:
+        assert orphan is None
+        assert inject({}) == {}
+
+
+def test_otlp_exporter_posts_batches_to_a_collector():
+    received: list[dict] = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 - http.server API
+            received.append(json.loads(self.rfile.read(int(self.headers["content-length"]))))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Collector)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        exporter = OtlpHttpSpanExporter(f"http://127.0.0.1:{server.server_port}/v1/traces")
+        tracer = Tracer(BatchSpanProcessor(exporter, "svc", flush_interval_seconds=60))
+        request_span = tracer.start_request_span("GET /", None, {"dragon.request_id": None})
+        request_span.end()
+        tracer.shutdown()
+    finally:
+        server.shutdown()
+
+    [document] = received
+    [otlp] = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert otlp["name"] == "GET /"
+    assert otlp["attributes"] == []
+    assert int(otlp["endTimeUnixNano"]) >= int(otlp["startTimeUnixNano"])
+
+
+@pytest.mark.parametrize("ratio", [0.0, 1.0])
+def test_sampling_ratio_applies_to_new_traces(ratio):
+    class Discard(OtlpHttpSpanExporter):
+        def export(self, document) -> None:
+            pass
+
+    tracer = Tracer(BatchSpanProcessor(Discard("unused"), "svc"), sample_ratio=ratio)
+    try:
+        sampled = [tracer.start_request_span("x", None, {}).sampled for _ in range(20)]
+    finally:
+        tracer.shutdown()
+    assert sampled == [bool(ratio)] * 20
@@ -0,0 +1,410 @@
+"""Lightweight distributed tracing with W3C ``traceparent`` propagation.
+
+:class:`TracingMiddleware` opens one span per request. The span continues the
+caller's trace when the request carries a valid ``traceparent`` header, and
+records the Dragon ``x-ms-request-id`` / ``x-ms-correlation-id`` headers as
+attributes, so a trace can be found from either ID. The response carries the
+request span's ``traceparent``.
+
+Inside a request, application code opens child spans with :func:`span` and
+adds the current context to outgoing calls with :func:`inject`::
+
+    with span("extraction", resources=len(note.resources)):
+        ...
+    response = await client.get(url, headers=inject({}))
+
+Sampling is parent-based. A sampled caller is always followed, and a new trace
+is sampled with probability ``sample_ratio``. Outside a sampled request
+:func:`span` does nothing and costs one context-variable lookup. Finished spans
+are queued for a background thread that exports them in batches:
+
+* :class:`FileSpanExporter` appends OTLP/JSON ``ExportTraceServiceRequest``
+  documents, one per line, to a local file;
+* :class:`OtlpHttpSpanExporter` POSTs the same documents to an OTLP/HTTP
+  collector (``http://localhost:4318/v1/traces`` for an OpenTelemetry
+  Collector, Jaeger or Tempo).
+
+When the exporter falls behind, spans are dropped rather than buffered without
+limit.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, MutableMapping
+
+from .middleware import (
+    CORRELATION_ID_HEADER,
+    REQUEST_ID_HEADER,
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+    header,
+)
+
+logger = logging.getLogger("dragon.extension.runtime")
+
+TRACEPARENT_HEADER = b"traceparent"
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+# OTLP span kinds.
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """``(trace_id, parent_span_id, sampled)`` from a ``traceparent`` header, or ``None``."""
+
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 1)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+@dataclass
+class Span:
+    """One timed operation. Only sampled spans are exported."""
+
+    tracer: "Tracer" = field(repr=False)
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    sampled: bool
+    kind: int = KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled and value is not None:
+            self.attributes[key] = value
+
+    def end(self) -> None:
+        if self.end_ns:
+            return
+        self.end_ns = time.time_ns()
+        if self.sampled:
+            self.tracer.processor.on_end(self)
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "dragon_current_span", default=None
+)
+
+
+def current_span() -> Span | None:
+    """The span of the running request or operation, if any."""
+
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, *, kind: int = KIND_INTERNAL, **attributes: Any) -> Iterator[Span | None]:
+    """Time the block as a child of the current span (no-op outside a sampled trace)."""
+
+    parent = _current_span.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+    child = Span(
+        parent.tracer,
+        name,
+        parent.trace_id,
+        _new_id(8),
+        parent.span_id,
+        True,
+        kind,
+        attributes={key: value for key, value in attributes.items() if value is not None},
+    )
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = type(exc).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def inject(headers: MutableMapping[str, str]) -> MutableMapping[str, str]:
+    """Add the current ``traceparent`` to outgoing request ``headers``."""
+
+    current = _current_span.get()
+    if current is not None:
+        headers["traceparent"] = current.traceparent
+    return headers
+
+
+class SpanExporter(ABC):
+    """Destination for batches of finished spans (called on the export thread)."""
+
+    @abstractmethod
+    def export(self, document: dict[str, Any]) -> None:
+        """Send one OTLP/JSON ``ExportTraceServiceRequest``."""
+
+    def shutdown(self) -> None:
+        """Release the exporter's resources."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Append OTLP/JSON documents, one per line, to ``path``."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = path
+
+    def export(self, document: dict[str, Any]) -> None:
+        line = json.dumps(document, separators=(",", ":")) + "\n"
+        with open(self.path, "a", encoding="utf-8") as stream:
+            stream.write(line)
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """POST OTLP/JSON documents to an OTLP/HTTP collector's ``/v1/traces``."""
+
+    def __init__(self, endpoint: str, timeout_seconds: float = 10) -> None:
+        self.endpoint = endpoint
+        self.timeout_seconds = timeout_seconds
+
+    def export(self, document: dict[str, Any]) -> None:
+        import urllib.request  # only with the OTLP exporter
+
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(document, separators=(",", ":")).encode("utf-8"),
+            headers={"content-type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout_seconds):
+            pass
+
+
+def _attribute_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(values: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _attribute_value(value)} for key, value in values.items()]
+
+
+class BatchSpanProcessor:
+    """Queue finished spans and export them in batches from a daemon thread."""
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        service_name: str,
+        *,
+        max_queue_size: int = 2048,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 2.0,
+    ) -> None:
+        self.exporter = exporter
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.dropped = 0
+        self._max_queue_size = max_queue_size
+        self._start()
+        _processors.add(self)
+
+    def _start(self) -> None:
+        self._queue: queue.Queue[Span | None] = queue.Queue(self._max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self, timeout_seconds: float = 5) -> None:
+        """Export the queued spans and stop the thread."""
+
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout_seconds)
+        self.exporter.shutdown()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: list[Span] = []
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                self._export(batch)
+
+    def _export(self, batch: list[Span]) -> None:
+        try:
+            self.exporter.export(self.document(batch))
+        except Exception:  # noqa: BLE001 - tracing must never break the service
+            logger.warning("Exporting %s spans failed.", len(batch), exc_info=True)
+
+    def document(self, batch: list[Span]) -> dict[str, Any]:
+        """The OTLP/JSON ``ExportTraceServiceRequest`` for ``batch``."""
+
+        spans = []
+        for item in batch:
+            otlp: dict[str, Any] = {
+                "traceId": item.trace_id,
+                "spanId": item.span_id,
+                "name": item.name,
+                "kind": item.kind,
+                "startTimeUnixNano": str(item.start_ns),
+                "endTimeUnixNano": str(item.end_ns),
+                "attributes": _attributes(item.attributes),
+                "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+            }
+            if item.parent_id:
+                otlp["parentSpanId"] = item.parent_id
+            spans.append(otlp)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _attributes({"service.name": self.service_name})},
+                    "scopeSpans": [
+                        {"scope": {"name": "dragon_extension_runtime"}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+
+
+# A forked child (a pre-forked worker) has no exporter threads, and a queue
+# whose lock may have been held mid-fork: give each processor fresh ones.
+_processors: weakref.WeakSet[BatchSpanProcessor] = weakref.WeakSet()
+
+
+def _restart_processors_after_fork() -> None:
+    for processor in list(_processors):
+        processor._start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_processors_after_fork)
+
+
+class Tracer:
+    """Makes sampling decisions and hands finished spans to the processor."""
+
+    def __init__(self, processor: BatchSpanProcessor, sample_ratio: float = 1.0) -> None:
+        self.processor = processor
+        self.sample_ratio = sample_ratio
+
+    def start_request_span(
+        self, name: str, traceparent: str | None, attributes: dict[str, Any]
+    ) -> Span:
+        """Root (or remote-parented) span for an incoming request."""
+
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = _new_id(16), None
+            sampled = self.sample_ratio >= 1 or random.random() < self.sample_ratio
+        return Span(
+            self,
+            name,
+            trace_id,
+            _new_id(8),
+            parent_id,
+            sampled,
+            KIND_SERVER,
+            attributes={key: value for key, value in attributes.items() if value is not None}
+            if sampled
+            else {},
+        )
+
+    def shutdown(self) -> None:
+        self.processor.shutdown()
+
+
+class TracingMiddleware:
+    """Open a server span per HTTP request and return its ``traceparent``."""
+
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_span = self.tracer.start_request_span(
+            f"{scope['method']} {scope['path']}",
+            header(scope, TRACEPARENT_HEADER),
+            {
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+                "dragon.request_id": header(scope, REQUEST_ID_HEADER),
+                "dragon.correlation_id": header(scope, CORRELATION_ID_HEADER),
+            },
+        )
+        traceparent = request_span.traceparent.encode("ascii")
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                request_span.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    request_span.error = str(message["status"])
+                message["headers"] = [*message.get("headers", ()), (TRACEPARENT_HEADER, traceparent)]
+            await send(message)
+
+        token = _current_span.set(request_span)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            request_span.error = type(exc).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            request_span.end()
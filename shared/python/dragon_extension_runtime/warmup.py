@@ -0,0 +1,50 @@
+"""In-process requests for startup warm-up.
+
+A warm-up request is sent straight into the ASGI app: no socket, no client
+library. It therefore runs the same validation, service and serialization
+path as real traffic.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+
+async def post_in_process(
+    app: Callable[..., Any],
+    path: str,
+    body: bytes,
+    headers: Iterable[tuple[bytes, bytes]] = (),
+) -> int:
+    """POST ``body`` to ``path`` by calling the ASGI app directly; return the status."""
+
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    statuses: list[int] = []
+
+    async def receive() -> dict:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            *headers,
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 0),
+    }
+    await app(scope, receive, send)
+    return statuses[0] if statuses else 500